@@ -3,49 +3,148 @@
 Records from your microphone and transcribes using Whisper (runs entirely on your machine).
 No API key needed – everything runs locally.
 
+Loading a model takes seconds (and gigabytes for the large ones), so when
+``whisper-server.py`` is running the audio is sent there and transcribed by an
+already-warm model. Without the server the model is loaded in-process as before.
+
+``--batch DIR`` transcribes every WAV/MP3 under ``DIR`` instead, across all CPU
+cores, appending results to a JSONL file and resuming from it if interrupted
+(see ``whisper_batch.py``). It reports throughput in audio-seconds per
+wall-second, for comparing models on the same machine.
+
+``--stream`` transcribes while you talk: the microphone (or ``--file``, played
+back in real time) is split into speech segments by a VAD, and each segment is
+transcribed on a worker thread as soon as it ends, with its end-of-speech →
+text latency (see ``whisper_stream.py``).
+
 Available models (smallest → largest):
   tiny, base, small, medium, large-v3, turbo
 
+``--engine faster-whisper`` runs the same models int8-quantized on CTranslate2
+(see ``stt_engines.py``); ``bench-stt.py`` compares the engines.
+
 Usage::
 
     uv run 01-stt-playground/01-whisper-local.py              # default: turbo
     uv run 01-stt-playground/01-whisper-local.py --model base  # pick a model
     uv run 01-stt-playground/01-whisper-local.py --duration 10 # record longer
+    uv run 01-stt-playground/01-whisper-local.py --file call.wav  # transcribe a file
+    uv run 01-stt-playground/01-whisper-local.py --no-server   # always load in-process
+    uv run 01-stt-playground/01-whisper-local.py --engine faster-whisper --model base
+    uv run 01-stt-playground/01-whisper-local.py --batch recordings/ --model base --out base.jsonl
+    uv run 01-stt-playground/01-whisper-local.py --stream --model base         # live, Ctrl+C to stop
+    uv run 01-stt-playground/01-whisper-local.py --stream --file call.wav --vad silero
 """
 
 import argparse
+import sys
+from pathlib import Path
+from typing import Callable
 
 import numpy as np
 import sounddevice as sd
 import whisper
-from rich.console import Console
 
-console = Console()
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.eventlog import get_logger
+
+from stt_engines import ENGINES, STTEngine, decode_audio, load_engine
+from whisper_client import DEFAULT_URL, ServerUnavailable, WhisperClient
+
+log = get_logger("whisper-local")
 
 SAMPLE_RATE = 16_000
 
 
 def record_audio(duration: int = 5) -> np.ndarray:
-    console.print(f"[bold green]🎤 Recording for {duration}s …[/]")
+    log.info("recording", "[bold green]🎤 Recording for {duration}s …[/]", duration=duration)
     audio = sd.rec(int(duration * SAMPLE_RATE), samplerate=SAMPLE_RATE, channels=1, dtype="float32")
     sd.wait()
-    console.print("[bold green]✅ Recording complete[/]")
+    log.info("recorded", "[bold green]✅ Recording complete[/]")
     return audio.flatten()
 
 
-def transcribe(audio: np.ndarray, model_name: str = "turbo") -> str:
-    console.print(f"[yellow]Loading Whisper model '{model_name}' …[/]")
-    model = whisper.load_model(model_name)
-    result = model.transcribe(audio, fp16=False)
-    return result["text"]
+def transcribe(audio: np.ndarray | Path, model_name: str = "turbo", server_url: str | None = DEFAULT_URL, engine: str = "whisper") -> str:
+    """Transcribe a recording or an audio file, on the warm server if one is running."""
+    if server_url and engine == "whisper":
+        client = WhisperClient(server_url)
+        try:
+            if isinstance(audio, Path):
+                result = client.transcribe_file(audio, model_name)
+            else:
+                result = client.transcribe_pcm(audio, model_name)
+            log.info(
+                "server-transcribed",
+                "[dim]Transcribed by whisper-server in {seconds:.2f}s[/]",
+                seconds=result["transcribeSeconds"],
+                load_seconds=result["loadSeconds"],
+            )
+            return result["text"]
+        except ServerUnavailable:
+            log.info("server-unavailable", "[dim]No whisper-server at {url}, loading the model locally[/]", url=server_url)
+        finally:
+            client.close()
+
+    if isinstance(audio, Path):
+        audio = decode_audio(str(audio))
+    return _load_engine(engine, model_name).transcribe(audio).text
+
+
+def load_transcriber(model_name: str, server_url: str | None = DEFAULT_URL, engine: str = "whisper") -> Callable[[np.ndarray], str]:
+    """A function transcribing 16 kHz audio with a model loaded once – the server's if it is running."""
+    if server_url and engine == "whisper":
+        client = WhisperClient(server_url)
+        if client.is_running():
+            log.info("server-found", "[dim]Transcribing on whisper-server at {url}[/]", url=server_url)
+            return lambda audio: client.transcribe_pcm(audio, model_name)["text"]
+        client.close()
+
+    stt = _load_engine(engine, model_name)
+    return lambda audio: stt.transcribe(audio).text
+
+
+def _load_engine(engine: str, model_name: str) -> STTEngine:
+    log.info("loading-model", "[yellow]Loading {engine} model '{model}' …[/]", engine=engine, model=model_name)
+    return load_engine(engine, model_name)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Local STT with OpenAI Whisper")
     parser.add_argument("--model", default="turbo", choices=whisper.available_models(), help="Whisper model to use (default: turbo)")
+    parser.add_argument("--engine", default="whisper", choices=list(ENGINES), help="STT engine (default: whisper; faster-whisper = int8 CTranslate2, never uses the server)")
     parser.add_argument("--duration", type=int, default=5, help="Recording duration in seconds (default: 5)")
+    parser.add_argument("--file", type=Path, help="Transcribe this audio file instead of recording")
+    parser.add_argument("--server", default=DEFAULT_URL, help=f"whisper-server URL (default: {DEFAULT_URL}, or WHISPER_SERVER_URL)")
+    parser.add_argument("--no-server", action="store_true", help="Don't try the server; load the model in-process")
+    parser.add_argument("--batch", type=Path, metavar="DIR", help="Transcribe every WAV/MP3 under DIR (in-process, all cores)")
+    parser.add_argument("--out", type=Path, default=Path("transcripts.jsonl"), help="Batch results, appended and resumed from (default: transcripts.jsonl)")
+    parser.add_argument("--workers", type=int, help="Batch inference processes (default: CPU cores)")
+    parser.add_argument("--decoders", type=int, default=4, help="Batch decode threads (default: 4)")
+    parser.add_argument("--stream", action="store_true", help="Transcribe speech segments as they end, until Ctrl+C")
+    parser.add_argument("--vad", default="energy", choices=["energy", "silero"], help="Speech detector for --stream (default: energy)")
+    parser.add_argument("--vad-threshold-db", type=float, default=-40.0, help="Energy VAD level counted as speech (default: -40 dBFS)")
+    parser.add_argument("--min-silence-ms", type=int, default=500, help="Silence that ends a segment in --stream (default: 500)")
     args = parser.parse_args()
 
-    audio = record_audio(args.duration)
-    text = transcribe(audio, args.model)
-    console.print(f"\n[bold cyan]Transcript:[/] {text}")
+    if args.batch:
+        from whisper_batch import run_batch
+
+        run_batch(args.batch, args.model, args.out, args.workers, args.decoders, args.engine)
+        sys.exit()
+
+    if args.stream:
+        from whisper_stream import EnergyVAD, Segmenter, SileroVAD, file_blocks, mic_blocks, stream
+
+        vad = SileroVAD() if args.vad == "silero" else EnergyVAD(args.vad_threshold_db)
+        transcriber = load_transcriber(args.model, None if args.no_server else args.server, args.engine)
+        if args.file:
+            blocks = file_blocks(decode_audio(str(args.file)))
+        else:
+            log.info("listening", "[bold green]🎤 Listening … (Ctrl+C to stop)[/]")
+            blocks = mic_blocks()
+        stream(blocks, Segmenter(vad, min_silence_ms=args.min_silence_ms), transcriber)
+        sys.exit()
+
+    audio = args.file if args.file else record_audio(args.duration)
+    text = transcribe(audio, args.model, None if args.no_server else args.server, args.engine)
+    log.info("transcript", "\n[bold cyan]Transcript:[/] {text}", text=text)
@@ -2,44 +2,128 @@
 
 Streams microphone audio to Deepgram and prints interim + final transcripts.
 Requires DEEPGRAM_API_KEY in .env.
+
+Audio reaches the event loop through ``audio_bridge.AudioBridge``: the
+sounddevice callback hands each block over with ``call_soon_threadsafe`` and
+the sender awaits it, so the loop never blocks. ``stt_sender.ChunkSender``
+coalesces the 20 ms capture frames into chunks sized by state – small while
+you speak, large during silence – and with ``--skip-silence`` sends KeepAlive
+messages instead of silence. On exit it prints capture-to-send latency
+percentiles per state, send counters and ring-buffer drop/overrun counters.
+``--poll`` runs the old blocking-poll loop (fixed 100 ms chunks) instead, for
+comparison.
+
+``--replay`` streams a 16 kHz mono 16-bit WAV in real time instead of the
+microphone. Together with ``mock-servers/serve.py`` (``DEEPGRAM_HOST``
+points the SDK at it) that runs without a microphone or a network.
+
+Usage::
+
+    uv run 01-stt-playground/02-deepgram-streaming.py
+    uv run 01-stt-playground/02-deepgram-streaming.py --skip-silence
+    uv run 01-stt-playground/02-deepgram-streaming.py --poll   # baseline latency
+    DEEPGRAM_HOST=http://127.0.0.1:8081 uv run 01-stt-playground/02-deepgram-streaming.py --replay call.wav
 """
 
+import argparse
 import asyncio
 import os
 import queue
+import sys
+import time
+import wave
+from dataclasses import asdict
+from pathlib import Path
 
-import sounddevice as sd
-from deepgram import DeepgramClient, LiveTranscriptionEvents, LiveOptions
+from deepgram import DeepgramClient, DeepgramClientOptions, LiveTranscriptionEvents, LiveOptions
 from dotenv import load_dotenv
-from rich.console import Console
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.benchstats import percentile
+from common.eventlog import get_logger
+
+from audio_bridge import AudioBridge
+from stt_sender import ChunkSender
 
 load_dotenv()
-console = Console()
+log = get_logger("deepgram-streaming")
 
 SAMPLE_RATE = 16000
 CHANNELS = 1
-CHUNK_MS = 100  # send audio every 100ms
+FRAME_MS = 20  # capture block; ChunkSender coalesces these into chunks
+POLL_CHUNK_MS = 100  # --poll baseline: one send per 100 ms block
+FINAL_GRACE_S = 1.0  # after the last audio, how long to wait for final results
+
+
+def read_wav(path: str) -> bytes:
+    """linear16 frames of a 16 kHz mono WAV – the format the stream is opened with."""
+    with wave.open(path, "rb") as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, CHANNELS, 2):
+            raise SystemExit(
+                f"{path}: need {SAMPLE_RATE} Hz mono 16-bit PCM, got {wav.getframerate()} Hz, "
+                f"{wav.getnchannels()} channel(s), {wav.getsampwidth() * 8}-bit. "
+                f"Convert with: ffmpeg -i {path} -ar {SAMPLE_RATE} -ac 1 -c:a pcm_s16le out.wav"
+            )
+        return wav.readframes(wav.getnframes())
+
+
+async def replay(pcm: bytes, bridge: AudioBridge):
+    """Push ``pcm`` into the bridge in FRAME_MS blocks, paced like a live microphone."""
+    frame_bytes = SAMPLE_RATE * FRAME_MS // 1000 * 2
+    audio = memoryview(pcm)
+    started = time.perf_counter()
+    try:
+        for offset in range(0, len(audio) - frame_bytes + 1, frame_bytes):
+            due = started + (offset + frame_bytes) / (SAMPLE_RATE * 2)
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            bridge.push(audio[offset:offset + frame_bytes], time.perf_counter())
+    finally:
+        bridge.close()  # ends the send loop even if the replay fails
 
 
-async def main():
+def log_latencies(label: str, latencies: list[float], lead: str = ""):
+    if not latencies:
+        return
+    ordered = sorted(latencies)
+    log.info(
+        "send-latency",
+        lead + "[bold]Capture → send ({mode}):[/] p50 {p50_ms:.1f} ms, p95 {p95_ms:.1f} ms, max {max_ms:.1f} ms over {count} chunks",
+        mode=label,
+        p50_ms=percentile(ordered, 50) * 1000,
+        p95_ms=percentile(ordered, 95) * 1000,
+        max_ms=ordered[-1] * 1000,
+        count=len(ordered),
+    )
+
+
+async def main(
+    poll: bool = False,
+    ring_blocks: int = 50,
+    replay_path: str | None = None,
+    speech_chunk_ms: int = 40,
+    silence_chunk_ms: int = 250,
+    skip_silence: bool = False,
+    threshold_db: float = -45.0,
+):
     api_key = os.getenv("DEEPGRAM_API_KEY")
     if not api_key:
-        console.print("[red]Set DEEPGRAM_API_KEY in .env[/]")
+        log.error("config", "[red]Set DEEPGRAM_API_KEY in .env[/]", missing="DEEPGRAM_API_KEY")
         return
 
-    deepgram = DeepgramClient(api_key)
+    # DEEPGRAM_HOST overrides api.deepgram.com, e.g. with mock-servers/serve.py.
+    deepgram = DeepgramClient(api_key, DeepgramClientOptions(url=os.getenv("DEEPGRAM_HOST", "")))
     connection = deepgram.listen.asyncwebsocket.v("1")
 
     async def on_message(self, result, **kwargs):
         transcript = result.channel.alternatives[0].transcript
         if transcript:
             if result.is_final:
-                console.print(f"[bold cyan]Final:[/] {transcript}")
+                log.info("final", "[bold cyan]Final:[/] {transcript}", transcript=transcript)
             else:
-                console.print(f"[dim]Interim:[/] {transcript}", end="\r")
+                log.info("interim", "[dim]Interim:[/] {transcript}\r", transcript=transcript)
 
     async def on_error(self, error, **kwargs):
-        console.print(f"[red]Error:[/] {error}")
+        log.error("error", "[red]Error:[/] {error}", error=str(error))
 
     connection.on(LiveTranscriptionEvents.Transcript, on_message)
     connection.on(LiveTranscriptionEvents.Error, on_error)
@@ -54,54 +138,135 @@ async def main():
         channels=CHANNELS,
     )
 
-    # Thread-safe queue for audio from the sounddevice callback thread
-    audio_buf: queue.Queue[bytes] = queue.Queue()
-    chunk_samples = int(SAMPLE_RATE * CHUNK_MS / 1000)
+    pcm = read_wav(replay_path) if replay_path else None
+    bridge = AudioBridge(asyncio.get_running_loop(), capacity=ring_blocks)
+    # Baseline only (--poll): a thread-safe queue polled from the loop.
+    audio_buf: queue.Queue[tuple[bytes, float]] = queue.Queue()
 
-    def _audio_callback(indata, frames, time_info, status):
+    def _poll_callback(indata, frames, time_info, status):
         if status:
-            console.print(f"[yellow]Audio warning:[/] {status}")
-        audio_buf.put_nowait(indata.tobytes())
+            log.warning("audio-status", "[yellow]Audio warning:[/] {status}", status=str(status))
+        audio_buf.put_nowait((indata.tobytes(), time.perf_counter()))
 
-    stream = sd.InputStream(
-        samplerate=SAMPLE_RATE,
-        channels=CHANNELS,
-        dtype="int16",
-        blocksize=chunk_samples,
-        callback=_audio_callback,
+    sender = ChunkSender(
+        connection.send,
+        connection.keep_alive,
+        sample_rate=SAMPLE_RATE,
+        speech_chunk_ms=speech_chunk_ms,
+        silence_chunk_ms=silence_chunk_ms,
+        threshold_db=threshold_db,
+        skip_silence=skip_silence,
     )
 
-    # Start mic first, then open WebSocket so audio is ready immediately
-    stream.start()
+    stream = None
+    if pcm is None:
+        import sounddevice as sd
+
+        stream = sd.InputStream(
+            samplerate=SAMPLE_RATE,
+            channels=CHANNELS,
+            dtype="int16",
+            blocksize=SAMPLE_RATE * (POLL_CHUNK_MS if poll else FRAME_MS) // 1000,
+            callback=_poll_callback if poll else bridge.callback,
+        )
+        # Start mic first, then open WebSocket so audio is ready immediately
+        stream.start()
 
     started = await connection.start(options)
     if not started:
-        console.print("[red]Failed to connect to Deepgram[/]")
-        stream.stop()
-        stream.close()
+        log.error("connect-failed", "[red]Failed to connect to Deepgram[/]")
+        if stream is not None:
+            stream.stop()
+            stream.close()
         return
 
-    console.print("[bold green]🎤 Listening … (Ctrl+C to stop)[/]")
+    replay_task = None
+    if pcm is None:
+        log.info("listening", "[bold green]🎤 Listening … (Ctrl+C to stop)[/]")
+    else:
+        log.info("replaying", "[bold green]▶ Replaying {path}[/] [dim]({seconds:.1f} s)[/]", path=replay_path, seconds=len(pcm) / (SAMPLE_RATE * 2))
+        replay_task = asyncio.create_task(replay(pcm, bridge))
 
     try:
-        while True:
-            # Poll the thread-safe queue from the async loop
-            try:
-                audio_bytes = audio_buf.get(timeout=0.05)
-            except queue.Empty:
-                await asyncio.sleep(0.01)
-                continue
-            if not await connection.send(audio_bytes):
-                break
+        if poll:
+            while True:
+                # Blocks the event loop for up to 50 ms per miss – kept as the baseline.
+                try:
+                    audio_bytes, captured_at = audio_buf.get(timeout=0.05)
+                except queue.Empty:
+                    await asyncio.sleep(0.01)
+                    continue
+                if not await connection.send(audio_bytes):
+                    break
+                bridge.sent(captured_at)
+        else:
+            while (block := await bridge.get()) is not None:
+                if not await sender.feed(*block):
+                    break
+            else:
+                # Replay finished: send the tail and let the final results arrive.
+                await sender.flush()
+                await connection.finalize()
+                await asyncio.sleep(FINAL_GRACE_S)
     except (KeyboardInterrupt, asyncio.CancelledError):
         pass
     finally:
-        stream.stop()
-        stream.close()
+        if stream is not None:
+            stream.stop()
+            stream.close()
+        if replay_task is not None:
+            replay_task.cancel()  # no-op once it has finished
+            try:
+                await replay_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                log.error("replay-failed", "[red]Replay failed:[/] {error}", error=repr(e))
         await connection.finish()
 
-    console.print("[bold green]Done.[/]")
+    if poll:
+        log_latencies("poll", bridge.latencies, lead="\n")
+    else:
+        stats = sender.stats
+        log.info(
+            "sender-stats",
+            "\n[dim]Sent {chunks} chunks ({kib:,.0f} KiB) for {frames} frames, {voiced_frames} voiced; "
+            "skipped {skipped_frames} silent frames, {keepalives} keepalives[/]",
+            kib=stats.bytes_sent / 1024,
+            **asdict(stats),
+        )
+        log.info(
+            "bridge-stats",
+            "[dim]Ring: {received} blocks, max depth {max_depth}, dropped {dropped}, device overruns {overruns}[/]",
+            **asdict(bridge.stats),
+        )
+        for state, latencies in sender.latencies.items():
+            log_latencies(state, latencies)
+    log.info("done", "[bold green]Done.[/]")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Real-time streaming STT with Deepgram")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--poll", action="store_true", help="Use the old blocking-poll loop (latency baseline)")
+    source.add_argument("--replay", metavar="WAV", help="Stream a 16 kHz mono 16-bit WAV in real time instead of the microphone")
+    parser.add_argument("--ring-blocks", type=int, default=50, help=f"Audio ring capacity in {FRAME_MS} ms blocks (default: 50)")
+    parser.add_argument("--speech-chunk-ms", type=int, default=40, help="Chunk size while speech is active (default: 40)")
+    parser.add_argument("--silence-chunk-ms", type=int, default=250, help="Chunk size during silence (default: 250)")
+    parser.add_argument("--skip-silence", action="store_true", help="Send KeepAlive messages instead of silence")
+    parser.add_argument("--threshold-db", type=float, default=-45.0, help="Speech energy threshold in dBFS (default: -45)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(
+            main(
+                args.poll,
+                args.ring_blocks,
+                args.replay,
+                args.speech_chunk_ms,
+                args.silence_chunk_ms,
+                args.skip_silence,
+                args.threshold_db,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
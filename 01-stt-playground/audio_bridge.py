@@ -0,0 +1,122 @@
+"""Hand audio from a sounddevice callback thread to an asyncio event loop.
+
+The callback runs on PortAudio's thread and must never block. It copies each
+block into a preallocated ring (one ``bytearray``, sliced into fixed slots
+with ``memoryview``s – no new bytes object per block), stamps it with its
+capture time and schedules a put onto the loop with ``call_soon_threadsafe``.
+The consumer simply ``await``s the next block – no polling, no sleeps, and
+the loop stays free for websocket traffic in between.
+
+The queue is bounded. If the consumer falls behind (e.g. a stalled network
+send), the *oldest* blocks are dropped so the live edge stays current, and
+the drops are counted. Device overruns reported by PortAudio are counted
+separately.
+
+``get`` returns each block as its own ``bytes``, copied out of the ring on
+the loop thread. The audio thread keeps writing into the ring while the
+consumer awaits a send, so a view into it could change under a stalled
+send; the copy can't, and the callback still allocates nothing. The ring has
+a few more slots than the queue holds, and a block whose slot was
+overwritten before (or while) it was copied is counted as dropped rather
+than returned.
+
+Usage::
+
+    bridge = AudioBridge(asyncio.get_running_loop())
+    stream = sd.InputStream(..., callback=bridge.callback)
+    while (block := await bridge.get()) is not None:
+        data, captured_at = block
+        await connection.send(data)
+        bridge.sent(captured_at)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+SLACK_SLOTS = 8  # ring slots beyond the queue capacity, for puts still on their way to the loop
+
+
+@dataclass
+class BridgeStats:
+    received: int = 0
+    dropped: int = 0  # oldest blocks discarded because the ring was full
+    overruns: int = 0  # input overflows reported by the audio device
+    max_depth: int = 0
+
+
+class AudioBridge:
+    def __init__(self, loop: asyncio.AbstractEventLoop, capacity: int = 50):
+        self._loop = loop
+        self._queue: asyncio.Queue[tuple[int, float]] = asyncio.Queue(maxsize=capacity)
+        self._slots = capacity + SLACK_SLOTS
+        self._ring: memoryview | None = None  # allocated on the first block, once its size is known
+        self._slot_bytes = 0
+        self._lengths = [0] * self._slots
+        self._seqs = [-1] * self._slots  # sequence number of the block each slot holds
+        self._written = 0
+        self.stats = BridgeStats()
+        self.latencies: list[float] = []  # capture → send completed, seconds
+
+    def callback(self, indata, frames, time_info, status):
+        """sounddevice ``InputStream`` callback; runs on the audio thread."""
+        captured_at = time.perf_counter()
+        if status.input_overflow:
+            self.stats.overruns += 1
+        self._loop.call_soon_threadsafe(self._put, self._store(indata), captured_at)
+
+    def push(self, data, captured_at: float):
+        """Add a block from the loop thread itself (e.g. a file replay)."""
+        self._put(self._store(data), captured_at)
+
+    def close(self):
+        """Mark the end of input; ``get`` returns None once the queue is drained."""
+        self._put(-1, 0.0)
+
+    async def get(self) -> tuple[bytes, float] | None:
+        while True:
+            seq, captured_at = await self._queue.get()
+            if seq < 0:
+                return None
+            slot = seq % self._slots
+            if self._seqs[slot] == seq:
+                start = slot * self._slot_bytes
+                data = bytes(self._ring[start:start + self._lengths[slot]])
+                # _store() invalidates a slot before writing it, so an unchanged
+                # sequence number means the copy is the block we were promised.
+                if self._seqs[slot] == seq:
+                    return data, captured_at
+            self.stats.dropped += 1  # overwritten by a newer block before we got to it
+
+    def sent(self, captured_at: float):
+        """Record that a block captured at ``captured_at`` has been sent."""
+        self.latencies.append(time.perf_counter() - captured_at)
+
+    def _store(self, data) -> int:
+        """Copy a block into the next ring slot; returns its sequence number."""
+        source = memoryview(data).cast("B")
+        if self._ring is None:
+            self._slot_bytes = source.nbytes
+            self._ring = memoryview(bytearray(self._slot_bytes * self._slots))
+        if source.nbytes > self._slot_bytes:
+            raise ValueError(f"block of {source.nbytes} bytes exceeds the {self._slot_bytes}-byte ring slot")
+
+        seq = self._written
+        slot = seq % self._slots
+        start = slot * self._slot_bytes
+        self._seqs[slot] = -1  # invalidate first, so a reader never sees a half-written slot as valid
+        self._ring[start:start + source.nbytes] = source
+        self._lengths[slot] = source.nbytes
+        self._seqs[slot] = seq
+        self._written = seq + 1
+        return seq
+
+    def _put(self, seq: int, captured_at: float):
+        queue = self._queue
+        if queue.full():
+            queue.get_nowait()
+            self.stats.dropped += 1
+        queue.put_nowait((seq, captured_at))
+        if seq >= 0:
+            self.stats.received += 1
+        self.stats.max_depth = max(self.stats.max_depth, queue.qsize())
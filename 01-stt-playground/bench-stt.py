@@ -0,0 +1,149 @@
+"""Benchmark the local STT engines on a fixed corpus.
+
+The corpus is a directory of audio files, each with a reference transcript
+next to it under the same name::
+
+    corpus/
+      order-status.wav   order-status.txt
+      refund.wav         refund.txt
+
+Each engine runs in its own fresh process, so peak RSS is that engine's alone
+and one engine's caches can't help the next. Reported per engine:
+
+    - load time,
+    - real-time factor (RTF) – inference seconds per audio second, lower is
+      better; below 1.0 is faster than real time,
+    - peak RSS of the process, model included,
+    - word error rate (WER) against the references, after lowercasing and
+      stripping punctuation.
+
+Every file is transcribed once untimed first (warm-up), then timed.
+
+Usage::
+
+    uv run 01-stt-playground/bench-stt.py corpus/
+    uv run 01-stt-playground/bench-stt.py corpus/ --model small --engines whisper faster-whisper
+"""
+
+import argparse
+import multiprocessing
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.benchstats import peak_rss_bytes
+from stt_engines import ENGINES, SAMPLE_RATE, decode_audio, load_engine
+
+console = Console()
+
+AUDIO_SUFFIXES = {".wav", ".mp3", ".flac"}
+
+
+def load_corpus(directory: Path) -> list[tuple[str, Path, str]]:
+    """``(name, audio path, reference text)`` for every file with a ``.txt`` reference."""
+    corpus = []
+    for path in sorted(directory.iterdir()):
+        reference = path.with_suffix(".txt")
+        if path.suffix.lower() in AUDIO_SUFFIXES and reference.exists():
+            corpus.append((path.name, path, reference.read_text(encoding="utf-8")))
+    return corpus
+
+
+def normalize(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def edit_distance(reference: list[str], hypothesis: list[str]) -> int:
+    """Word-level Levenshtein distance (substitutions + deletions + insertions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def run_engine(engine: str, model_name: str, files: list[tuple[str, Path]]) -> dict:
+    """Runs in a child process: load, warm up, transcribe every file, report."""
+    audio = {name: decode_audio(str(path)) for name, path in files}
+
+    started = time.perf_counter()
+    stt = load_engine(engine, model_name)
+    load_seconds = time.perf_counter() - started
+
+    for samples in audio.values():
+        stt.transcribe(samples)
+
+    hypotheses, transcribe_seconds = {}, 0.0
+    for name, samples in audio.items():
+        started = time.perf_counter()
+        hypotheses[name] = stt.transcribe(samples).text
+        transcribe_seconds += time.perf_counter() - started
+
+    return {
+        "loadSeconds": load_seconds,
+        "audioSeconds": sum(len(samples) for samples in audio.values()) / SAMPLE_RATE,
+        "transcribeSeconds": transcribe_seconds,
+        "peakRssBytes": peak_rss_bytes(),
+        "hypotheses": hypotheses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local STT engines: RTF, peak RSS, WER")
+    parser.add_argument("corpus", type=Path, help="Directory of audio files with same-named .txt references")
+    parser.add_argument("--model", default="base", help="Model size for every engine (default: base)")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES), help="Engines to compare (default: all)")
+    parser.add_argument("--show-errors", action="store_true", help="Print files whose transcript differs from the reference")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        console.print(f"[red]No audio files with .txt references in {args.corpus}[/]")
+        return
+    console.print(f"[bold green]⏱  {len(corpus)} files, model '{args.model}'[/]")
+
+    table = Table(title=f"Local STT – {args.model}")
+    table.add_column("Engine")
+    table.add_column("Load", justify="right")
+    table.add_column("RTF", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    table.add_column("WER", justify="right")
+
+    # A fresh spawned process per engine: clean peak RSS, no shared imports.
+    context = multiprocessing.get_context("spawn")
+    files = [(name, path) for name, path, _ in corpus]
+    for engine in args.engines:
+        console.print(f"[dim]Running {engine} …[/]")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_engine, engine, args.model, files).result()
+
+        errors = words = 0
+        for name, _, reference in corpus:
+            ref, hyp = normalize(reference), normalize(result["hypotheses"][name])
+            distance = edit_distance(ref, hyp)
+            errors += distance
+            words += len(ref)
+            if args.show_errors and distance:
+                console.print(f"  [yellow]{engine}[/] {name}: [dim]{result['hypotheses'][name]}[/]")
+
+        table.add_row(
+            engine,
+            f"{result['loadSeconds']:.1f}s",
+            f"{result['transcribeSeconds'] / result['audioSeconds']:.3f}",
+            f"{result['peakRssBytes'] / 1e6:,.0f} MB",
+            f"{errors / max(words, 1):.1%}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Adaptive chunking for streaming STT sends.
+
+Streaming STT APIs accept audio in any chunk size, and the size is a trade-off:
+every websocket message costs a frame, a syscall and server-side work, but
+audio sitting in a half-full chunk is audio the recognizer hasn't heard yet.
+``ChunkSender`` coalesces small capture frames and picks the chunk size from
+what the caller is doing:
+
+    - while speech is active (frame energy above a dBFS threshold, held for a
+      short hangover after the last voiced frame) it sends small chunks –
+      ``speech_chunk_ms``, 40 ms by default – so words reach the recognizer
+      quickly;
+    - during silence it coalesces up to ``silence_chunk_ms`` (250 ms) per
+      message, since nothing is waiting on that audio;
+    - with ``skip_silence`` it stops sending silence once the hangover has
+      gone out, and sends a KeepAlive every ``keepalive_s`` instead so the
+      server doesn't close the idle connection (Deepgram closes it after
+      ~10 s without data). The last ``pre_roll_ms`` of silence is kept and
+      sent at speech onset, so first syllables aren't clipped.
+
+Whatever is buffered goes out immediately when speech starts or ends, so the
+large silence chunks never delay speech.
+
+Frames are copied into one preallocated ``bytearray`` and sent as
+``memoryview`` slices of it; sends are awaited before the buffer is reused,
+so the steady state allocates no audio buffers.
+
+Usage::
+
+    sender = ChunkSender(connection.send, connection.keep_alive, skip_silence=True)
+    while (block := await bridge.get()) is not None:
+        if not await sender.feed(*block):
+            break
+    await sender.flush()
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import numpy as np
+
+SAMPLE_RATE = 16_000
+SAMPLE_WIDTH = 2  # linear16
+
+
+@dataclass
+class SenderStats:
+    frames: int = 0
+    voiced_frames: int = 0
+    chunks: int = 0
+    bytes_sent: int = 0
+    skipped_frames: int = 0  # silence never sent (skip_silence)
+    keepalives: int = 0
+
+
+class ChunkSender:
+    def __init__(
+        self,
+        send: Callable[[memoryview], Awaitable[bool]],
+        keep_alive: Callable[[], Awaitable[bool]] | None = None,
+        sample_rate: int = SAMPLE_RATE,
+        speech_chunk_ms: int = 40,
+        silence_chunk_ms: int = 250,
+        threshold_db: float = -45.0,
+        hangover_ms: int = 300,
+        skip_silence: bool = False,
+        pre_roll_ms: int = 200,
+        keepalive_s: float = 5.0,
+    ):
+        if skip_silence and keep_alive is None:
+            raise ValueError("skip_silence needs a keep_alive callable")
+        self._send = send
+        self._keep_alive = keep_alive
+        self._bytes_per_second = sample_rate * SAMPLE_WIDTH
+        self._speech_bytes = self._bytes_for(speech_chunk_ms)
+        self._silence_bytes = self._bytes_for(silence_chunk_ms)
+        self._pre_roll_bytes = self._bytes_for(pre_roll_ms)
+        self._threshold = 32768 * 10 ** (threshold_db / 20)  # as an int16 RMS level
+        self._hangover_s = hangover_ms / 1000
+        self._keepalive_s = keepalive_s
+        self.skip_silence = skip_silence
+
+        self._buffer: bytearray | None = None  # allocated on the first frame, once its size is known
+        self._view: memoryview | None = None
+        self._filled = 0
+        self._oldest = 0.0  # capture time of the oldest buffered audio
+        self._speaking = False
+        self._speech_until = 0.0
+        self._last_activity = time.perf_counter()  # last send or keepalive
+
+        self.stats = SenderStats()
+        # Oldest audio in each chunk → chunk sent, seconds, split by state.
+        self.latencies: dict[str, list[float]] = {"speech": [], "silence": []}
+
+    async def feed(self, frame, captured_at: float) -> bool:
+        """Add one capture frame (linear16 bytes); False once a send has failed."""
+        frame = memoryview(frame).cast("B")
+        size = frame.nbytes
+        self.stats.frames += 1
+        if self._buffer is None:
+            # Never more than one chunk plus the frame that completes it.
+            self._buffer = bytearray(max(self._speech_bytes, self._silence_bytes, self._pre_roll_bytes) + size)
+            self._view = memoryview(self._buffer)
+
+        if self._is_voiced(frame):
+            self.stats.voiced_frames += 1
+            self._speech_until = captured_at + self._hangover_s
+        speaking = captured_at < self._speech_until
+
+        if speaking != self._speaking:
+            # Speech just ended: don't hold its tail back behind a silence chunk.
+            if not speaking and not await self.flush():
+                return False
+            self._speaking = speaking
+
+        if not speaking and self.skip_silence:
+            self._keep_pre_roll(size)
+            self._append(frame, captured_at)
+            if time.perf_counter() - self._last_activity >= self._keepalive_s:
+                if not await self._keep_alive():
+                    return False
+                self.stats.keepalives += 1
+                self._last_activity = time.perf_counter()
+            return True
+
+        self._append(frame, captured_at)
+        target = self._speech_bytes if speaking else self._silence_bytes
+        if self._filled >= target:
+            return await self.flush()
+        return True
+
+    async def flush(self) -> bool:
+        """Send whatever is buffered."""
+        if not self._filled:
+            return True
+        if not await self._send(self._view[: self._filled]):
+            return False
+        sent_at = time.perf_counter()
+        self.latencies["speech" if self._speaking else "silence"].append(sent_at - self._oldest)
+        self.stats.chunks += 1
+        self.stats.bytes_sent += self._filled
+        self._filled = 0
+        self._last_activity = sent_at
+        return True
+
+    def _append(self, frame: memoryview, captured_at: float):
+        if not self._filled:
+            self._oldest = captured_at
+        self._view[self._filled:self._filled + frame.nbytes] = frame
+        self._filled += frame.nbytes
+
+    def _keep_pre_roll(self, incoming: int):
+        """Discard the oldest buffered silence so that, with ``incoming`` bytes, only the pre-roll remains."""
+        excess = self._filled + incoming - self._pre_roll_bytes
+        if excess <= 0:
+            return
+        excess = min(excess, self._filled)
+        kept = self._filled - excess
+        self._view[:kept] = self._view[excess:self._filled]
+        self._filled = kept
+        self._oldest += excess / self._bytes_per_second
+        self.stats.skipped_frames += 1
+
+    def _is_voiced(self, frame: memoryview) -> bool:
+        samples = np.frombuffer(frame, dtype=np.int16)
+        if not len(samples):
+            return False
+        return float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) > self._threshold
+
+    def _bytes_for(self, ms: int) -> int:
+        return int(self._bytes_per_second * ms / 1000) // SAMPLE_WIDTH * SAMPLE_WIDTH
@@ -0,0 +1,180 @@
+"""Warm local Whisper server.
+
+Keeps Whisper models loaded between requests so a transcription costs only
+inference, not a multi-second model load. Models are loaded on first use and
+kept in an LRU bounded by ``--max-memory-gb`` (see ``whisper_models.py``).
+
+Listens on localhost only. Endpoints:
+
+    POST /transcribe?model=turbo
+        Content-Type: application/json         {"path": "/abs/path/to/audio.wav"}
+        Content-Type: application/octet-stream raw 16 kHz mono PCM, ``&format=f32`` (default) or ``s16``
+        → {"text", "language", "model", "audioSeconds", "loadSeconds", "transcribeSeconds"}
+    GET /models   loaded models, their memory and the budget
+    GET /health
+
+``01-whisper-local.py`` uses this server when it is running and falls back to
+loading the model itself when it isn't.
+
+Usage::
+
+    uv run 01-stt-playground/whisper-server.py                       # port 8765, 8 GB budget
+    uv run 01-stt-playground/whisper-server.py --preload turbo base  # load before the first request
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import whisper
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.eventlog import get_logger
+
+from whisper_models import SAMPLE_RATE, ModelCache, transcribe
+
+log = get_logger("whisper-server")
+
+PORT = 8765
+DEFAULT_MODEL = "turbo"
+PCM_FORMATS = {"f32": np.float32, "s16": np.int16}
+
+
+class WhisperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # the client keeps its connection open between clips
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/transcribe":
+            self._send_json(404, {"error": "not found"})
+            return
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {"error": "invalid Content-Length"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            audio = self._decode_audio(body, query)
+        except (ValueError, KeyError, RuntimeError) as e:
+            # RuntimeError: ffmpeg couldn't read the file
+            self._send_json(400, {"error": str(e)})
+            return
+
+        name = query.get("model", DEFAULT_MODEL)
+        if name not in whisper.available_models():
+            self._send_json(400, {"error": f"unknown model {name!r}"})
+            return
+
+        try:
+            entry, was_loaded = self.server.models.get(name)
+            started = time.perf_counter()
+            result = transcribe(entry, audio)
+            elapsed = time.perf_counter() - started
+        except Exception as e:  # download, out of memory, inference – the client still gets an answer
+            log.error("transcribe-failed", "[red]{model} failed:[/] {error}", model=name, error=repr(e))
+            self._send_json(500, {"error": f"transcription failed: {e}"})
+            return
+
+        audio_seconds = len(audio) / SAMPLE_RATE
+        log.info(
+            "transcribed",
+            "[cyan]{model}[/] {audio_seconds:.1f}s audio in {transcribe_seconds:.2f}s" + (" [dim](loaded in {load_seconds:.1f}s)[/]" if was_loaded else ""),
+            model=name,
+            audio_seconds=audio_seconds,
+            transcribe_seconds=elapsed,
+            load_seconds=entry.load_seconds if was_loaded else 0.0,
+        )
+        self._send_json(200, {
+            "text": result["text"],
+            "language": result.get("language"),
+            "model": name,
+            "audioSeconds": round(audio_seconds, 3),
+            "loadSeconds": round(entry.load_seconds, 3) if was_loaded else 0.0,
+            "transcribeSeconds": round(elapsed, 3),
+        })
+
+    def do_GET(self):
+        models = self.server.models
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/models":
+            self._send_json(200, {"loaded": models.loaded(), "usedBytes": models.used_bytes(), "budgetBytes": models.budget_bytes})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _decode_audio(self, body: bytes, query: dict) -> np.ndarray:
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            payload = json.loads(body)
+            if not isinstance(payload, dict) or not isinstance(payload.get("path"), str):
+                raise ValueError('expected a JSON object with a "path" string')
+            return whisper.load_audio(payload["path"])
+
+        dtype = PCM_FORMATS.get(query.get("format", "f32"))
+        if dtype is None:
+            raise ValueError(f"format must be one of {', '.join(PCM_FORMATS)}")
+        if int(query.get("sample_rate", SAMPLE_RATE)) != SAMPLE_RATE:
+            raise ValueError(f"raw PCM must be {SAMPLE_RATE} Hz mono")
+        if len(body) % np.dtype(dtype).itemsize:
+            raise ValueError("body length is not a whole number of samples")
+        audio = np.frombuffer(body, dtype=dtype)
+        return audio.astype(np.float32) / 32768.0 if dtype is np.int16 else audio
+
+    def _send_json(self, status: int, response: dict):
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # suppress default HTTP logging
+
+
+class WhisperHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, models: ModelCache):
+        super().__init__(address, WhisperHandler)
+        self.models = models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm local Whisper transcription server")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port on 127.0.0.1 (default: {PORT})")
+    parser.add_argument("--max-memory-gb", type=float, default=8.0, help="Memory budget for loaded models (default: 8)")
+    parser.add_argument("--device", default=None, help="torch device, e.g. cpu or cuda (default: Whisper's choice)")
+    parser.add_argument("--preload", nargs="*", default=[], help="Models to load at startup")
+    args = parser.parse_args()
+
+    models = ModelCache(int(args.max_memory_gb * 1024**3), device=args.device)
+    for name in args.preload:
+        entry, _ = models.get(name)
+        log.info("model-loaded", "[green]Loaded {model}[/] [dim]({mb:,.0f} MB in {seconds:.1f}s)[/]", model=name, mb=entry.nbytes / 1e6, seconds=entry.load_seconds)
+
+    server = WhisperHTTPServer(("127.0.0.1", args.port), models)
+    log.info(
+        "server-started",
+        "[bold green]🎙  Whisper server on http://127.0.0.1:{port}[/] [dim](budget {budget_gb:.1f} GB)[/]",
+        port=args.port,
+        budget_gb=args.max_memory_gb,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("server-stopped", "\n[bold green]Server stopped.[/]")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Batch transcription of a directory of recordings.
+
+Work is split into two stages so neither waits on the other:
+
+    - a thread pool decodes files with ffmpeg (``stt_engines.decode_audio``).
+      That work happens in subprocesses, so threads are enough;
+    - a process pool, sized to the CPU cores, runs inference. The model is
+      loaded once in the parent before the pool starts. With the ``fork``
+      start method every worker shares those weights copy-on-write instead of
+      loading its own copy. Where ``fork`` isn't available, or the engine
+      isn't fork-safe, each worker loads the model itself.
+
+At most a few clips per worker are decoded ahead of inference, so memory stays
+flat however large the directory is.
+
+Results are appended to a JSONL file as each file finishes. Re-running with
+the same output skips files that already have a transcript, so an interrupted
+run resumes where it stopped. Failed files are recorded with an ``error`` and
+retried next time.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from common.eventlog import get_logger
+from stt_engines import ENGINES, SAMPLE_RATE, STTEngine, decode_audio, load_engine
+
+log = get_logger("whisper-batch")
+
+AUDIO_SUFFIXES = {".wav", ".mp3"}
+
+_engine: STTEngine | None = None  # per process; inherited from the parent under fork
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def speed(self) -> float:
+        """Audio seconds transcribed per wall-clock second."""
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def find_audio(directory: Path) -> list[Path]:
+    return sorted(p for p in directory.rglob("*") if p.suffix.lower() in AUDIO_SUFFIXES and p.is_file())
+
+
+def completed(out: Path) -> set[str]:
+    """Paths that already have a transcript in ``out``."""
+    done = set()
+    if out.exists():
+        with out.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interrupted run
+                if "text" in record:
+                    done.add(record["path"])
+    return done
+
+
+def run_batch(directory: Path, model_name: str, out: Path, workers: int | None = None, decoders: int = 4, engine: str = "whisper") -> BatchStats:
+    global _engine
+    workers = workers or os.cpu_count() or 1
+    stats = BatchStats()
+
+    done = completed(out)
+    todo: deque[Path] = deque()
+    for path in find_audio(directory):
+        if str(path.relative_to(directory)) in done:
+            stats.skipped += 1
+        else:
+            todo.append(path)
+    if not todo:
+        log.info("batch-up-to-date", "[green]Nothing to do – all {skipped} files already transcribed in {out}[/]", skipped=stats.skipped, out=str(out))
+        return stats
+
+    log.info("loading-model", "[yellow]Loading {engine} model '{model}' …[/]", engine=engine, model=model_name)
+    context = None
+    if ENGINES[engine].fork_safe and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _engine = load_engine(engine, model_name, device="cpu")
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+    log.info(
+        "batch-started",
+        "[bold green]📂 {count} files[/] [dim]({skipped} already done) · {workers} workers × {threads} threads · {decoders} decoders[/]",
+        count=len(todo),
+        skipped=stats.skipped,
+        workers=workers,
+        threads=threads_per_worker,
+        decoders=decoders,
+    )
+
+    max_in_flight = workers * 2 + decoders  # decoded-ahead clips are the main memory cost
+    decoding: dict[Future, Path] = {}
+    transcribing: dict[Future, tuple[str, float]] = {}
+
+    with (
+        out.open("a", encoding="utf-8") as results,
+        ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(engine, model_name, threads_per_worker)) as worker_pool,
+    ):
+        # Start the workers before any decode thread exists (forking a process
+        # with running threads risks deadlocks) and before the clock starts
+        # (spawned workers load their own model here).
+        worker_pool.submit(os.getpid).result()
+        started = time.perf_counter()
+        if results.tell() and not _ends_with_newline(out):
+            results.write("\n")  # don't glue the first new record onto a cut-off line
+
+        def write(record: dict):
+            results.write(json.dumps(record, ensure_ascii=False) + "\n")
+            results.flush()
+
+        with ThreadPoolExecutor(max_workers=decoders, thread_name_prefix="decode") as decode_pool:
+            while todo or decoding or transcribing:
+                while todo and len(decoding) + len(transcribing) < max_in_flight:
+                    path = todo.popleft()
+                    decoding[decode_pool.submit(decode_audio, str(path))] = path
+
+                finished, _ = wait([*decoding, *transcribing], return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in decoding:
+                        relative = str(decoding.pop(future).relative_to(directory))
+                        try:
+                            audio = future.result()
+                        except Exception as e:  # ffmpeg couldn't decode it
+                            stats.failed += 1
+                            write({"path": relative, "error": str(e)})
+                            log.error("decode-failed", "[red]✗ {path}[/] {error}", path=relative, error=str(e))
+                            continue
+                        transcribing[worker_pool.submit(_transcribe, audio)] = (relative, len(audio) / SAMPLE_RATE)
+                        continue
+
+                    relative, audio_seconds = transcribing.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        raise  # a worker died (e.g. out of memory) – nothing more will run
+                    except Exception as e:
+                        stats.failed += 1
+                        write({"path": relative, "error": repr(e)})
+                        log.error("transcribe-failed", "[red]✗ {path}[/] {error}", path=relative, error=repr(e))
+                        continue
+                    stats.files += 1
+                    stats.audio_seconds += audio_seconds
+                    write({"path": relative, "engine": engine, "model": model_name, "audioSeconds": round(audio_seconds, 3), **result})
+                    log.info(
+                        "transcribed",
+                        "[green]✓[/] {path} [dim]({audio_seconds:.1f}s audio in {transcribe_seconds:.1f}s)[/]",
+                        path=relative,
+                        audio_seconds=audio_seconds,
+                        transcribe_seconds=result["transcribeSeconds"],
+                    )
+        stats.wall_seconds = time.perf_counter() - started
+
+    log.info(
+        "batch-finished",
+        "\n[bold cyan]{files} files, {audio_seconds:,.0f}s of audio in {wall_seconds:,.1f}s → {speed:.2f} audio-s per wall-s[/]"
+        " [dim]({failed} failed, {skipped} skipped)[/]",
+        files=stats.files,
+        audio_seconds=stats.audio_seconds,
+        wall_seconds=stats.wall_seconds,
+        speed=stats.speed,
+        failed=stats.failed,
+        skipped=stats.skipped,
+        model=model_name,
+    )
+    return stats
+
+
+def _init_worker(engine: str, model_name: str, threads: int):
+    global _engine
+    # Workers already cover the cores; more intra-op threads would only contend.
+    if _engine is None:  # not inherited from the parent
+        _engine = load_engine(engine, model_name, device="cpu", threads=threads)
+    else:
+        _engine.limit_threads(threads)
+
+
+def _transcribe(audio: np.ndarray) -> dict:
+    started = time.perf_counter()
+    result = _engine.transcribe(audio)
+    return {"text": result.text, "language": result.language, "transcribeSeconds": round(time.perf_counter() - started, 3)}
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
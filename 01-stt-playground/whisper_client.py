@@ -0,0 +1,50 @@
+"""Client for ``whisper-server.py``.
+
+Sends a recording as raw 16 kHz float32 PCM, or a file path for the server to
+read itself. Raises :class:`ServerUnavailable` when nothing is listening or the
+connection fails mid-request, so callers can fall back to loading the model
+in-process.
+"""
+
+import os
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+DEFAULT_URL = os.getenv("WHISPER_SERVER_URL", "http://127.0.0.1:8765")
+
+
+class ServerUnavailable(Exception):
+    pass
+
+
+class WhisperClient:
+    def __init__(self, url: str = DEFAULT_URL, timeout: float = 600.0):
+        # Generous read timeout: the first request for a model includes loading it.
+        self._client = httpx.Client(base_url=url, timeout=httpx.Timeout(timeout, connect=1.0))
+
+    def transcribe_pcm(self, audio: np.ndarray, model: str) -> dict:
+        body = np.ascontiguousarray(audio, dtype=np.float32).tobytes()
+        return self._post(model, content=body, headers={"Content-Type": "application/octet-stream"})
+
+    def transcribe_file(self, path: str | Path, model: str) -> dict:
+        return self._post(model, json={"path": str(Path(path).resolve())})
+
+    def is_running(self) -> bool:
+        try:
+            return self._client.get("/health").status_code == 200
+        except httpx.TransportError:
+            return False
+
+    def close(self):
+        self._client.close()
+
+    def _post(self, model: str, **kwargs) -> dict:
+        try:
+            response = self._client.post("/transcribe", params={"model": model}, **kwargs)
+        except httpx.TransportError as e:  # not listening, or died mid-request
+            raise ServerUnavailable(str(e)) from e
+        if response.status_code != 200:
+            raise ValueError(response.json().get("error", response.text))
+        return response.json()
@@ -0,0 +1,109 @@
+"""Loaded Whisper models, kept warm in an LRU bounded by a memory budget.
+
+``whisper.load_model`` reads and initialises hundreds of megabytes to several
+gigabytes of weights – seconds before any audio is processed. :class:`ModelCache`
+loads each model once and hands the same instance to every later request.
+When loading another model would push the total over ``budget_bytes``, the
+least recently used models are dropped first.
+
+Whisper installs per-call hooks on the model while decoding, so one model
+must not transcribe two clips at once: each :class:`LoadedModel` carries a
+lock that :func:`transcribe` holds for the duration of a call. Different
+models run in parallel.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import chain
+
+import numpy as np
+import whisper
+
+SAMPLE_RATE = whisper.audio.SAMPLE_RATE  # 16 kHz mono float32, what Whisper expects
+
+# Rough fp32 footprint per model family, used to make room *before* loading.
+# The real size is measured once the model is in memory.
+_APPROX_MB = {"tiny": 150, "base": 290, "small": 970, "medium": 3060, "large": 6170, "turbo": 3240}
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    model: whisper.Whisper
+    nbytes: int
+    load_seconds: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelCache:
+    """Thread-safe LRU of loaded Whisper models with a total memory budget."""
+
+    def __init__(self, budget_bytes: int, device: str | None = None):
+        self.budget_bytes = budget_bytes
+        self.device = device
+        self._models: OrderedDict[str, LoadedModel] = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+
+    def get(self, name: str) -> tuple[LoadedModel, bool]:
+        """Return ``(model, was_loaded)``, loading ``name`` if it isn't warm yet."""
+        with self._lock:
+            entry = self._models.get(name)
+            if entry is not None:
+                self._models.move_to_end(name)
+                return entry, False
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        # One loader per model name; concurrent requests for it wait here and
+        # then find it in the cache.
+        with loading:
+            with self._lock:
+                entry = self._models.get(name)
+                if entry is not None:
+                    self._models.move_to_end(name)
+                    return entry, False
+                self._evict(_approx_bytes(name))
+
+            started = time.perf_counter()
+            model = whisper.load_model(name, device=self.device)
+            entry = LoadedModel(name, model, model_bytes(model), time.perf_counter() - started)
+
+            with self._lock:
+                self._models[name] = entry
+                self._evict(0)
+            return entry, True
+
+    def loaded(self) -> list[dict]:
+        with self._lock:
+            return [{"name": e.name, "bytes": e.nbytes, "loadSeconds": round(e.load_seconds, 3)} for e in self._models.values()]
+
+    def used_bytes(self) -> int:
+        with self._lock:
+            return sum(e.nbytes for e in self._models.values())
+
+    def _evict(self, incoming: int):
+        # Called with self._lock held. The most recently used model is never
+        # evicted, so a single model larger than the budget still loads.
+        while len(self._models) > 1 or (incoming and self._models):
+            used = sum(e.nbytes for e in self._models.values())
+            if used + incoming <= self.budget_bytes:
+                break
+            self._models.popitem(last=False)
+
+
+def model_bytes(model: whisper.Whisper) -> int:
+    """Memory held by the model's parameters and buffers."""
+    return sum(t.numel() * t.element_size() for t in chain(model.parameters(), model.buffers()))
+
+
+def transcribe(entry: LoadedModel, audio: np.ndarray) -> dict:
+    """Transcribe 16 kHz mono float32 ``audio``; returns Whisper's result dict."""
+    with entry.lock:
+        return entry.model.transcribe(audio, fp16=False)
+
+
+def _approx_bytes(name: str) -> int:
+    family = name.split("-")[0].split(".")[0]
+    return _APPROX_MB.get(family, 0) * 1024 * 1024
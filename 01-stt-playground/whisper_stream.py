@@ -0,0 +1,219 @@
+"""Streaming Whisper: segment live audio with a VAD, transcribe segments as they end.
+
+Whisper itself is not a streaming model, but it doesn't need to see a whole
+recording either. Audio is read in 32 ms blocks (from the microphone, or from
+a file paced in real time), and a VAD decides which blocks are speech. A
+segment ends after ``min_silence_ms`` of silence – or at ``max_segment_s``
+for long monologues – and is handed to a worker thread. Capture keeps going
+while the worker transcribes, and each segment's text is printed as soon as
+it lands.
+
+For every segment the latency from end of speech (arrival of the last voiced
+block) to text is reported. It includes the silence the segmenter waits for,
+because the caller waits for it too.
+
+VADs:
+    - ``energy`` – RMS level against a dBFS threshold. No dependencies, fine
+      for a quiet room.
+    - ``silero`` – Silero's neural VAD (``pip install silero-vad``), robust to
+      background noise.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+
+from common.benchstats import percentile
+from common.eventlog import get_logger
+
+log = get_logger("whisper-stream")
+
+SAMPLE_RATE = 16_000
+BLOCK_SAMPLES = 512  # 32 ms; the window Silero expects at 16 kHz
+
+
+class EnergyVAD:
+    def __init__(self, threshold_db: float = -40.0):
+        self.threshold_db = threshold_db
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        rms = float(np.sqrt(np.mean(np.square(block), dtype=np.float64)))
+        return 20 * np.log10(max(rms, 1e-10)) > self.threshold_db
+
+
+class SileroVAD:
+    def __init__(self, threshold: float = 0.5):
+        try:
+            import torch
+            from silero_vad import load_silero_vad
+        except ImportError as e:
+            raise SystemExit("The Silero VAD needs the silero-vad package: pip install silero-vad") from e
+        self._torch = torch
+        self._model = load_silero_vad()
+        self.threshold = threshold
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        probability = self._model(self._torch.from_numpy(block), SAMPLE_RATE).item()
+        return probability >= self.threshold
+
+
+@dataclass
+class Segment:
+    index: int
+    start: float  # seconds into the stream
+    end: float
+    audio: np.ndarray
+    speech_ended_at: float  # perf_counter() when the last voiced block arrived
+
+
+class Segmenter:
+    """Groups voiced blocks into segments separated by silence."""
+
+    def __init__(
+        self,
+        vad: EnergyVAD | SileroVAD,
+        min_silence_ms: int = 500,
+        min_speech_ms: int = 250,  # shorter blips (clicks, coughs) are dropped
+        pre_roll_ms: int = 200,  # kept from before speech starts, so first syllables aren't clipped
+        max_segment_s: float = 15.0,
+    ):
+        self.vad = vad
+        self.min_silence_blocks = _blocks_for(min_silence_ms)
+        self.min_speech_blocks = _blocks_for(min_speech_ms)
+        self.max_segment_samples = int(max_segment_s * SAMPLE_RATE)
+        self._pre_roll: deque[np.ndarray] = deque(maxlen=_blocks_for(pre_roll_ms))
+        self._blocks: list[np.ndarray] = []
+        self._voiced_blocks = 0
+        self._silent_blocks = 0
+        self._position = 0  # samples seen so far
+        self._start = 0
+        self._last_voiced_at = 0.0
+        self._count = 0
+
+    def feed(self, block: np.ndarray, arrived_at: float) -> Segment | None:
+        """Add one block; returns a segment when one just ended."""
+        self._position += len(block)
+        speech = self.vad.is_speech(block)
+
+        if not self._blocks:
+            if not speech:
+                self._pre_roll.append(block)
+                return None
+            self._blocks = [*self._pre_roll, block]
+            self._start = self._position - sum(len(b) for b in self._blocks)
+            self._pre_roll.clear()
+            self._voiced_blocks = self._silent_blocks = 0
+        else:
+            self._blocks.append(block)
+
+        if speech:
+            self._voiced_blocks += 1
+            self._silent_blocks = 0
+            self._last_voiced_at = arrived_at
+        else:
+            self._silent_blocks += 1
+
+        if self._silent_blocks >= self.min_silence_blocks or self._position - self._start >= self.max_segment_samples:
+            return self._cut()
+        return None
+
+    def flush(self) -> Segment | None:
+        """End the current segment, e.g. when the input ends mid-sentence."""
+        return self._cut() if self._blocks else None
+
+    def _cut(self) -> Segment | None:
+        blocks, self._blocks = self._blocks, []
+        if self._voiced_blocks < self.min_speech_blocks:
+            return None
+        self._count += 1
+        return Segment(
+            index=self._count,
+            start=self._start / SAMPLE_RATE,
+            end=self._position / SAMPLE_RATE,
+            audio=np.concatenate(blocks),
+            speech_ended_at=self._last_voiced_at,
+        )
+
+
+def mic_blocks() -> Iterator[tuple[np.ndarray, float]]:
+    """Microphone blocks with their arrival time, until the consumer stops iterating."""
+    import sounddevice as sd
+
+    blocks: queue.Queue = queue.Queue()
+
+    def callback(indata, frames, time_info, status):
+        blocks.put((indata[:, 0].copy(), time.perf_counter()))
+
+    with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype="float32", blocksize=BLOCK_SAMPLES, callback=callback):
+        while True:
+            yield blocks.get()
+
+
+def file_blocks(audio: np.ndarray, realtime: bool = True) -> Iterator[tuple[np.ndarray, float]]:
+    """Blocks of a decoded file; paced like a live source unless ``realtime`` is off."""
+    started = time.perf_counter()
+    for offset in range(0, len(audio) - BLOCK_SAMPLES + 1, BLOCK_SAMPLES):
+        if realtime:
+            due = started + (offset + BLOCK_SAMPLES) / SAMPLE_RATE
+            time.sleep(max(0.0, due - time.perf_counter()))
+        yield audio[offset:offset + BLOCK_SAMPLES], time.perf_counter()
+
+
+def stream(blocks: Iterator[tuple[np.ndarray, float]], segmenter: Segmenter, transcribe: Callable[[np.ndarray], str]) -> list[float]:
+    """Segment ``blocks`` and transcribe on a worker thread; returns per-segment latencies."""
+    segments: queue.Queue[Segment | None] = queue.Queue()
+    latencies: list[float] = []
+
+    def worker():
+        while (segment := segments.get()) is not None:
+            try:
+                text = transcribe(segment.audio).strip()
+            except Exception as e:  # one bad segment mustn't stop the ones after it
+                log.error("segment-failed", "[red]Segment {index} failed:[/] {error}", index=segment.index, error=repr(e))
+                continue
+            latency = time.perf_counter() - segment.speech_ended_at
+            latencies.append(latency)
+            log.info(
+                "segment",
+                "[dim]{start:6.1f}s–{end:5.1f}s[/] [bold cyan]{text}[/] [dim](+{latency_ms:,.0f} ms)[/]",
+                index=segment.index,
+                start=segment.start,
+                end=segment.end,
+                text=text,
+                latency_ms=latency * 1000,
+            )
+
+    thread = threading.Thread(target=worker, name="whisper-stream", daemon=True)
+    thread.start()
+    try:
+        for block, arrived_at in blocks:
+            if (segment := segmenter.feed(block, arrived_at)) is not None:
+                segments.put(segment)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if (segment := segmenter.flush()) is not None:
+            segments.put(segment)
+        segments.put(None)
+        thread.join()
+
+    if latencies:
+        ordered = sorted(latencies)
+        log.info(
+            "stream-finished",
+            "\n[bold green]{count} segments[/] · end-of-speech → text p50 [bold]{p50_ms:,.0f} ms[/], p95 {p95_ms:,.0f} ms, max {max_ms:,.0f} ms",
+            count=len(ordered),
+            p50_ms=percentile(ordered, 50) * 1000,
+            p95_ms=percentile(ordered, 95) * 1000,
+            max_ms=ordered[-1] * 1000,
+        )
+    return latencies
+
+
+def _blocks_for(ms: int) -> int:
+    return max(1, round(ms / 1000 * SAMPLE_RATE / BLOCK_SAMPLES))
@@ -1,44 +1,62 @@
 """Stream TTS audio from Cartesia's Sonic 3 model.
 
-Streams audio chunks from Cartesia and plays them back locally.
-Requires CARTESIA_API_KEY in .env.
+Streams raw PCM chunks from Cartesia straight to the audio device as they
+arrive (see ``audio_player.StreamPlayer``), so playback starts after the
+first chunk rather than after the whole utterance. ``--save`` also writes the
+audio to a WAV file on the way through.
+
+The audio is cached (``common.tts_cache``), so a second run plays it without
+calling Cartesia. ``--no-cache`` always synthesizes.
+
+Requires CARTESIA_API_KEY in .env; CARTESIA_BASE_URL points it elsewhere,
+e.g. at ``mock-servers/serve.py``.
 
 Usage::
 
     uv run 02-tts-playground/01-cartesia-stream.py
+    uv run 02-tts-playground/01-cartesia-stream.py --save   # also write cartesia_output.wav
 """
 
+import argparse
 import asyncio
 import os
-import subprocess
 import sys
+import time
+from pathlib import Path
 
-from cartesia import AsyncCartesia
 from dotenv import load_dotenv
 from rich.console import Console
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+
+from audio_player import StreamPlayer, playback_report
+from common import clients
+from common.tts_cache import CacheKey, TTSCache
+
 load_dotenv()
 console = Console()
 
 OUTPUT_FILE = "cartesia_output.wav"
+SAMPLE_RATE = 44100
+MODEL = "sonic-3"
 
 
-async def main():
+async def main(save: str | None, prebuffer_ms: int, use_cache: bool):
     api_key = os.getenv("CARTESIA_API_KEY")
     if not api_key:
         console.print("[red]Set CARTESIA_API_KEY in .env[/]")
         return
 
-    client = AsyncCartesia(api_key=api_key)
+    client = clients.cartesia()
 
     text = "Hello! I'm a voice agent built with Cartesia Sonic 3. How can I help you today?"
     voice_id = "a0e99841-438c-4a64-b679-ae501e7d6091"  # Barbershop Man
 
     console.print(f"[bold green]🔊 Streaming:[/] {text}")
 
-    with open(OUTPUT_FILE, "wb") as f:
-        bytes_iter = client.tts.bytes(
-            model_id="sonic-3",
+    def synthesize():
+        return client.tts.bytes(
+            model_id=MODEL,
             transcript=text,
             voice={
                 "mode": "id",
@@ -46,22 +64,37 @@ async def main():
             },
             language="en",
             output_format={
-                "container": "wav",
-                "sample_rate": 44100,
+                "container": "raw",
+                "sample_rate": SAMPLE_RATE,
                 "encoding": "pcm_s16le",
             },
         )
-        async for chunk in bytes_iter:
-            f.write(chunk)
 
-    console.print(f"[bold green]✅ Saved to {OUTPUT_FILE}[/]")
+    cache = TTSCache() if use_cache else None
+    key = CacheKey("cartesia", MODEL, voice_id, text, "pcm_s16le", SAMPLE_RATE)
+
+    with StreamPlayer(SAMPLE_RATE, prebuffer_ms=prebuffer_ms, tee=save) as player:
+        started = time.perf_counter()
+        first_byte = None
+        async for chunk in cache.astream(key, synthesize) if cache else synthesize():
+            first_byte = first_byte or time.perf_counter() - started
+            player.write(chunk)
+        synthesized = time.perf_counter() - started
+        player.finish()
+        await asyncio.to_thread(player.wait)
 
-    # Play the audio
-    if sys.platform == "darwin":
-        subprocess.run(["afplay", OUTPUT_FILE])
-    else:
-        subprocess.run(["ffplay", "-autoexit", "-nodisp", OUTPUT_FILE])
+    await clients.aclose()
+    console.print(playback_report(player, started, first_byte, synthesized))
+    if cache and cache.stats.misses == 0:
+        console.print(f"[dim]Played from the TTS cache ({cache.directory}) – no request sent[/]")
+    if save:
+        console.print(f"[bold green]✅ Saved to {save}[/]")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Stream Cartesia TTS to the speakers")
+    parser.add_argument("--save", nargs="?", const=OUTPUT_FILE, help=f"Also write the audio to a WAV file (default: {OUTPUT_FILE})")
+    parser.add_argument("--prebuffer-ms", type=int, default=100, help="Audio buffered before playback starts (default: 100)")
+    parser.add_argument("--no-cache", action="store_true", help="Always synthesize; don't read or fill the TTS cache")
+    args = parser.parse_args()
+    asyncio.run(main(args.save, args.prebuffer_ms, not args.no_cache))
@@ -1,51 +1,80 @@
 """Stream TTS audio from ElevenLabs.
 
-Streams audio chunks from ElevenLabs and plays them back locally.
-Requires ELEVENLABS_API_KEY in .env.
+Streams raw PCM chunks from ElevenLabs straight to the audio device as they
+arrive (see ``audio_player.StreamPlayer``), so playback starts after the
+first chunk rather than after the whole utterance. ``--save`` also writes the
+audio to a WAV file on the way through.
+
+The audio is cached (``common.tts_cache``), so a second run plays it without
+calling ElevenLabs. ``--no-cache`` always synthesizes.
+
+Requires ELEVENLABS_API_KEY in .env; ELEVENLABS_BASE_URL points it elsewhere,
+e.g. at ``mock-servers/serve.py``.
 
 Usage::
 
     uv run 02-tts-playground/02-elevenlabs-stream.py
+    uv run 02-tts-playground/02-elevenlabs-stream.py --save   # also write elevenlabs_output.wav
 """
 
+import argparse
 import os
-import subprocess
 import sys
+import time
+from pathlib import Path
 
-from elevenlabs import ElevenLabs
 from dotenv import load_dotenv
 from rich.console import Console
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+
+from audio_player import StreamPlayer, playback_report
+from common import clients
+from common.tts_cache import CacheKey, TTSCache
+
 load_dotenv()
 console = Console()
 
-OUTPUT_FILE = "elevenlabs_output.mp3"
+OUTPUT_FILE = "elevenlabs_output.wav"
+SAMPLE_RATE = 24000  # pcm_24000: raw 16-bit PCM, playable without an MP3 decoder
+MODEL = "eleven_flash_v2_5"
+VOICE_ID = "JBFqnCBsd6RMkjVDRZzb"  # George
 
 
-def main():
+def main(save: str | None, prebuffer_ms: int, use_cache: bool):
     api_key = os.getenv("ELEVENLABS_API_KEY")
     if not api_key:
         console.print("[red]Set ELEVENLABS_API_KEY in .env[/]")
         return
 
-    client = ElevenLabs(api_key=api_key)
+    client = clients.elevenlabs(sync=True)
 
     text = "Hello! I'm a voice agent built with ElevenLabs. How can I help you today?"
 
     console.print(f"[bold green]🔊 Streaming:[/] {text}")
 
-    try:
-        audio_generator = client.text_to_speech.convert(
-            voice_id="JBFqnCBsd6RMkjVDRZzb",  # George
+    def synthesize():
+        return client.text_to_speech.convert(
+            voice_id=VOICE_ID,
             text=text,
-            model_id="eleven_flash_v2_5",
-            output_format="mp3_44100_128",
+            model_id=MODEL,
+            output_format=f"pcm_{SAMPLE_RATE}",
         )
 
-        # Collect streamed chunks and save
-        with open(OUTPUT_FILE, "wb") as f:
-            for chunk in audio_generator:
-                f.write(chunk)
+    cache = TTSCache() if use_cache else None
+    key = CacheKey("elevenlabs", MODEL, VOICE_ID, text, "pcm_s16le", SAMPLE_RATE)
+
+    try:
+        with StreamPlayer(SAMPLE_RATE, prebuffer_ms=prebuffer_ms, tee=save) as player:
+            started = time.perf_counter()
+            first_byte = None
+            # Play chunks as they arrive
+            for chunk in cache.stream(key, synthesize) if cache else synthesize():
+                first_byte = first_byte or time.perf_counter() - started
+                player.write(chunk)
+            synthesized = time.perf_counter() - started
+            player.finish()
+            player.wait()
     except Exception as e:
         if "quota_exceeded" in str(e):
             console.print("[red]ElevenLabs quota exceeded – top up credits or shorten the text.[/]")
@@ -53,14 +82,17 @@ def main():
             console.print(f"[red]ElevenLabs error:[/] {e}")
         return
 
-    console.print(f"[bold green]✅ Saved to {OUTPUT_FILE}[/]")
-
-    # Play the audio
-    if sys.platform == "darwin":
-        subprocess.run(["afplay", OUTPUT_FILE])
-    else:
-        subprocess.run(["ffplay", "-autoexit", "-nodisp", OUTPUT_FILE])
+    console.print(playback_report(player, started, first_byte, synthesized))
+    if cache and cache.stats.misses == 0:
+        console.print(f"[dim]Played from the TTS cache ({cache.directory}) – no request sent[/]")
+    if save:
+        console.print(f"[bold green]✅ Saved to {save}[/]")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Stream ElevenLabs TTS to the speakers")
+    parser.add_argument("--save", nargs="?", const=OUTPUT_FILE, help=f"Also write the audio to a WAV file (default: {OUTPUT_FILE})")
+    parser.add_argument("--prebuffer-ms", type=int, default=100, help="Audio buffered before playback starts (default: 100)")
+    parser.add_argument("--no-cache", action="store_true", help="Always synthesize; don't read or fill the TTS cache")
+    args = parser.parse_args()
+    main(args.save, args.prebuffer_ms, not args.no_cache)
@@ -3,64 +3,184 @@
 Runs Kokoro TTS entirely on your machine using the Kokoro-82M model.
 First run downloads the model (~327 MB) and voice pack.
 
+Synthesis goes through ``kokoro_service.KokoroService``. It loads the model
+once and warms it up, then yields audio sentence by sentence. Each sentence
+goes straight to the audio device (see ``audio_player.StreamPlayer``), so the
+first sentence plays while the rest are still being generated. ``--save``
+also writes a WAV file.
+
+``--batch`` serves a file of texts instead, one request per line, all
+submitted at once to a pool of ``--workers`` (default: one per CPU core).
+Each request is written incrementally to ``--out``/NNN.wav.
+
+Both modes report per-sentence latency and the process's peak RSS.
+
+The single-utterance mode caches its audio (``common.tts_cache``). A repeat
+run plays from the cache without loading the model. ``--no-cache`` always
+synthesizes.
+
 Usage::
 
     uv run 02-tts-playground/03-kokoro-local.py
-    uv run 02-tts-playground/03-kokoro-local.py --voice af_heart
+    uv run 02-tts-playground/03-kokoro-local.py --voice af_heart --save
+    uv run 02-tts-playground/03-kokoro-local.py --batch lines.txt --workers 4 --out kokoro_out/
 """
 
 import argparse
 import os
-import subprocess
 import sys
+import time
+import wave
 import warnings
+from pathlib import Path
 
 os.environ["HF_HUB_DISABLE_PROGRESS_BARS"] = "0"
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-import numpy as np
-import soundfile as sf
-from kokoro import KPipeline
 from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+
+from audio_player import StreamPlayer, playback_report
+from common.benchstats import peak_rss_bytes, percentile
+from common.tts_cache import CacheKey, TTSCache
+from kokoro_service import DEFAULT_VOICE, REPO_ID, SAMPLE_RATE, KokoroService, SynthesisResult
 
 console = Console()
 
 OUTPUT_FILE = "kokoro_output.wav"
-SAMPLE_RATE = 24000
+TEXT = "Hello! I'm a voice agent running entirely on your local machine. No API key needed."
+
+
+def speak(service: KokoroService, text: str, voice: str, save: str | None, prebuffer_ms: int, cache: TTSCache | None):
+    console.print(f"[bold green]🔊 Generating:[/] {text}")
+    console.print(f"[dim]Voice: {voice}[/]")
+
+    audio = bytearray()
+
+    def sink(pcm, _sentence):
+        player.write(pcm)
+        if cache:
+            audio.extend(pcm)
+
+    with StreamPlayer(SAMPLE_RATE, prebuffer_ms=prebuffer_ms, tee=save) as player:
+        started = time.perf_counter()
+        result = service.submit(text, voice, sink=sink).result()
+        player.finish()
+        player.wait()
+    if cache:
+        cache.put(cache_key(text, voice), audio)
+
+    for sentence in result.sentences:
+        console.print(
+            f"[dim]  {sentence.index + 1}. ready at {sentence.latency_ms:,.0f} ms "
+            f"(synthesis {sentence.synth_ms:,.0f} ms, {sentence.audio_seconds:.1f} s audio)[/] {sentence.text}"
+        )
+    first_byte = result.first_audio_ms / 1000 if result.first_audio_ms is not None else None
+    console.print(playback_report(player, started, first_byte, result.total_ms / 1000))
+    if save:
+        console.print(f"[bold green]✅ Saved to {save}[/]")
+
+
+def play_cached(pcm: memoryview, save: str | None, prebuffer_ms: int):
+    with StreamPlayer(SAMPLE_RATE, prebuffer_ms=prebuffer_ms, tee=save) as player:
+        started = time.perf_counter()
+        player.write(pcm)
+        player.finish()
+        player.wait()
+    console.print(playback_report(player, started, 0.0, 0.0))
+    console.print("[dim]Played from the TTS cache – model not loaded[/]")
+    if save:
+        console.print(f"[bold green]✅ Saved to {save}[/]")
+
+
+def cache_key(text: str, voice: str) -> CacheKey:
+    return CacheKey("kokoro", REPO_ID, voice, text, "pcm_s16le", SAMPLE_RATE)
+
+
+def batch(service: KokoroService, texts: list[str], voice: str, out: Path):
+    out.mkdir(parents=True, exist_ok=True)
+    console.print(f"[bold green]⏱  {len(texts)} requests on {service.workers} workers → {out}/[/]")
+
+    started = time.perf_counter()
+    files, futures = [], []
+    for i, text in enumerate(texts):
+        wav = wave.open(str(out / f"{i:03d}.wav"), "wb")
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        files.append(wav)
+        futures.append(service.submit(text, voice, sink=lambda pcm, _sentence, wav=wav: wav.writeframes(pcm)))
+
+    results: list[SynthesisResult] = []
+    for i, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:  # one bad line shouldn't end the batch
+            console.print(f"[red]Request {i}:[/] {e}")
+        finally:
+            files[i].close()
+    wall = time.perf_counter() - started
+
+    sentences = [s for r in results for s in r.sentences]
+    if not sentences:
+        return
+    audio_seconds = sum(r.audio_seconds for r in results)
+
+    table = Table(title=f"Kokoro – {len(results)} requests, {service.workers} workers")
+    table.add_column("Metric")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("max", justify="right")
+    for label, values in (
+        ("Queued", [r.queued_ms for r in results]),
+        ("First sentence", [r.first_audio_ms for r in results if r.first_audio_ms is not None]),
+        ("Sentence synthesis", [s.synth_ms for s in sentences]),
+        ("Request total", [r.total_ms for r in results]),
+    ):
+        values = sorted(values)
+        table.add_row(label, *(f"{v:,.0f} ms" for v in (percentile(values, 50), percentile(values, 95), values[-1])))
+    console.print(table)
+    console.print(
+        f"[dim]{len(sentences)} sentences, {audio_seconds:.1f} s audio in {wall:.1f} s wall "
+        f"({audio_seconds / wall:.1f}× real time)[/]"
+    )
 
 
 def main():
     parser = argparse.ArgumentParser(description="Local TTS with Kokoro")
     parser.add_argument(
-        "--voice", default="af_heart",
-        help="Kokoro voice name (default: af_heart). See https://huggingface.co/hexgrad/Kokoro-82M",
+        "--voice", default=DEFAULT_VOICE,
+        help=f"Kokoro voice name (default: {DEFAULT_VOICE}). See https://huggingface.co/hexgrad/Kokoro-82M",
     )
+    parser.add_argument("--save", nargs="?", const=OUTPUT_FILE, help=f"Also write the audio to a WAV file (default: {OUTPUT_FILE})")
+    parser.add_argument("--prebuffer-ms", type=int, default=100, help="Audio buffered before playback starts (default: 100)")
+    parser.add_argument("--batch", type=Path, help="Synthesize every line of this file concurrently instead of playing")
+    parser.add_argument("--workers", type=int, help="Synthesis workers (default: 1; with --batch: one per CPU core)")
+    parser.add_argument("--out", type=Path, default=Path("kokoro_out"), help="--batch output directory (default: kokoro_out)")
+    parser.add_argument("--no-cache", action="store_true", help="Always synthesize; don't read or fill the TTS cache")
     args = parser.parse_args()
 
-    text = "Hello! I'm a voice agent running entirely on your local machine. No API key needed."
-
-    console.print(f"[bold green]🔊 Generating:[/] {text}")
-    console.print(f"[dim]Voice: {args.voice}[/]")
-
-    pipeline = KPipeline(lang_code="a", repo_id="hexgrad/Kokoro-82M")
-    generator = pipeline(text, voice=args.voice)
-
-    # Concatenate all audio chunks and save
-    chunks = []
-    for _i, (_gs, _ps, audio) in enumerate(generator):
-        chunks.append(audio)
+    texts = None
+    if args.batch:
+        texts = [line.strip() for line in args.batch.read_text(encoding="utf-8").splitlines() if line.strip()]
+    workers = args.workers or (None if texts else 1)
 
-    full_audio = np.concatenate(chunks)
-    sf.write(OUTPUT_FILE, full_audio, SAMPLE_RATE)
+    cache = None if texts or args.no_cache else TTSCache()
+    if cache and (cached := cache.get(cache_key(TEXT, args.voice))) is not None:
+        play_cached(cached, args.save, args.prebuffer_ms)
+        return
 
-    console.print(f"[bold green]✅ Saved to {OUTPUT_FILE}[/]")
+    with KokoroService(workers=workers, voices=[args.voice]) as service:
+        console.print(f"[dim]Kokoro warm in {service.load_seconds:.1f} s ({service.workers} workers)[/]")
+        if texts:
+            batch(service, texts, args.voice, args.out)
+        else:
+            speak(service, TEXT, args.voice, args.save, args.prebuffer_ms, cache)
 
-    # Play the audio
-    if sys.platform == "darwin":
-        subprocess.run(["afplay", OUTPUT_FILE])
-    else:
-        subprocess.run(["ffplay", "-autoexit", "-nodisp", OUTPUT_FILE])
+    console.print(f"[dim]Peak RSS {peak_rss_bytes() / 2**20:,.0f} MB[/]")
 
 
 if __name__ == "__main__":
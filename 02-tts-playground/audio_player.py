@@ -0,0 +1,147 @@
+"""Play streamed TTS audio as it arrives.
+
+``StreamPlayer`` feeds raw 16-bit mono PCM into a ``sounddevice``
+``RawOutputStream`` through a small jitter buffer, so playback starts as soon
+as the first chunk is in – time to first audio is roughly the provider's time
+to first byte, not its total synthesis time.
+
+    - Playback waits until ``prebuffer_ms`` of audio is buffered (or the input
+      has ended), so uneven chunk arrival doesn't immediately starve the
+      device.
+    - If the buffer runs dry mid-utterance, the device gets silence, the
+      underrun is counted, and playback waits for the prebuffer to refill.
+    - ``tee`` additionally writes everything to a WAV file as it arrives.
+
+Chunks may be any size, even split mid-sample; ``write`` is safe to call from
+any thread, e.g. an async loop or a synthesis worker.
+
+Usage::
+
+    with StreamPlayer(44100, tee="out.wav") as player:
+        for chunk in chunks:
+            player.write(chunk)
+        player.finish()
+        player.wait()
+    console.print(playback_report(player, started, first_byte, synthesized))
+"""
+
+import threading
+import time
+import wave
+from collections import deque
+from pathlib import Path
+
+SAMPLE_WIDTH = 2  # pcm_s16le
+
+
+class StreamPlayer:
+    def __init__(self, sample_rate: int, prebuffer_ms: int = 100, tee: str | Path | None = None):
+        self.sample_rate = sample_rate
+        self._prebuffer_bytes = int(sample_rate * prebuffer_ms / 1000) * SAMPLE_WIDTH
+        self._chunks: deque[bytes] = deque()
+        self._head = 0  # bytes of _chunks[0] already played
+        self._buffered = 0
+        self._buffering = True
+        self._finished = False
+        self._silence = memoryview(b"")
+        self._lock = threading.Lock()
+        self._drained = threading.Event()
+        self._tee = None
+        if tee is not None:
+            self._tee = wave.open(str(tee), "wb")
+            self._tee.setnchannels(1)
+            self._tee.setsampwidth(SAMPLE_WIDTH)
+            self._tee.setframerate(sample_rate)
+        self._stream = None
+
+        self.first_audio_at: float | None = None  # perf_counter() when the first audio reaches the DAC
+        self.underruns = 0
+        self.received = 0  # bytes
+
+    def __enter__(self):
+        import sounddevice as sd
+
+        self._stream = sd.RawOutputStream(samplerate=self.sample_rate, channels=1, dtype="int16", callback=self._callback)
+        self._stream.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, pcm: bytes):
+        """Queue a chunk for playback (and the tee)."""
+        if not pcm:
+            return
+        if self._tee is not None:
+            self._tee.writeframes(pcm)
+        with self._lock:
+            self._chunks.append(bytes(pcm))
+            self._buffered += len(pcm)
+            self.received += len(pcm)
+
+    def finish(self):
+        """No more chunks are coming; play out what's buffered."""
+        with self._lock:
+            self._finished = True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until everything written has been handed to the device."""
+        return self._drained.wait(timeout)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop()  # lets queued device buffers play out
+            self._stream.close()
+            self._stream = None
+        if self._tee is not None:
+            self._tee.close()
+            self._tee = None
+
+    def _callback(self, outdata, frames, time_info, status):
+        """sounddevice callback; runs on the audio thread."""
+        out = memoryview(outdata).cast("B")
+        needed = len(out)
+        with self._lock:
+            if self._buffering and (self._buffered >= self._prebuffer_bytes or self._finished):
+                self._buffering = False
+            # Whole samples only: a half sample now would shift every later byte.
+            available = self._buffered - self._buffered % SAMPLE_WIDTH
+            filled = 0 if self._buffering else self._read_into(out, min(needed - needed % SAMPLE_WIDTH, available))
+            if not self._buffering and filled < needed:
+                if self._finished:
+                    self._drained.set()
+                else:
+                    self.underruns += 1
+                    self._buffering = True
+
+        if filled and self.first_audio_at is None:
+            # Account for the device's own buffering: this block is heard at outputBufferDacTime.
+            self.first_audio_at = time.perf_counter() + max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+        if filled < needed:
+            if len(self._silence) < needed:
+                self._silence = memoryview(bytes(needed))
+            out[filled:] = self._silence[: needed - filled]
+
+    def _read_into(self, out: memoryview, size: int) -> int:
+        filled = 0
+        while filled < size and self._chunks:
+            chunk = self._chunks[0]
+            take = min(len(chunk) - self._head, size - filled)
+            out[filled:filled + take] = memoryview(chunk)[self._head:self._head + take]
+            filled += take
+            self._head += take
+            if self._head == len(chunk):
+                self._chunks.popleft()
+                self._head = 0
+        self._buffered -= filled
+        return filled
+
+
+def playback_report(player: StreamPlayer, started: float, first_byte: float | None, synthesized: float) -> str:
+    """One dim line of timings (relative to ``started``, a perf_counter()) for the demos to print."""
+    first_audio = (player.first_audio_at - started) * 1000 if player.first_audio_at else float("nan")
+    return (
+        f"[dim]First byte {(first_byte or 0) * 1000:,.0f} ms · first audio {first_audio:,.0f} ms · "
+        f"synthesis done {synthesized * 1000:,.0f} ms · {player.received / SAMPLE_WIDTH / player.sample_rate:.1f} s audio · "
+        f"{player.underruns} underruns[/]"
+    )
@@ -0,0 +1,231 @@
+"""Benchmark the TTS providers: time to first byte and real-time factor.
+
+Every provider speaks the same corpus of sentences, ``--reps`` times, after
+``--warmup`` untimed requests (connection setup, model load, caches). Cloud
+providers' pooled connections (``common.clients``) are opened and
+health-checked before that. For each utterance it records:
+
+    - TTFB – request start to the first audio chunk, what a caller hears as
+      the agent's reaction time,
+    - total synthesis time,
+    - audio duration, from the PCM received,
+    - real-time factor (RTF) – synthesis time per audio second; below 1.0 the
+      provider outpaces playback.
+
+The summary table gives p50/p95 per provider; ``--csv`` and ``--json`` write
+every utterance (the JSON also carries the run configuration and summary).
+
+Without a network, ``--mock`` starts the mock Cartesia / ElevenLabs server
+(``mock-servers/mock_tts.py``) in-process, shaped by ``--latency-ms``,
+``--jitter-ms``, ``--chunk-ms`` and ``--speed``, and points both providers at
+it – so the numbers are the client's own overhead on top of a known server.
+Kokoro always runs locally.
+
+Usage::
+
+    uv run 02-tts-playground/bench-tts.py
+    uv run 02-tts-playground/bench-tts.py --providers cartesia kokoro --reps 10 --csv tts.csv
+    uv run 02-tts-playground/bench-tts.py --mock --latency-ms 200 --jitter-ms 40 --json tts.json
+    uv run 02-tts-playground/bench-tts.py --corpus sentences.txt    # one sentence per line
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mock-servers"))  # --mock
+
+import shaping
+from common import clients
+from common.benchstats import percentile
+from tts_providers import PROVIDERS, SAMPLE_WIDTH, TTSProvider, load_provider
+
+load_dotenv()
+console = Console()
+
+SENTENCES = [
+    "Hi!",
+    "Thanks for calling, how can I help you today?",
+    "Your order shipped yesterday and should arrive on Thursday.",
+    "I can move your appointment to Tuesday at ten or Wednesday at two, which works better for you?",
+    "Before I transfer you, let me summarize: you'd like a refund for the blue jacket, "
+    "and you'll send it back with the prepaid label we emailed this morning.",
+]
+
+
+async def measure(provider: TTSProvider, text: str) -> dict:
+    started = time.perf_counter()
+    first_byte = None
+    received = 0
+    async for chunk in provider.stream(text):
+        if chunk and first_byte is None:
+            first_byte = time.perf_counter() - started
+        received += len(chunk)
+    total = time.perf_counter() - started
+    audio_seconds = received / (provider.sample_rate * SAMPLE_WIDTH)
+    return {
+        "ttfbMs": round(first_byte * 1000, 1) if first_byte is not None else None,
+        "totalMs": round(total * 1000, 1),
+        "audioSeconds": round(audio_seconds, 3),
+        "rtf": round(total / audio_seconds, 4) if audio_seconds else None,
+    }
+
+
+async def run_provider(provider: TTSProvider, sentences: list[str], reps: int, warmup: int) -> list[dict]:
+    for _ in range(warmup):
+        await measure(provider, sentences[0])
+
+    rows = []
+    for rep in range(reps):
+        for index, text in enumerate(sentences):
+            row = {"provider": provider.name, "model": provider.model, "rep": rep, "sentence": index, "chars": len(text)}
+            try:
+                row.update(await measure(provider, text))
+            except Exception as e:  # one failed request shouldn't end the run
+                row["error"] = str(e) or type(e).__name__
+            rows.append(row)
+        console.print(f"[dim]  {provider.name}: rep {rep + 1}/{reps}[/]")
+    return rows
+
+
+def summarize(rows: list[dict]) -> dict:
+    ok = [row for row in rows if "error" not in row and row["ttfbMs"] is not None]
+    summary = {"utterances": len(rows), "errors": len(rows) - len(ok)}
+    for key in ("ttfbMs", "totalMs", "rtf"):
+        values = sorted(row[key] for row in ok if row[key] is not None)
+        if values:
+            summary[key] = {"p50": percentile(values, 50), "p95": percentile(values, 95), "max": values[-1]}
+    summary["audioSeconds"] = round(sum(row["audioSeconds"] for row in ok), 3)
+    return summary
+
+
+def start_mock(shape: shaping.Shaping) -> str:
+    """Serve the mock TTS endpoints on a free port; returns the base URL."""
+    from mock_tts import MockTTSServer
+
+    server = MockTTSServer(("127.0.0.1", 0), shape, quiet=True)
+    threading.Thread(target=server.serve_forever, name="mock-tts", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def write_csv(path: Path, rows: list[dict]):
+    columns = ["provider", "model", "rep", "sentence", "chars", "ttfbMs", "totalMs", "audioSeconds", "rtf", "error"]
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS providers: TTFB, synthesis time, RTF")
+    parser.add_argument("--providers", nargs="+", choices=list(PROVIDERS), help="Providers to run (default: all; with --mock: the cloud ones)")
+    parser.add_argument("--corpus", type=Path, help="Text file, one sentence per line (default: built-in sentences)")
+    parser.add_argument("--reps", type=int, default=5, help="Timed passes over the corpus (default: 5)")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per provider first (default: 2)")
+    parser.add_argument("--csv", type=Path, help="Write every utterance to this CSV file")
+    parser.add_argument("--json", type=Path, help="Write utterances, configuration and summary to this JSON file")
+    parser.add_argument("--mock", action="store_true", help="Run the cloud providers against an in-process mock server")
+    shaping.add_arguments(parser)
+    args = parser.parse_args()
+
+    sentences = SENTENCES
+    if args.corpus:
+        sentences = [line.strip() for line in args.corpus.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    names = args.providers or [name for name, p in PROVIDERS.items() if p.api_key_env or not args.mock]
+    if args.mock:
+        url = start_mock(shaping.from_args(args))
+        for name in names:
+            provider = PROVIDERS[name]
+            if provider.base_url_env:
+                os.environ[provider.base_url_env] = url
+                os.environ.setdefault(provider.api_key_env, "mock")
+        console.print(f"[bold green]Mock TTS server on {url}[/]")
+
+    console.print(f"[bold green]⏱  {len(sentences)} sentences × {args.reps} reps, {args.warmup} warm-up[/]")
+    cloud = [name for name in names if PROVIDERS[name].api_key_env and os.getenv(PROVIDERS[name].api_key_env)]
+    for check in await clients.prewarm(cloud):
+        status = f"HTTP {check.status} ({check.http_version}), {check.latency_ms:,.0f} ms" if check.status else check.error
+        console.print(f"[dim]  {check.provider} connection: {status}[/]")
+    results: dict[str, dict] = {}
+    rows: list[dict] = []
+    for name in names:
+        env = PROVIDERS[name].api_key_env
+        if env and not os.getenv(env):
+            console.print(f"[yellow]Skipping {name}: set {env} in .env (or use --mock)[/]")
+            continue
+        console.print(f"[dim]Running {name} …[/]")
+        try:
+            provider = load_provider(name)
+        except ImportError as e:
+            console.print(f"[yellow]Skipping {name}: {e}[/]")
+            continue
+        try:
+            provider_rows = await run_provider(provider, sentences, args.reps, args.warmup)
+        except Exception as e:  # warm-up failed: wrong key, unreachable server, …
+            console.print(f"[red]{name} failed:[/] {e}")
+            continue
+        finally:
+            await provider.close()
+        rows += provider_rows
+        results[name] = summarize(provider_rows)
+    await clients.aclose()
+
+    if not results:
+        return
+
+    table = Table(title="TTS latency" + (" (mock server)" if args.mock else ""))
+    table.add_column("Provider")
+    table.add_column("TTFB p50", justify="right")
+    table.add_column("TTFB p95", justify="right")
+    table.add_column("Total p50", justify="right")
+    table.add_column("Total p95", justify="right")
+    table.add_column("RTF p50", justify="right")
+    table.add_column("RTF p95", justify="right")
+    table.add_column("Audio", justify="right")
+    table.add_column("Errors", justify="right")
+    for name, summary in results.items():
+        if "ttfbMs" not in summary:
+            table.add_row(name, *["–"] * 7, f"[red]{summary['errors']}[/]")
+            continue
+        table.add_row(
+            name,
+            f"{summary['ttfbMs']['p50']:,.0f} ms",
+            f"{summary['ttfbMs']['p95']:,.0f} ms",
+            f"{summary['totalMs']['p50']:,.0f} ms",
+            f"{summary['totalMs']['p95']:,.0f} ms",
+            f"{summary['rtf']['p50']:.3f}",
+            f"{summary['rtf']['p95']:.3f}",
+            f"{summary['audioSeconds']:.1f} s",
+            f"[red]{summary['errors']}[/]" if summary["errors"] else "0",
+        )
+    console.print(table)
+
+    if args.csv:
+        write_csv(args.csv, rows)
+        console.print(f"[dim]Wrote {len(rows)} rows to {args.csv}[/]")
+    if args.json:
+        config = {
+            "reps": args.reps,
+            "warmup": args.warmup,
+            "sentences": sentences,
+            "mock": asdict(shaping.from_args(args)) if args.mock else None,
+        }
+        args.json.write_text(json.dumps({"config": config, "summary": results, "utterances": rows}, indent=2), encoding="utf-8")
+        console.print(f"[dim]Wrote {args.json}[/]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+"""A warm Kokoro synthesis service for concurrent requests.
+
+Building a ``KPipeline`` loads the 82M-parameter model and the G2P stack;
+the first call also loads the voice pack and pays for first-inference
+allocations. That is seconds per run if done on demand. :class:`KokoroService`
+pays it once, up front:
+
+    - the model is loaded once and shared. Each worker thread wraps it in its
+      own ``KPipeline``, with the voices preloaded and one warm-up sentence
+      already spoken. Torch releases the GIL during inference, so threads run
+      in parallel.
+    - there is one worker per CPU core by default. Torch's intra-op threads are
+      split between the workers, so a full pool doesn't oversubscribe the CPU.
+    - text is split at sentence boundaries. Each sentence goes to the sink
+      as soon as it is generated, not after the whole request.
+    - each worker converts audio into its own preallocated int16 buffer, which
+      grows only when a longer sentence arrives. The sink gets a view of
+      that buffer. Nothing is concatenated and nothing is allocated per
+      sentence. The view is only valid during the call, so the sink must copy
+      it (``StreamPlayer.write`` does) or write it out (``wave.writeframes``).
+
+Each request returns a :class:`SynthesisResult` with the latency of every
+sentence.
+
+Usage::
+
+    with KokoroService(workers=4) as service:
+        result = service.submit(text, "af_heart", sink=lambda pcm, sentence: wav.writeframes(pcm)).result()
+
+        async for pcm in service.stream(text):      # bytes per sentence
+            ...
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable
+
+import numpy as np
+import torch
+from kokoro import KModel, KPipeline
+
+REPO_ID = "hexgrad/Kokoro-82M"
+SAMPLE_RATE = 24000  # pcm_s16le, mono
+DEFAULT_VOICE = "af_heart"
+SENTENCE_SPLIT = r"(?<=[.!?])\s+"
+WARMUP_TEXT = "Hello there."
+
+
+@dataclass
+class SentenceTiming:
+    index: int
+    text: str
+    latency_ms: float  # request submitted → sentence ready for the sink
+    synth_ms: float  # generating this sentence alone
+    audio_seconds: float
+
+
+@dataclass
+class SynthesisResult:
+    queued_ms: float  # waiting for a free worker
+    total_ms: float
+    sentences: list[SentenceTiming] = field(default_factory=list)
+
+    @property
+    def audio_seconds(self) -> float:
+        return sum(s.audio_seconds for s in self.sentences)
+
+    @property
+    def first_audio_ms(self) -> float | None:
+        return self.sentences[0].latency_ms if self.sentences else None
+
+    @property
+    def rtf(self) -> float | None:
+        """Synthesis seconds per audio second, queueing excluded."""
+        audio = self.audio_seconds
+        return (self.total_ms - self.queued_ms) / 1000 / audio if audio else None
+
+
+Sink = Callable[[memoryview, SentenceTiming], None]
+
+
+@dataclass
+class _Job:
+    text: str
+    voice: str
+    sink: Sink
+    future: Future
+    submitted: float = field(default_factory=time.perf_counter)
+
+
+class KokoroService:
+    def __init__(
+        self,
+        workers: int | None = None,
+        voices: tuple[str, ...] | list[str] = (DEFAULT_VOICE,),
+        lang_code: str = "a",
+        device: str | None = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.voices = list(voices)
+        self.lang_code = lang_code
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self._jobs: queue.SimpleQueue[_Job | None] = queue.SimpleQueue()
+        self._threads: list[threading.Thread] = []
+        self.load_seconds = 0.0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> "KokoroService":
+        """Load the model and bring every worker up warm; blocks until they're ready."""
+        started = time.perf_counter()
+        if self.device == "cpu":
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // self.workers))
+        model = KModel(repo_id=REPO_ID).to(self.device).eval()
+
+        ready = threading.Barrier(self.workers + 1)
+        errors: list[BaseException] = []
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, args=(model, ready, errors), name=f"kokoro-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        ready.wait()
+        if errors:
+            self.close()
+            raise errors[0]
+        self.load_seconds = time.perf_counter() - started
+        return self
+
+    def submit(self, text: str, voice: str | None = None, sink: Sink | None = None) -> Future:
+        """Queue ``text`` for synthesis; the future resolves to a :class:`SynthesisResult`.
+
+        ``sink(pcm, sentence)`` runs on the worker thread for each sentence, in
+        order, with ``pcm`` a pcm_s16le view that is only valid during the call.
+        """
+        if not self._threads:
+            raise RuntimeError("KokoroService is not running; call start() first")
+        future: Future = Future()
+        self._jobs.put(_Job(text, voice or self.voices[0], sink or _discard, future))
+        return future
+
+    async def stream(self, text: str, voice: str | None = None) -> AsyncIterator[bytes]:
+        """pcm_s16le bytes per sentence, for an asyncio consumer."""
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        future = self.submit(text, voice, lambda pcm, _sentence: loop.call_soon_threadsafe(chunks.put_nowait, bytes(pcm)))
+        # Runs after the last sink call, so the sentinel queues behind every chunk.
+        future.add_done_callback(lambda _f: loop.call_soon_threadsafe(chunks.put_nowait, None))
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        future.result()  # re-raise a synthesis error
+
+    def close(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self, model: KModel, ready: threading.Barrier, errors: list[BaseException]):
+        try:
+            worker = _Worker(KPipeline(lang_code=self.lang_code, repo_id=REPO_ID, model=model), self.voices)
+        except BaseException as e:  # reported by start()
+            errors.append(e)
+            ready.wait()
+            return
+        ready.wait()
+
+        while (job := self._jobs.get()) is not None:
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            try:
+                job.future.set_result(worker.run(job))
+            except BaseException as e:
+                job.future.set_exception(e)
+
+
+class _Worker:
+    """One pipeline plus its conversion buffers; used by a single thread only."""
+
+    def __init__(self, pipeline: KPipeline, voices: list[str]):
+        self.pipeline = pipeline
+        for voice in voices:
+            pipeline.load_voice(voice)
+        self._scratch = np.empty(SAMPLE_RATE * 10, dtype=np.float32)
+        self._pcm = np.empty(SAMPLE_RATE * 10, dtype=np.int16)
+        for _result in pipeline(WARMUP_TEXT, voice=voices[0]):
+            pass
+
+    def run(self, job: _Job) -> SynthesisResult:
+        started = time.perf_counter()
+        result = SynthesisResult(queued_ms=(started - job.submitted) * 1000, total_ms=0.0)
+        previous = started
+        for graphemes, _phonemes, audio in self.pipeline(job.text, voice=job.voice, split_pattern=SENTENCE_SPLIT):
+            if audio is None:
+                continue
+            pcm = self._convert(audio)
+            now = time.perf_counter()
+            sentence = SentenceTiming(
+                index=len(result.sentences),
+                text=graphemes,
+                latency_ms=(now - job.submitted) * 1000,
+                synth_ms=(now - previous) * 1000,
+                audio_seconds=len(pcm) / 2 / SAMPLE_RATE,
+            )
+            job.sink(pcm, sentence)
+            result.sentences.append(sentence)
+            previous = time.perf_counter()
+        result.total_ms = (time.perf_counter() - job.submitted) * 1000
+        return result
+
+    def _convert(self, audio) -> memoryview:
+        """float32 samples in [-1, 1] into the reusable int16 buffer."""
+        samples = np.asarray(audio.cpu() if isinstance(audio, torch.Tensor) else audio, dtype=np.float32)
+        n = len(samples)
+        if n > len(self._pcm):
+            size = max(n, 2 * len(self._pcm))
+            self._scratch = np.empty(size, dtype=np.float32)
+            self._pcm = np.empty(size, dtype=np.int16)
+        scratch, pcm = self._scratch[:n], self._pcm[:n]
+        np.clip(samples, -1.0, 1.0, out=scratch)
+        np.multiply(scratch, 32767, out=scratch)
+        np.copyto(pcm, scratch, casting="unsafe")
+        return memoryview(pcm).cast("B")
+
+
+def _discard(pcm: memoryview, sentence: SentenceTiming):
+    pass
@@ -0,0 +1,132 @@
+"""The playground's TTS providers behind one streaming interface.
+
+Each provider turns text into a stream of raw 16-bit mono PCM chunks at its
+``sample_rate`` – the format a player or a benchmark can use directly,
+without decoding:
+
+    - ``cartesia`` – Sonic 3 over HTTP (``tts.bytes``, raw ``pcm_s16le``),
+    - ``elevenlabs`` – Flash v2.5 over HTTP (``text_to_speech.stream``,
+      ``pcm_24000``),
+    - ``kokoro`` – Kokoro-82M on this machine, through a one-worker
+      ``kokoro_service.KokoroService``: loaded and warmed up once, audio per
+      sentence, synthesis off the event loop.
+
+Cloud providers read their API key from the environment, and their base URL
+from ``CARTESIA_BASE_URL`` / ``ELEVENLABS_BASE_URL`` when set – e.g. to run
+against ``mock-servers/serve.py``. Their SDK clients come from
+``common.clients``, so every provider instance shares one pooled connection;
+``clients.aclose()`` closes them.
+
+Usage::
+
+    provider = load_provider("cartesia")
+    async for pcm in provider.stream("Hello!"):
+        ...
+    await provider.close()
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from common import clients
+
+SAMPLE_WIDTH = 2  # bytes; every provider streams pcm_s16le
+
+CARTESIA_VOICE = "a0e99841-438c-4a64-b679-ae501e7d6091"  # Barbershop Man
+ELEVENLABS_VOICE = "JBFqnCBsd6RMkjVDRZzb"  # George
+KOKORO_VOICE = "af_heart"
+
+
+class TTSProvider(ABC):
+    name = ""
+    model = ""
+    api_key_env = ""  # empty for local providers
+    base_url_env = ""
+    sample_rate = 24_000
+
+    def __init__(self, voice: str | None = None):
+        self.voice = voice
+
+    @abstractmethod
+    def stream(self, text: str) -> AsyncIterator[bytes]:
+        """Raw pcm_s16le chunks of ``text`` spoken, as they arrive."""
+
+    async def close(self):
+        pass
+
+
+class CartesiaProvider(TTSProvider):
+    name = "cartesia"
+    model = "sonic-3"
+    api_key_env = "CARTESIA_API_KEY"
+    base_url_env = "CARTESIA_BASE_URL"
+
+    def __init__(self, voice: str | None = None):
+        super().__init__(voice or CARTESIA_VOICE)
+        _api_key(self.api_key_env)
+        self._client = clients.cartesia()
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        chunks = self._client.tts.bytes(
+            model_id=self.model,
+            transcript=text,
+            voice={"mode": "id", "id": self.voice},
+            language="en",
+            output_format={"container": "raw", "sample_rate": self.sample_rate, "encoding": "pcm_s16le"},
+        )
+        async for chunk in chunks:
+            yield chunk
+
+
+class ElevenLabsProvider(TTSProvider):
+    name = "elevenlabs"
+    model = "eleven_flash_v2_5"
+    api_key_env = "ELEVENLABS_API_KEY"
+    base_url_env = "ELEVENLABS_BASE_URL"
+
+    def __init__(self, voice: str | None = None):
+        super().__init__(voice or ELEVENLABS_VOICE)
+        _api_key(self.api_key_env)
+        self._client = clients.elevenlabs()
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        chunks = self._client.text_to_speech.stream(
+            voice_id=self.voice,
+            text=text,
+            model_id=self.model,
+            output_format=f"pcm_{self.sample_rate}",
+        )
+        async for chunk in chunks:
+            yield chunk
+
+
+class KokoroProvider(TTSProvider):
+    name = "kokoro"
+    model = "Kokoro-82M"
+
+    def __init__(self, voice: str | None = None):
+        from kokoro_service import KokoroService
+
+        super().__init__(voice or KOKORO_VOICE)
+        self._service = KokoroService(workers=1, voices=[self.voice]).start()
+
+    def stream(self, text: str) -> AsyncIterator[bytes]:
+        return self._service.stream(text, self.voice)
+
+    async def close(self):
+        self._service.close()
+
+
+PROVIDERS: dict[str, type[TTSProvider]] = {p.name: p for p in (CartesiaProvider, ElevenLabsProvider, KokoroProvider)}
+
+
+def load_provider(name: str, voice: str | None = None) -> TTSProvider:
+    return PROVIDERS[name](voice)
+
+
+def _api_key(env: str) -> str:
+    key = os.getenv(env)
+    if not key:
+        raise SystemExit(f"Set {env} in .env")
+    return key
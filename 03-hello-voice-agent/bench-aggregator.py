@@ -0,0 +1,249 @@
+"""Benchmark LLM → TTS text aggregation policies: time to first audio and stalls.
+
+Runs a real Pipecat pipeline, ``fake LLM → [aggregator] → fake TTS → probe``,
+so the frames, aggregation and TTS queueing are Pipecat's own. Only the
+services are simulated:
+
+    - the LLM waits ``--ttft-ms`` and then streams each reply word by word,
+      one token every ``--token-ms``,
+    - the TTS waits ``--tts-ttfb-ms`` per request and then produces
+      ``--ms-per-char`` of audio per character, at ``--rtf`` of real time.
+
+Policies:
+
+    - tokens – every LLM token is its own TTS request (``aggregate_sentences=False``),
+    - sentence – Pipecat's default: whole sentences,
+    - clause ≥N – ``common.pipecat_first_clause``: the first clause once it
+      has N characters (``--min-first-chars``), then whole sentences.
+
+For every reply the probe records first audio (time from the LLM request to
+the first audio chunk) and stalls. A stall is time the simulated speaker sits
+silent mid-reply, waiting for the next chunk. A small first chunk plays out
+quickly, so if the next one isn't synthesized yet the caller hears a gap.
+
+Usage::
+
+    uv run 03-hello-voice-agent/bench-aggregator.py
+    uv run 03-hello-voice-agent/bench-aggregator.py --min-first-chars 10 20 40 --max-first-chars 60
+    uv run 03-hello-voice-agent/bench-aggregator.py --token-ms 40 --tts-ttfb-ms 250 --reps 5
+"""
+
+import argparse
+import asyncio
+import math
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+from pipecat.frames.frames import (
+    DataFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.tts_service import TTSService
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.benchstats import percentile
+from common.pipecat_first_clause import FirstClauseProcessor
+
+console = Console()
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 40  # audio per TTSAudioRawFrame
+
+REPLIES = [
+    "Sure, I can move your appointment to Tuesday at ten, or Wednesday at two. Which works better for you?",
+    "Your order shipped yesterday and should arrive on Thursday. I'll text you the tracking link.",
+    "Okay! Let me check that for you.",
+    "Before I transfer you, let me summarize: you'd like a refund for the blue jacket, and you'll send it "
+    "back with the prepaid label we emailed this morning.",
+    "Unfortunately that plan isn't available in your area yet, but the standard plan includes the same "
+    "minutes and costs five dollars less per month.",
+]
+
+
+@dataclass
+class Reply(DataFrame):
+    """Ask the fake LLM for ``text``."""
+
+    text: str = ""
+
+
+@dataclass
+class Timing:
+    started: float = 0.0
+    first_audio_ms: float | None = None
+    stall_ms: float = 0.0
+    requests: list[str] = field(default_factory=list)
+    playing_until: float | None = None  # simulated playback position
+
+
+class FakeLLM(FrameProcessor):
+    """Streams each :class:`Reply` as LLM tokens, like a streaming chat completion."""
+
+    def __init__(self, timing: list[Timing], ttft_s: float, token_s: float, **kwargs):
+        super().__init__(**kwargs)
+        self._timing = timing
+        self._ttft_s = ttft_s
+        self._token_s = token_s
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if not isinstance(frame, Reply):
+            await self.push_frame(frame, direction)
+            return
+        self._timing.append(Timing(started=time.perf_counter()))
+        await self.push_frame(LLMFullResponseStartFrame())
+        await asyncio.sleep(self._ttft_s)
+        for i, token in enumerate(re.findall(r"\s*\S+", frame.text)):
+            if i:
+                await asyncio.sleep(self._token_s)
+            await self.push_frame(LLMTextFrame(token))
+        await self.push_frame(LLMFullResponseEndFrame())
+
+
+class FakeTTS(TTSService):
+    """A fixed time to first byte per request, then audio proportional to the text."""
+
+    def __init__(self, timing: list[Timing], ttfb_s: float, ms_per_char: float, rtf: float, **kwargs):
+        super().__init__(sample_rate=SAMPLE_RATE, **kwargs)
+        self._timing = timing
+        self._ttfb_s = ttfb_s
+        self._ms_per_char = ms_per_char
+        self._rtf = rtf
+
+    def can_generate_metrics(self) -> bool:
+        return False
+
+    async def run_tts(self, text: str, context_id: str):
+        self._timing[-1].requests.append(text.strip())
+        yield TTSStartedFrame(context_id=context_id)
+        await asyncio.sleep(self._ttfb_s)
+        chunks = max(1, math.ceil(len(text.strip()) * self._ms_per_char / CHUNK_MS))
+        silence = bytes(SAMPLE_RATE * CHUNK_MS // 1000 * 2)
+        for i in range(chunks):
+            if i:
+                await asyncio.sleep(CHUNK_MS / 1000 * self._rtf)
+            yield TTSAudioRawFrame(audio=silence, sample_rate=SAMPLE_RATE, num_channels=1, context_id=context_id)
+        yield TTSStoppedFrame(context_id=context_id)
+
+
+class Probe(FrameProcessor):
+    """Simulates playback of the TTS audio and signals the end of each reply."""
+
+    def __init__(self, timing: list[Timing], **kwargs):
+        super().__init__(**kwargs)
+        self._timing = timing
+        self.done = asyncio.Event()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, TTSAudioRawFrame):
+            now = time.perf_counter()
+            timing = self._timing[-1]
+            if timing.playing_until is None:
+                timing.first_audio_ms = (now - timing.started) * 1000
+                timing.playing_until = now
+            elif now > timing.playing_until:
+                timing.stall_ms += (now - timing.playing_until) * 1000
+                timing.playing_until = now
+            timing.playing_until += CHUNK_MS / 1000
+        elif isinstance(frame, LLMFullResponseEndFrame):
+            self.done.set()  # the TTS passes it on once the reply's last request is synthesized
+
+        await self.push_frame(frame, direction)
+
+
+async def run_policy(name: str, replies: list[str], args: argparse.Namespace) -> list[Timing]:
+    timing: list[Timing] = []
+    llm = FakeLLM(timing, args.ttft_ms / 1000, args.token_ms / 1000)
+    tts = FakeTTS(
+        timing, args.tts_ttfb_ms / 1000, args.ms_per_char, args.rtf, aggregate_sentences=name != "tokens"
+    )
+    probe = Probe(timing)
+    processors = [llm, tts, probe]
+    if name.startswith("clause"):
+        min_first_chars = int(name.removeprefix("clause ≥"))
+        processors.insert(
+            1, FirstClauseProcessor(min_first_chars, args.max_first_chars, args.min_sentence_chars)
+        )
+
+    task = PipelineTask(Pipeline(processors), enable_rtvi=False, cancel_on_idle_timeout=False)
+
+    async def drive():
+        for _ in range(args.reps):
+            for text in replies:
+                probe.done.clear()
+                await task.queue_frame(Reply(text=text))
+                await probe.done.wait()
+        await task.stop_when_done()
+
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), drive())
+    return timing
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM → TTS text aggregation: first audio and stalls")
+    parser.add_argument("--min-first-chars", type=int, nargs="+", default=[10, 20, 40], help="First-clause thresholds to compare (default: 10 20 40)")
+    parser.add_argument("--max-first-chars", type=int, help="Cut the first chunk at a space past this length (default: off)")
+    parser.add_argument("--min-sentence-chars", type=int, default=0, help="Hold shorter sentences for the next one (default: 0)")
+    parser.add_argument("--ttft-ms", type=float, default=300, help="Fake LLM time to first token (default: 300)")
+    parser.add_argument("--token-ms", type=float, default=25, help="Fake LLM time per token (default: 25)")
+    parser.add_argument("--tts-ttfb-ms", type=float, default=150, help="Fake TTS time to first byte per request (default: 150)")
+    parser.add_argument("--ms-per-char", type=float, default=65, help="Audio per character of text (default: 65, about 15 chars/s)")
+    parser.add_argument("--rtf", type=float, default=0.2, help="Fake TTS synthesis time per audio second after the first chunk (default: 0.2)")
+    parser.add_argument("--reps", type=int, default=3, help="Passes over the replies (default: 3)")
+    parser.add_argument("--corpus", type=Path, help="Text file, one reply per line (default: built-in replies)")
+    args = parser.parse_args()
+
+    logger.remove()  # Pipecat's debug logging would drown the results
+    replies = REPLIES
+    if args.corpus:
+        replies = [line.strip() for line in args.corpus.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    policies = ["tokens", "sentence", *(f"clause ≥{n}" for n in args.min_first_chars)]
+    console.print(
+        f"[bold green]⏱  {len(replies)} replies × {args.reps} reps – LLM {args.ttft_ms:.0f} ms + {args.token_ms:.0f} ms/token, "
+        f"TTS {args.tts_ttfb_ms:.0f} ms TTFB[/]"
+    )
+
+    table = Table(title="LLM → TTS aggregation")
+    table.add_column("Policy")
+    table.add_column("First audio p50", justify="right")
+    table.add_column("First audio p95", justify="right")
+    table.add_column("First chunk", justify="right")
+    table.add_column("TTS requests / reply", justify="right")
+    table.add_column("Stalls / reply", justify="right")
+    for name in policies:
+        console.print(f"[dim]Running {name} …[/]")
+        timing = await run_policy(name, replies, args)
+        first = sorted(t.first_audio_ms for t in timing if t.first_audio_ms is not None)
+        table.add_row(
+            name,
+            f"{percentile(first, 50):,.0f} ms",
+            f"{percentile(first, 95):,.0f} ms",
+            f"{sum(len(t.requests[0]) for t in timing) / len(timing):.0f} chars",
+            f"{sum(len(t.requests) for t in timing) / len(timing):.1f}",
+            f"{sum(t.stall_ms for t in timing) / len(timing):,.0f} ms",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
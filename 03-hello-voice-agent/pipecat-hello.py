@@ -5,16 +5,25 @@ Connect via browser at http://localhost:7860/client after starting.
 
 Requires OPENAI_API_KEY, DEEPGRAM_API_KEY, and CARTESIA_API_KEY in .env.
 
+Service TTFB, processing time and token usage are exported as Prometheus
+metrics at http://localhost:9464/metrics (``METRICS_PORT``; 0 disables).
+
+LLM output reaches the TTS through ``common.pipecat_first_clause``: the first
+clause of each reply is spoken as soon as it is written, the rest sentence by
+sentence. Voice activity detection uses the process-wide Silero model in
+``common.pipecat_vad``.
+
 Run::
 
     uv run 03-hello-voice-agent/pipecat-hello.py
 """
 
 import os
+import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
 from loguru import logger
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.frames.frames import LLMRunFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
@@ -32,6 +41,11 @@ from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.base_transport import BaseTransport, TransportParams
 from pipecat.transports.daily.transport import DailyParams
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.pipecat_first_clause import FirstClauseProcessor
+from common.pipecat_metrics import MetricsObserver, serve_metrics, track_session
+from common.pipecat_vad import SharedSileroVADAnalyzer
+
 load_dotenv(override=True)
 
 
@@ -61,7 +75,7 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
     user_aggregator, assistant_aggregator = LLMContextAggregatorPair(
         context,
         user_params=LLMUserAggregatorParams(
-            vad_analyzer=SileroVADAnalyzer(),
+            vad_analyzer=SharedSileroVADAnalyzer(),  # one Silero model for every session
         ),
     )
 
@@ -71,6 +85,7 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             stt,
             user_aggregator,
             llm,
+            FirstClauseProcessor(),  # first clause early, then whole sentences
             tts,
             transport.output(),
             assistant_aggregator,
@@ -83,6 +98,7 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
             enable_metrics=True,
             enable_usage_metrics=True,
         ),
+        observers=[MetricsObserver()],  # TTFB / processing / usage → /metrics
     )
 
     @transport.event_handler("on_client_connected")
@@ -97,11 +113,13 @@ async def run_bot(transport: BaseTransport, runner_args: RunnerArguments):
         await task.cancel()
 
     runner = PipelineRunner(handle_sigint=runner_args.handle_sigint)
-    await runner.run(task)
+    async with track_session():
+        await runner.run(task)
 
 
 async def bot(runner_args: RunnerArguments):
     """Main bot entry point compatible with Pipecat Cloud and local dev."""
+    serve_metrics()
 
     transport_params = {
         "daily": lambda: DailyParams(
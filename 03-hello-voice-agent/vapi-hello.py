@@ -12,16 +12,19 @@ Usage::
 import http.server
 import os
 import string
+import sys
 import threading
 import webbrowser
 from pathlib import Path
 
 from dotenv import load_dotenv
-from rich.console import Console
-from vapi import Vapi
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common import clients
+from common.eventlog import get_logger
 
 load_dotenv()
-console = Console()
+log = get_logger("vapi-hello")
 
 PORT = 8080
 TEMPLATE_PATH = Path(__file__).parent / "vapi-hello.html"
@@ -32,16 +35,15 @@ def main():
     public_key = os.getenv("VAPI_PUBLIC_KEY")
 
     if not api_key:
-        console.print("[red]Set VAPI_API_KEY in .env (private key from dashboard)[/]")
+        log.error("config", "[red]Set VAPI_API_KEY in .env (private key from dashboard)[/]", missing="VAPI_API_KEY")
         return
     if not public_key:
-        console.print("[red]Set VAPI_PUBLIC_KEY in .env (public key from dashboard)[/]")
+        log.error("config", "[red]Set VAPI_PUBLIC_KEY in .env (public key from dashboard)[/]", missing="VAPI_PUBLIC_KEY")
         return
 
-    client = Vapi(token=api_key)
+    client = clients.vapi()
 
-    console.print("[bold green]🤖 VAPI Hello Voice Agent[/]")
-    console.print("Creating assistant …")
+    log.info("start", "[bold green]🤖 VAPI Hello Voice Agent[/]\nCreating assistant …")
 
     try:
         assistant = client.assistants.create(
@@ -70,10 +72,10 @@ def main():
             },
         )
     except Exception as e:
-        console.print(f"[red]Failed to create assistant:[/] {e}")
+        log.error("assistant-create-failed", "[red]Failed to create assistant:[/] {error}", error=str(e))
         return
 
-    console.print(f"[bold cyan]Assistant:[/] {assistant.name} ({assistant.id})")
+    log.info("assistant-created", "[bold cyan]Assistant:[/] {name} ({assistant_id})", name=assistant.name, assistant_id=assistant.id)
 
     # Build the HTML page from the template file
     template = string.Template(TEMPLATE_PATH.read_text())
@@ -94,8 +96,7 @@ def main():
             pass  # suppress request logs
 
     server = http.server.HTTPServer(("", PORT), Handler)
-    console.print(f"[bold green]🌐 Open http://localhost:{PORT} to talk to your agent[/]")
-    console.print("[dim]Press Ctrl+C to stop[/]")
+    log.info("server-started", "[bold green]🌐 Open http://localhost:{port} to talk to your agent[/]\n[dim]Press Ctrl+C to stop[/]", port=PORT)
 
     # Open browser automatically
     threading.Timer(0.5, lambda: webbrowser.open(f"http://localhost:{PORT}")).start()
@@ -103,7 +104,7 @@ def main():
     try:
         server.serve_forever()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Shutting down …[/]")
+        log.info("server-stopped", "\n[yellow]Shutting down …[/]")
         server.shutdown()
 
 
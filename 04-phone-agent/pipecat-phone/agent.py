@@ -5,25 +5,56 @@ PSTN dial-in capabilities. Deploy to Pipecat Cloud or run locally.
 
 Required env vars: OPENAI_API_KEY, DEEPGRAM_API_KEY, CARTESIA_API_KEY.
 
+Per-service TTFB, processing time, token usage and active calls are exported
+as Prometheus metrics on ``METRICS_PORT`` (default 9464, 0 disables).
+
+The greeting is a fixed phrase and is spoken through ``common.tts_cache``.
+After the first call it plays from the cache, with no LLM or Cartesia
+request. The disk tier (``TTS_CACHE_DIR``) is shared by every agent process on
+the host.
+
+Agents come from ``common.pipecat_pool``. ``AGENT_POOL_SIZE`` (default 2)
+agents are kept built, so a call doesn't wait for them. The shared VAD model
+(``common.pipecat_vad``) is already loaded and each agent's LLM connection is
+open. The pool fills on the first call and refills in the background after
+every call. Pool size, hits and misses, and
+ring-to-first-audio (split by warm/cold agent) are exported with the other
+metrics.
+
+LLM replies reach the TTS through ``common.pipecat_first_clause``, so the
+caller hears the first clause while the LLM is still writing the sentence.
+
+Deepgram and Cartesia are asked for the phone line's 8 kHz
+(``common.pipecat_telephony``), so no audio is resampled in Python.
+``LineRateGuard`` converts and counts any output audio that isn't 8 kHz.
+
 Run locally::
 
     uv run agent.py
 
+To answer calls on every CPU core, run ``supervisor.py`` instead.
+
 See https://docs.pipecat.ai/examples for the full phone-chatbot examples.
 """
 
+import asyncio
 import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
 
 from dotenv import load_dotenv
 from loguru import logger
-from pipecat.audio.vad.silero import SileroVADAnalyzer
-from pipecat.frames.frames import LLMRunFrame
+from pipecat.frames.frames import TTSSpeakFrame
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.llm_context import LLMContext
 from pipecat.processors.aggregators.llm_response_universal import (
+    LLMAssistantAggregator,
     LLMContextAggregatorPair,
+    LLMUserAggregator,
     LLMUserAggregatorParams,
 )
 from pipecat.runner.types import DailyDialinRequest, RunnerArguments
@@ -33,17 +64,62 @@ from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.base_transport import BaseTransport
 from pipecat.transports.daily.transport import DailyDialinSettings, DailyParams, DailyTransport
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.pipecat_first_clause import FirstClauseProcessor
+from common.pipecat_metrics import FirstAudioObserver, MetricsObserver, serve_metrics, track_session
+from common.pipecat_pool import AgentPool
+from common.pipecat_telephony import LINE_RATE, LineRateGuard, provider_rate
+from common.pipecat_tts_cache import CachedSpeech
+from common.pipecat_vad import SharedSileroVADAnalyzer, shared_vad
+from common.tts_cache import TTSCache
+
 load_dotenv(override=True)
 
+GREETING = "Hi, thanks for calling! How can I help you today?"
+
+tts_cache = TTSCache()  # per process, shared by every call it handles
+
+
+@dataclass
+class Agent:
+    """Everything a call needs except its transport, so it can be built before the phone rings."""
+
+    stt: DeepgramSTTService
+    llm: OpenAILLMService
+    tts: CartesiaTTSService
+    speech: CachedSpeech
+    user_aggregator: LLMUserAggregator
+    assistant_aggregator: LLMAssistantAggregator
+    built_at: float = field(default_factory=time.perf_counter)
+
+    def pipeline(self, transport: BaseTransport) -> Pipeline:
+        return Pipeline(
+            [
+                transport.input(),
+                self.stt,
+                self.user_aggregator,
+                self.llm,
+                FirstClauseProcessor(),  # first clause early, then whole sentences
+                self.speech,  # cached phrases skip the TTS
+                self.tts,
+                self.speech.recorder,
+                LineRateGuard(),  # 8 kHz out; converts (and counts) anything else
+                transport.output(),
+                self.assistant_aggregator,
+            ]
+        )
 
-async def run_bot(transport: BaseTransport, handle_sigint: bool) -> None:
-    """Run the voice bot pipeline for an inbound phone call."""
 
-    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+async def build_agent() -> Agent:
+    # Every call shares one Silero model. Only the first build loads it, off the event loop serving calls.
+    await asyncio.to_thread(shared_vad().load)
+
+    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"), sample_rate=provider_rate("deepgram"))
 
     tts = CartesiaTTSService(
         api_key=os.getenv("CARTESIA_API_KEY", ""),
         voice_id="b7d50908-b17c-442d-ad8d-810c63997ed9",  # Helpful Woman
+        sample_rate=provider_rate("cartesia"),
     )
 
     llm = OpenAILLMService(api_key=os.getenv("OPENAI_API_KEY"))
@@ -54,7 +130,7 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool) -> None:
             "content": (
                 "You are a friendly phone assistant. Your responses will be read aloud, "
                 "so keep them concise and conversational. Avoid special characters or "
-                "formatting. Begin by greeting the caller and asking how you can help them today."
+                "formatting. You have already greeted the caller."
             ),
         },
     ]
@@ -62,37 +138,52 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool) -> None:
     context = LLMContext(messages)
     user_aggregator, assistant_aggregator = LLMContextAggregatorPair(
         context,
-        user_params=LLMUserAggregatorParams(
-            vad_analyzer=SileroVADAnalyzer(),
-        ),
+        user_params=LLMUserAggregatorParams(vad_analyzer=SharedSileroVADAnalyzer()),
     )
 
-    pipeline = Pipeline(
-        [
-            transport.input(),
-            stt,
-            user_aggregator,
-            llm,
-            tts,
-            transport.output(),
-            assistant_aggregator,
-        ]
+    return Agent(
+        stt=stt,
+        llm=llm,
+        tts=tts,
+        speech=CachedSpeech(tts, tts_cache, provider="cartesia"),
+        user_aggregator=user_aggregator,
+        assistant_aggregator=assistant_aggregator,
     )
 
+
+async def warm_agent(agent: Agent) -> None:
+    # Opens (or keeps open) the LLM client's HTTPS connection. OpenAILLMService has no
+    # public client getter. Deepgram and Cartesia connect their websockets at pipeline start.
+    await agent.llm._client.models.list()
+
+
+agents = AgentPool(build_agent, size=int(os.getenv("AGENT_POOL_SIZE", "2")), warm=warm_agent, name="phone")
+
+
+async def warmup() -> None:
+    """Fill the agent pool before the first call; ``supervisor.py`` runs this in each worker."""
+    await agents.start()
+
+
+async def run_bot(transport: BaseTransport, agent: Agent, rang_at: float, handle_sigint: bool) -> None:
+    """Run the voice bot pipeline for an inbound phone call."""
+
+    first_audio = FirstAudioObserver(rang_at, start="warm" if agent.built_at < rang_at else "cold")
     task = PipelineTask(
-        pipeline,
+        agent.pipeline(transport),
         params=PipelineParams(
             enable_metrics=True,
             enable_usage_metrics=True,
-            audio_in_sample_rate=8000,
-            audio_out_sample_rate=8000,
+            audio_in_sample_rate=LINE_RATE,
+            audio_out_sample_rate=LINE_RATE,
         ),
+        observers=[MetricsObserver(), first_audio],  # TTFB / processing / usage / ring → greeting → /metrics
     )
 
     @transport.event_handler("on_first_participant_joined")
     async def on_first_participant_joined(transport, participant):
         logger.debug(f"First participant joined: {participant['id']}")
-        await task.queue_frames([LLMRunFrame()])
+        await task.queue_frames([TTSSpeakFrame(GREETING)])
 
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
@@ -105,7 +196,10 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool) -> None:
         await task.cancel()
 
     runner = PipelineRunner(handle_sigint=handle_sigint)
-    await runner.run(task)
+    async with track_session():
+        await runner.run(task)
+    if first_audio.seconds is not None:
+        logger.info(f"Ring to first audio: {first_audio.seconds * 1000:,.0f} ms")
 
 
 async def bot(runner_args: RunnerArguments):
@@ -114,7 +208,10 @@ async def bot(runner_args: RunnerArguments):
     Parses runner arguments, configures Daily transport with dial-in
     settings, and starts the bot to handle the incoming call.
     """
+    rang_at = time.perf_counter()
+    serve_metrics()
     try:
+        agent = await agents.acquire()
         request = DailyDialinRequest.model_validate(runner_args.body)
 
         daily_dialin_settings = DailyDialinSettings(
@@ -138,7 +235,7 @@ async def bot(runner_args: RunnerArguments):
         if request.dialin_settings.From:
             logger.info(f"Handling call from: {request.dialin_settings.From}")
 
-        await run_bot(transport, runner_args.handle_sigint)
+        await run_bot(transport, agent, rang_at, runner_args.handle_sigint)
 
     except Exception as e:
         logger.error(f"Error running bot: {e}")
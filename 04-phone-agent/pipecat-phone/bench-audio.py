@@ -0,0 +1,134 @@
+"""Benchmark phone-line audio conversion: CPU per call-minute, by path.
+
+A phone call's audio crosses the line as 8 kHz μ-law in 20 ms frames: the
+caller's speech in, the agent's speech out. Each path below converts one
+call-minute each way: 3,000 frames in and 3,000 frames out.
+
+    - pipecat 16/24 kHz – Pipecat's ``ulaw_to_pcm`` / ``pcm_to_ulaw``
+      (``audioop`` + a ``soxr`` stream) with the providers at Pipecat's
+      default rates: 8 → 16 kHz for the STT, 24 → 8 kHz from the TTS,
+    - numpy 16/24 kHz – the same conversions with ``common.telephony_audio``:
+      table-lookup μ-law and ``PolyphaseResampler``,
+    - pipecat 8 kHz – providers asked for 8 kHz (``common.pipecat_telephony``),
+      so only the μ-law codec is left, through ``audioop``,
+    - numpy 8 kHz – the same with the lookup tables.
+
+The Daily agents in this directory don't appear: Daily's transport hands
+Pipecat 8 kHz PCM, and with 8 kHz providers no Python code touches the
+audio at all.
+
+Reported per path: CPU milliseconds per call-minute, microseconds per 20 ms
+frame (in + out), and how many calls one core could convert at that cost.
+
+Usage::
+
+    uv run 04-phone-agent/pipecat-phone/bench-audio.py
+    uv run 04-phone-agent/pipecat-phone/bench-audio.py --minutes 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import warnings
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+
+console = Console()
+
+FRAME_MS = 20
+LINE_RATE = 8000
+STT_RATE = 16000  # Pipecat's default audio_in_sample_rate
+TTS_RATE = 24000  # Pipecat's default audio_out_sample_rate
+
+
+def synthetic_audio(seconds: float, sample_rate: int, seed: int) -> bytes:
+    """A voiced tone over background noise, 16-bit mono."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    voiced = np.sin(2 * np.pi * rng.uniform(120, 220) * t) * np.sin(2 * np.pi * 0.3 * t) ** 2 * 8000
+    return (voiced + rng.normal(0, 300, len(t))).astype(np.int16).tobytes()
+
+
+def frames(audio: bytes, sample_rate: int, bytes_per_sample: int = 2) -> list[bytes]:
+    size = sample_rate * FRAME_MS // 1000 * bytes_per_sample
+    return [audio[i:i + size] for i in range(0, len(audio) - size + 1, size)]
+
+
+async def run_path(path: str, caller: list[bytes], agent_16k: list[bytes], agent_24k: list[bytes], agent_8k: list[bytes], minutes: int) -> float:
+    """CPU seconds for ``minutes`` call-minutes of ``path``."""
+    from pipecat.audio.utils import create_stream_resampler, pcm_to_ulaw, ulaw_to_pcm
+
+    from common.telephony_audio import PolyphaseResampler, ulaw_decode, ulaw_encode
+
+    started = time.process_time()
+    for _ in range(minutes):  # a fresh call each minute, as the resampler state would be
+        if path == "pipecat 16/24 kHz":
+            to_stt, to_line = create_stream_resampler(), create_stream_resampler()
+            for ulaw, pcm in zip(caller, agent_24k):
+                await ulaw_to_pcm(ulaw, LINE_RATE, STT_RATE, to_stt)
+                await pcm_to_ulaw(pcm, TTS_RATE, LINE_RATE, to_line)
+        elif path == "numpy 16/24 kHz":
+            to_stt, to_line = PolyphaseResampler(LINE_RATE, STT_RATE), PolyphaseResampler(TTS_RATE, LINE_RATE)
+            for ulaw, pcm in zip(caller, agent_24k):
+                to_stt.process(ulaw_decode(ulaw))
+                ulaw_encode(to_line.process(pcm))
+        elif path == "pipecat 8 kHz":
+            to_stt, to_line = create_stream_resampler(), create_stream_resampler()
+            for ulaw, pcm in zip(caller, agent_8k):
+                await ulaw_to_pcm(ulaw, LINE_RATE, LINE_RATE, to_stt)
+                await pcm_to_ulaw(pcm, LINE_RATE, LINE_RATE, to_line)
+        elif path == "numpy 8 kHz":
+            for ulaw, pcm in zip(caller, agent_8k):
+                ulaw_decode(ulaw)
+                ulaw_encode(pcm)
+    return time.process_time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phone-line audio conversion: CPU per call-minute, by path")
+    parser.add_argument("--minutes", type=int, default=5, help="Call-minutes per path (default: 5)")
+    parser.add_argument("--paths", nargs="+", choices=["pipecat 16/24 kHz", "numpy 16/24 kHz", "pipecat 8 kHz", "numpy 8 kHz"],
+                        default=["pipecat 16/24 kHz", "numpy 16/24 kHz", "pipecat 8 kHz", "numpy 8 kHz"])
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)  # audioop, on Python 3.12
+    from loguru import logger
+
+    logger.remove()
+    from common.telephony_audio import ulaw_encode
+
+    caller = frames(ulaw_encode(synthetic_audio(60, LINE_RATE, 0)), LINE_RATE, bytes_per_sample=1)
+    agent = {rate: frames(synthetic_audio(60, rate, 1), rate) for rate in (LINE_RATE, STT_RATE, TTS_RATE)}
+    console.print(f"[bold green]⏱  {args.minutes} call-minute(s) per path, {len(caller):,} frames each way per minute[/]")
+
+    results = []
+    for path in args.paths:
+        console.print(f"[dim]Running {path} …[/]")
+        cpu = asyncio.run(run_path(path, caller, agent[STT_RATE], agent[TTS_RATE], agent[LINE_RATE], args.minutes))
+        results.append((path, cpu / args.minutes))
+
+    table = Table(title="Phone-line audio conversion per call")
+    table.add_column("Path")
+    table.add_column("CPU / call-minute", justify="right")
+    table.add_column("Per frame (in + out)", justify="right")
+    table.add_column("Calls per core", justify="right")
+    baseline = results[0][1]
+    for path, cpu in results:
+        table.add_row(
+            path,
+            f"{cpu * 1000:,.1f} ms" + (f" [dim]({cpu / baseline:.2f}×)[/]" if path != results[0][0] else ""),
+            f"{cpu / len(caller) * 1e6:,.1f} µs",
+            f"{60 / cpu:,.0f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
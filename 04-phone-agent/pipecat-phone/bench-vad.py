@@ -0,0 +1,161 @@
+"""Benchmark Silero VAD at 1/10/100 concurrent calls: per-call models vs one shared model.
+
+Each configuration runs in a fresh process, so memory figures don't leak from
+one run into the next. Every stream feeds ``--seconds`` of 20 ms audio frames,
+paced in real time like a phone call, into its own analyzer:
+
+    - per-call – Pipecat's ``SileroVADAnalyzer``, one model and ONNX session per call,
+    - shared – ``common.pipecat_vad.SharedSileroVADAnalyzer``, one model for
+      the process, with every waiting stream's window in one forward pass.
+
+Reported per configuration:
+
+    - setup – building the analyzers (and loading the shared model),
+    - memory per call – the process's peak RSS growth divided by the streams,
+    - VAD latency – ``analyze_audio()`` calls that ran the model, p50/p95/p99,
+    - CPU – process CPU time over wall time, in cores,
+    - batch – mean windows per forward pass (shared only).
+
+Usage::
+
+    uv run 04-phone-agent/pipecat-phone/bench-vad.py
+    uv run 04-phone-agent/pipecat-phone/bench-vad.py --streams 1 10 100 200 --seconds 20 --sample-rate 16000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.benchstats import peak_rss_bytes, percentile
+
+console = Console()
+
+FRAME_MS = 20
+
+
+def synthetic_call(seconds: float, sample_rate: int, seed: int) -> bytes:
+    """Bursts of a voiced tone over background noise, 16-bit mono."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    envelope = np.sin(2 * np.pi * rng.uniform(0.2, 0.5) * t) ** 2
+    voiced = np.sin(2 * np.pi * rng.uniform(120, 220) * t) * envelope * 8000
+    return (voiced + rng.normal(0, 300, len(t))).astype(np.int16).tobytes()
+
+
+async def feed(analyzer, audio: bytes, frame_bytes: int, latencies: list[float]):
+    await asyncio.sleep(random.uniform(0, FRAME_MS / 1000))  # calls don't start in lockstep
+    next_frame = time.perf_counter()
+    for offset in range(0, len(audio), frame_bytes):
+        frame = audio[offset:offset + frame_bytes]
+        runs_model = len(analyzer._vad_buffer) + len(frame) >= analyzer._vad_frames_num_bytes
+        started = time.perf_counter()
+        await analyzer.analyze_audio(frame)
+        if runs_model:
+            latencies.append((time.perf_counter() - started) * 1000)
+        next_frame += FRAME_MS / 1000
+        await asyncio.sleep(max(0.0, next_frame - time.perf_counter()))
+
+
+async def run(mode: str, streams: int, seconds: float, sample_rate: int, threads: int) -> dict:
+    from loguru import logger
+
+    logger.remove()  # one "Loading Silero VAD model..." line per analyzer otherwise
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+    from common.pipecat_vad import SharedSileroVADAnalyzer, shared_vad
+
+    audio = [synthetic_call(seconds, sample_rate, seed) for seed in range(streams)]
+    baseline = peak_rss_bytes()
+    cpu_before = time.process_time()
+
+    started = time.perf_counter()
+    if mode == "shared":
+        shared_vad().threads = threads
+        shared_vad().load()
+        analyzers = [SharedSileroVADAnalyzer() for _ in range(streams)]
+    else:
+        analyzers = [SileroVADAnalyzer() for _ in range(streams)]
+    for analyzer in analyzers:
+        analyzer.set_sample_rate(sample_rate)
+    setup = time.perf_counter() - started
+
+    latencies: list[float] = []
+    frame_bytes = sample_rate * FRAME_MS // 1000 * 2
+    started = time.perf_counter()
+    await asyncio.gather(*(feed(a, pcm, frame_bytes, latencies) for a, pcm in zip(analyzers, audio)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    vad = shared_vad()
+    return {
+        "mode": mode,
+        "streams": streams,
+        "setupMs": setup * 1000,
+        "rssPerCall": (peak_rss_bytes() - baseline) / streams,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "cores": (time.process_time() - cpu_before) / wall,
+        "batch": vad.windows / vad.batches if mode == "shared" and vad.batches else None,
+    }
+
+
+def run_in_process(mode: str, streams: int, seconds: float, sample_rate: int, threads: int) -> dict:
+    return asyncio.run(run(mode, streams, seconds, sample_rate, threads))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Silero VAD: per-call models vs one shared, batched model")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 100], help="Concurrent calls to simulate (default: 1 10 100)")
+    parser.add_argument("--seconds", type=float, default=10, help="Audio per call (default: 10)")
+    parser.add_argument("--sample-rate", type=int, choices=[8000, 16000], default=8000, help="Call audio sample rate (default: 8000, as on the phone)")
+    parser.add_argument("--threads", type=int, default=1, help="ONNX threads for the shared model (default: 1)")
+    parser.add_argument("--modes", nargs="+", choices=["per-call", "shared"], default=["per-call", "shared"])
+    args = parser.parse_args()
+
+    console.print(f"[bold green]⏱  {args.seconds:.0f} s of {args.sample_rate} Hz audio per call, {FRAME_MS} ms frames[/]")
+    spawn = multiprocessing.get_context("spawn")
+    results = []
+    for streams in args.streams:
+        for mode in args.modes:
+            console.print(f"[dim]Running {mode} × {streams} …[/]")
+            with spawn.Pool(1) as pool:
+                results.append(pool.apply(run_in_process, (mode, streams, args.seconds, args.sample_rate, args.threads)))
+
+    table = Table(title="Silero VAD per concurrent call")
+    table.add_column("Mode")
+    table.add_column("Streams", justify="right")
+    table.add_column("Setup", justify="right")
+    table.add_column("Memory / call", justify="right")
+    table.add_column("VAD p50", justify="right")
+    table.add_column("VAD p95", justify="right")
+    table.add_column("VAD p99", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("Batch", justify="right")
+    for r in results:
+        table.add_row(
+            r["mode"],
+            str(r["streams"]),
+            f"{r['setupMs']:,.0f} ms",
+            f"{r['rssPerCall'] / 2**20:,.2f} MB",
+            f"{r['p50']:.2f} ms",
+            f"{r['p95']:.2f} ms",
+            f"{r['p99']:.2f} ms",
+            f"{r['cores']:.2f} cores",
+            f"{r['batch']:.1f}" if r["batch"] else "–",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
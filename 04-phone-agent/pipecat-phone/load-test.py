@@ -0,0 +1,259 @@
+"""How many calls does one core carry? Synthetic calls through ``supervisor.py``.
+
+Starts the supervisor with one worker per core (``--workers``) and, instead
+of ``agent:bot``, a synthetic call handler. No Daily room or provider is
+involved. Each call is a Pipecat pipeline with the per-call audio work of the
+phone agent: the shared Silero VAD (``common.pipecat_vad``) on every frame.
+The agent's providers run at the line's 8 kHz (``common.pipecat_telephony``),
+so it resamples nothing. ``--resample`` adds the work of providers at
+Pipecat's default rates:
+
+    - a resample of every input frame (8 → 16 kHz, for a 16 kHz STT),
+    - while the "bot" talks, half of each call, a resample of 24 kHz TTS audio
+      down to 8 kHz for the phone line.
+
+The call's audio is ``--seconds`` of 20 ms, 8 kHz frames, queued in real time
+like a phone line delivers them. A frame's delay runs from the start of its
+20 ms slot to the end of the pipeline. Past one frame (20 ms) the worker is
+falling behind the line, which a caller hears as choppy audio and slow
+turn-taking.
+
+The load goes up in steps (``--calls``, per worker). At each step the table
+shows frame delay p50/p99, the cores the workers used, and CPU per call.
+A call that finds no free worker (all full, or a crashed one restarting) is
+rejected. Rejected and failed calls fail the step.
+The capacity is the highest step whose p99 delay stays under
+``--max-delay-ms``, per worker and so per core. It is a ceiling for the audio
+path only. The real agent also spends CPU on the network, the transport and
+its LLM context, so start ``--max-calls`` below it.
+
+Usage::
+
+    uv run 04-phone-agent/pipecat-phone/load-test.py
+    uv run 04-phone-agent/pipecat-phone/load-test.py --workers 2 --calls 10 20 40 80 --seconds 30
+    uv run 04-phone-agent/pipecat-phone/load-test.py --resample               # providers at 16/24 kHz
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.benchstats import percentile
+
+FRAME_MS = 20
+SAMPLE_RATE = 8000
+STT_SAMPLE_RATE = 16000
+TTS_SAMPLE_RATE = 24000
+
+console = Console()
+
+
+async def warmup():
+    """Runs once in each worker before it takes calls."""
+    from loguru import logger
+
+    from common.pipecat_vad import shared_vad
+
+    logger.remove()  # a few lines per pipeline otherwise, times hundreds of calls
+    logger.add(sys.stderr, level="WARNING")
+    await asyncio.to_thread(shared_vad().load)
+
+
+async def synthetic_bot(runner_args) -> dict:
+    """One synthetic call, run by a supervisor worker in place of ``agent:bot``."""
+    import numpy as np
+    from pipecat.audio.utils import create_stream_resampler
+    from pipecat.frames.frames import EndFrame, Frame, InputAudioRawFrame
+    from pipecat.pipeline.pipeline import Pipeline
+    from pipecat.pipeline.runner import PipelineRunner
+    from pipecat.pipeline.task import PipelineParams, PipelineTask
+    from pipecat.processors.audio.vad_processor import VADProcessor
+    from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+    from common.pipecat_vad import SharedSileroVADAnalyzer
+
+    seconds, resample = runner_args.body["seconds"], runner_args.body["resample"]
+    due: dict[int, float] = {}  # id(frame) → when its 20 ms slot started
+    delays: list[float] = []
+
+    class TelephonyAudio(FrameProcessor):
+        """Stand-in for the STT and TTS resampling of providers at 16/24 kHz."""
+
+        def __init__(self, tts_audio: bytes):
+            super().__init__()
+            self._to_stt = create_stream_resampler()
+            self._to_phone = create_stream_resampler()
+            self._tts_audio = tts_audio
+            self._frames = 0
+
+        async def process_frame(self, frame: Frame, direction: FrameDirection):
+            await super().process_frame(frame, direction)
+            if isinstance(frame, InputAudioRawFrame):
+                await self._to_stt.resample(frame.audio, frame.sample_rate, STT_SAMPLE_RATE)
+                self._frames += 1
+                if self._frames * FRAME_MS // 1000 % 2:  # the bot talks every other second
+                    await self._to_phone.resample(self._tts_audio, TTS_SAMPLE_RATE, SAMPLE_RATE)
+            await self.push_frame(frame, direction)
+
+    class Delay(FrameProcessor):
+        async def process_frame(self, frame: Frame, direction: FrameDirection):
+            await super().process_frame(frame, direction)
+            if isinstance(frame, InputAudioRawFrame):
+                delays.append((time.perf_counter() - due.pop(id(frame))) * 1000)
+            await self.push_frame(frame, direction)
+
+    rng = np.random.default_rng()
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = np.sin(2 * np.pi * rng.uniform(120, 220) * t) * np.sin(2 * np.pi * 0.3 * t) ** 2 * 8000
+    audio = (voiced + rng.normal(0, 300, len(t))).astype(np.int16).tobytes()
+    tts_t = np.arange(TTS_SAMPLE_RATE * FRAME_MS // 1000) / TTS_SAMPLE_RATE
+    tts_audio = (np.sin(2 * np.pi * 180 * tts_t) * 6000).astype(np.int16).tobytes()
+
+    task = PipelineTask(
+        Pipeline(
+            [VADProcessor(vad_analyzer=SharedSileroVADAnalyzer())]
+            + ([TelephonyAudio(tts_audio)] if resample else [])
+            + [Delay()]
+        ),
+        params=PipelineParams(audio_in_sample_rate=SAMPLE_RATE, audio_out_sample_rate=SAMPLE_RATE),
+    )
+
+    async def phone_line():
+        frame_bytes = SAMPLE_RATE * FRAME_MS // 1000 * 2
+        slot = time.perf_counter()
+        for offset in range(0, len(audio), frame_bytes):
+            frame = InputAudioRawFrame(audio=audio[offset:offset + frame_bytes], sample_rate=SAMPLE_RATE, num_channels=1)
+            due[id(frame)] = slot
+            await task.queue_frame(frame)
+            slot += FRAME_MS / 1000
+            await asyncio.sleep(max(0.0, slot - time.perf_counter()))
+        await task.queue_frame(EndFrame())
+
+    cpu_started, started = time.process_time(), time.time()
+    await asyncio.gather(PipelineRunner(handle_sigint=False).run(task), phone_line())
+    return {
+        "pid": os.getpid(),
+        "cpu": (cpu_started, time.process_time()),
+        "wall": (started, time.time()),
+        "delays": delays,
+    }
+
+
+async def run_step(supervisor, results: dict, calls_per_worker: int, seconds: float, resample: bool) -> dict:
+    total = calls_per_worker * len(supervisor.workers)
+    results.clear()
+    started = rejected = 0
+    for _ in range(total):
+        slot = supervisor.reserve()
+        if slot is None:  # every worker full, or a crashed one still restarting
+            rejected += 1
+        else:
+            worker, call_id = slot
+            supervisor.start_call(worker, call_id, "synthetic", None, {"seconds": seconds, "resample": resample})
+            started += 1
+        await asyncio.sleep(random.uniform(0, 2 * FRAME_MS / 1000))  # calls don't start in lockstep
+    while len(results) < started:
+        await asyncio.sleep(0.1)
+
+    done = [r for r in results.values() if r]
+    delays = sorted(ms for r in done for ms in r["delays"])
+    step = {
+        "calls": calls_per_worker,
+        "total": total,
+        "rejected": rejected,
+        "failed": total - len(done),
+        "p50": percentile(delays, 50),
+        "p99": percentile(delays, 99),
+        "cores": float("nan"),
+        "cpuPerCall": float("nan"),
+    }
+    if done:
+        by_worker: dict[int, list[dict]] = {}
+        for r in done:
+            by_worker.setdefault(r["pid"], []).append(r)
+        cpu = sum(max(r["cpu"][1] for r in rs) - min(r["cpu"][0] for r in rs) for rs in by_worker.values())
+        wall = max(r["wall"][1] for r in done) - min(r["wall"][0] for r in done)
+        step["cores"] = cpu / wall
+        step["cpuPerCall"] = cpu / wall / len(done)
+    return step
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    from supervisor import Supervisor
+
+    results: dict[str, dict | None] = {}
+
+    def ended(call_id: str, error: str | None, result: dict | None):
+        if error:
+            console.print(f"[red]Call failed: {error}[/]")
+        results[call_id] = None if error else result
+
+    supervisor = Supervisor(f"{__file__}:synthetic_bot", args.workers, max(args.calls), on_call_ended=ended)
+    await supervisor.start()
+    await supervisor.wait_ready()
+    steps = []
+    try:
+        for calls in args.calls:
+            console.print(f"[dim]{calls} call(s) per worker × {len(supervisor.workers)} …[/]")
+            steps.append(await run_step(supervisor, results, calls, args.seconds, args.resample))
+    finally:
+        await supervisor.stop()
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find how many calls a core carries, with synthetic calls through the supervisor")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU core)")
+    parser.add_argument("--calls", type=int, nargs="+", default=[5, 10, 20, 40], help="Concurrent calls per worker, one step each (default: 5 10 20 40)")
+    parser.add_argument("--seconds", type=float, default=20, help="Length of each call (default: 20)")
+    parser.add_argument("--resample", action="store_true", help="Add the resampling of 16 kHz STT / 24 kHz TTS providers")
+    parser.add_argument("--max-delay-ms", type=float, default=FRAME_MS, help=f"p99 frame delay a step may have to count (default: {FRAME_MS})")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    console.print(f"[bold green]📞 {workers} worker(s), {args.seconds:.0f} s synthetic calls of {SAMPLE_RATE} Hz audio[/]")
+    steps = asyncio.run(run(args))
+
+    table = Table(title="Synthetic calls per worker")
+    table.add_column("Calls / worker", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Delay p50", justify="right")
+    table.add_column("Delay p99", justify="right")
+    table.add_column("CPU", justify="right")
+    table.add_column("CPU / call", justify="right")
+    for s in steps:
+        ok = s["p99"] <= args.max_delay_ms and not s["failed"]
+        style = "green" if ok else "red"
+        failed = f"{s['failed']} ({s['rejected']} rejected)" if s["rejected"] else str(s["failed"])
+        if s["failed"] == s["total"]:  # no call finished, nothing was measured
+            table.add_row(str(s["calls"]), str(s["total"]), f"[red]{failed}[/]", "–", "–", "–", "–")
+            continue
+        table.add_row(
+            str(s["calls"]),
+            str(s["total"]),
+            failed,
+            f"{s['p50']:.1f} ms",
+            f"[{style}]{s['p99']:.1f} ms[/]",
+            f"{s['cores']:.2f} cores",
+            f"{s['cpuPerCall'] * 100:.1f} %",
+        )
+    console.print(table)
+
+    passing = [s["calls"] for s in steps if s["p99"] <= args.max_delay_ms and not s["failed"]]
+    if passing:
+        console.print(f"[bold]Capacity: {max(passing)} calls per core[/] [dim](p99 frame delay ≤ {args.max_delay_ms:.0f} ms)[/]")
+    else:
+        console.print(f"[bold red]No step kept p99 frame delay ≤ {args.max_delay_ms:.0f} ms – try fewer --calls[/]")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,9 @@ Usage:
 import asyncio
 import os
 import sys
+from pathlib import Path
 
-import httpx
 from dotenv import load_dotenv
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -29,33 +28,37 @@ from pipecat.services.deepgram.stt import DeepgramSTTService
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.daily.transport import DailyParams, DailyTransport
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common import clients
+from common.pipecat_telephony import LINE_RATE, LineRateGuard, provider_rate
+from common.pipecat_vad import SharedSileroVADAnalyzer
+
 load_dotenv(override=True)
 
 DAILY_API_KEY = os.getenv("DAILY_API_KEY", "")
 
 
 async def main(phone_number: str):
-    # Create a Daily room with dial-out enabled
-    headers = {"Authorization": f"Bearer {DAILY_API_KEY}"}
-    async with httpx.AsyncClient() as client:
-        room = (await client.post("https://api.daily.co/v1/rooms", headers=headers, json={"properties": {"enable_dialout": True}})).json()
-        token = (await client.post("https://api.daily.co/v1/meeting-tokens", headers=headers, json={"properties": {"room_name": room["name"], "is_owner": True}})).json()["token"]
+    # Create a Daily room with dial-out enabled, on the shared keep-alive connection
+    client, headers = clients.http("daily"), clients.auth_headers("daily")
+    room = (await client.post("/v1/rooms", headers=headers, json={"properties": {"enable_dialout": True}})).json()
+    token = (await client.post("/v1/meeting-tokens", headers=headers, json={"properties": {"room_name": room["name"], "is_owner": True}})).json()["token"]
 
     # Transport
     transport = DailyTransport(room["url"], token, "Phone Agent", params=DailyParams(api_key=DAILY_API_KEY, audio_in_enabled=True, audio_out_enabled=True))
 
     # AI services
-    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"), sample_rate=provider_rate("deepgram"))
     llm = OpenAILLMService(api_key=os.getenv("OPENAI_API_KEY"), model="gpt-4o-mini")
-    tts = CartesiaTTSService(api_key=os.getenv("CARTESIA_API_KEY", ""), voice_id="a0e99841-438c-4a64-b679-ae501e7d6091")
+    tts = CartesiaTTSService(api_key=os.getenv("CARTESIA_API_KEY", ""), voice_id="a0e99841-438c-4a64-b679-ae501e7d6091", sample_rate=provider_rate("cartesia"))
 
     # Conversation context (same prompt as the VAPI quick-call demo)
     context = LLMContext([{"role": "system", "content": "You are a friendly demo assistant. Greet the user, ask how they are, then say goodbye. Keep it under 30 seconds."}])
-    user_aggregator, assistant_aggregator = LLMContextAggregatorPair(context, user_params=LLMUserAggregatorParams(vad_analyzer=SileroVADAnalyzer()))
+    user_aggregator, assistant_aggregator = LLMContextAggregatorPair(context, user_params=LLMUserAggregatorParams(vad_analyzer=SharedSileroVADAnalyzer()))
 
-    # Pipeline
-    pipeline = Pipeline([transport.input(), stt, user_aggregator, llm, tts, transport.output(), assistant_aggregator])
-    task = PipelineTask(pipeline, params=PipelineParams(audio_in_sample_rate=8000, audio_out_sample_rate=8000))
+    # Pipeline, at the phone line's 8 kHz end to end
+    pipeline = Pipeline([transport.input(), stt, user_aggregator, llm, tts, LineRateGuard(), transport.output(), assistant_aggregator])
+    task = PipelineTask(pipeline, params=PipelineParams(audio_in_sample_rate=LINE_RATE, audio_out_sample_rate=LINE_RATE))
 
     # Dial out when bot joins the room
     @transport.event_handler("on_joined")
@@ -66,7 +69,10 @@ async def main(phone_number: str):
     async def on_participant_left(transport, participant, reason):
         await task.cancel()
 
-    await PipelineRunner().run(task)
+    try:
+        await PipelineRunner().run(task)
+    finally:
+        await clients.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,432 @@
+"""Run the Pipecat phone agent on every CPU core.
+
+One Python process runs one event loop, and one event loop runs on one core.
+Every call's VAD, resampling and frame handling share that core, so a single
+``agent.py`` process tops out long before the machine does. This supervisor
+spawns one worker process per core (``--workers``). It serves the Daily
+dial-in webhook itself and hands each call to a worker:
+
+    - routing: a call goes to the worker with the fewest active calls,
+    - limit: a worker never has more than ``--max-calls`` calls. When every
+      worker is full, the webhook answers 503 rather than overloading a core,
+    - crashes: a worker that dies is restarted. Only its own calls are lost;
+      calls on other workers carry on. Restarts back off if a worker keeps
+      dying right after it starts.
+
+A worker imports the call handler (``--target``, default ``agent:bot``) and
+runs it once per call with ``DailyRunnerArguments``, exactly as Pipecat's
+runner would. If the handler's module defines ``warmup()``, the worker awaits
+it before taking calls, which fills ``agent.py``'s agent pool.
+
+The webhook is the Pipecat runner's ``/daily-dialin-webhook`` (same payload,
+same response), so Daily's dial-in configuration doesn't change. ``GET
+/status`` lists the workers. The supervisor's metrics are on ``METRICS_PORT``
+and worker *i* serves its own on ``METRICS_PORT + 1 + i``:
+
+    supervisor_active_calls{worker}            gauge
+    supervisor_calls_total{result}             counter  routed / rejected / failed
+    supervisor_worker_restarts_total{worker}   counter
+
+Usage::
+
+    uv run 04-phone-agent/pipecat-phone/supervisor.py                        # one worker per core, port 7860
+    uv run 04-phone-agent/pipecat-phone/supervisor.py --workers 4 --max-calls 20
+    curl localhost:7860/status
+
+``load-test.py`` runs synthetic calls through the same supervisor to find how
+many calls a core can carry.
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+
+from common.eventlog import get_logger
+from common.metrics import REGISTRY, start_http_server
+
+log = get_logger("pipecat-supervisor")
+
+PORT = 7860
+DEFAULT_MAX_CALLS = 20
+DEFAULT_METRICS_PORT = 9464
+WATCH_INTERVAL_S = 0.5
+QUICK_CRASH_S = 10.0  # a worker dying sooner than this after starting counts toward backoff
+
+ACTIVE_CALLS = REGISTRY.gauge("supervisor_active_calls", "Calls running per worker", ["worker"])
+CALLS = REGISTRY.counter("supervisor_calls_total", "Dial-in requests by outcome", ["result"])
+RESTARTS = REGISTRY.counter("supervisor_worker_restarts_total", "Worker processes restarted after dying", ["worker"])
+
+
+@dataclass
+class Worker:
+    index: int
+    process: "multiprocessing.Process | None" = None
+    conn: Connection | None = None  # the worker's own pipe: calls out, events back
+    calls: set[str] = field(default_factory=set)
+    ready: bool = False
+    started_at: float = 0.0
+    restarts: int = 0
+    quick_crashes: int = 0
+    restart_at: float = 0.0  # backoff: don't respawn before this (monotonic)
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class Supervisor:
+    """Worker processes, call routing and crash recovery; see the module docstring."""
+
+    def __init__(
+        self,
+        target: str = "agent:bot",
+        workers: int | None = None,
+        max_calls: int = DEFAULT_MAX_CALLS,
+        metrics_port: int = 0,
+        on_call_ended: Callable[[str, str | None, dict | None], None] | None = None,
+    ):
+        self.target = target
+        self.max_calls = max_calls
+        self.metrics_port = metrics_port
+        self.on_call_ended = on_call_ended
+        self.workers = [Worker(i) for i in range(workers or os.cpu_count() or 1)]
+        self._context = multiprocessing.get_context("spawn")  # no forking a process that runs threads
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._watch_task: asyncio.Task | None = None
+        self._stopping = False
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        threading.Thread(target=self._read_events, name="supervisor-events", daemon=True).start()
+        for worker in self.workers:
+            self._spawn(worker)
+        self._watch_task = asyncio.create_task(self._watch())
+
+    async def wait_ready(self, timeout: float = 120.0):
+        deadline = time.monotonic() + timeout
+        while not all(w.ready for w in self.workers):
+            if time.monotonic() > deadline:
+                raise TimeoutError("workers not ready")
+            await asyncio.sleep(0.1)
+
+    def reserve(self) -> tuple[Worker, str] | None:
+        """Claim a call slot on the least-loaded ready worker, or ``None`` if all are full."""
+        candidates = [w for w in self.workers if w.ready and w.alive and len(w.calls) < self.max_calls]
+        if not candidates:
+            CALLS.labels("rejected").inc()
+            return None
+        worker = min(candidates, key=lambda w: (len(w.calls), w.index))
+        call_id = str(uuid.uuid4())
+        worker.calls.add(call_id)
+        ACTIVE_CALLS.labels(worker.index).inc()
+        return worker, call_id
+
+    def start_call(self, worker: Worker, call_id: str, room_url: str, token: str | None, body: dict):
+        try:
+            worker.conn.send(("call", call_id, {"room_url": room_url, "token": token, "body": body}))
+        except OSError as e:  # the worker died since reserve()
+            self.release(worker, call_id, error=f"worker {worker.index} unreachable: {e}")
+            return
+        CALLS.labels("routed").inc()
+
+    def release(self, worker: Worker, call_id: str, error: str | None = None, result: dict | None = None):
+        """The call is over (or never started): free its slot."""
+        if call_id not in worker.calls:
+            return
+        worker.calls.discard(call_id)
+        ACTIVE_CALLS.labels(worker.index).dec()
+        if error:
+            CALLS.labels("failed").inc()
+        if self.on_call_ended:
+            self.on_call_ended(call_id, error, result)
+
+    async def stop(self, drain_s: float = 30.0):
+        """Let running calls finish (up to ``drain_s``), then stop every worker."""
+        self._stopping = True
+        if self._watch_task:
+            self._watch_task.cancel()
+        for worker in self.workers:
+            if worker.alive:
+                try:
+                    worker.conn.send(("stop",))
+                except OSError:
+                    pass
+        deadline = time.monotonic() + drain_s
+        while any(w.alive for w in self.workers) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for worker in self.workers:
+            if worker.alive:
+                worker.process.kill()  # workers ignore SIGTERM
+            if worker.process is not None:
+                worker.process.join(timeout=5)
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "worker": w.index,
+                "pid": w.process.pid if w.process else None,
+                "alive": w.alive,
+                "ready": w.ready,
+                "calls": len(w.calls),
+                "restarts": w.restarts,
+            }
+            for w in self.workers
+        ]
+
+    def _spawn(self, worker: Worker):
+        metrics_port = self.metrics_port + 1 + worker.index if self.metrics_port else 0
+        # One pipe per worker rather than a shared queue: a worker dying halfway
+        # through a write can't leave a lock held that the other workers need.
+        if worker.conn is not None:
+            worker.conn.close()
+        worker.conn, child_conn = self._context.Pipe()
+        worker.process = self._context.Process(
+            target=worker_main,
+            args=(worker.index, self.target, child_conn, metrics_port),
+            name=f"pipecat-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.ready = False
+        worker.started_at = time.monotonic()
+        worker.process.start()
+        child_conn.close()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_S)
+            now = time.monotonic()
+            for worker in self.workers:
+                if worker.alive or self._stopping:
+                    continue
+                if worker.ready or worker.restart_at == 0.0:
+                    self._crashed(worker, now)
+                if now >= worker.restart_at:
+                    worker.restart_at = 0.0
+                    worker.restarts += 1
+                    RESTARTS.labels(worker.index).inc()
+                    self._spawn(worker)
+
+    def _crashed(self, worker: Worker, now: float):
+        exitcode = worker.process.exitcode
+        lost = list(worker.calls)
+        for call_id in lost:
+            self.release(worker, call_id, error=f"worker {worker.index} exited ({exitcode})")
+        worker.ready = False
+        worker.quick_crashes = worker.quick_crashes + 1 if now - worker.started_at < QUICK_CRASH_S else 0
+        backoff = min(30.0, 2.0 ** worker.quick_crashes - 1)
+        worker.restart_at = now + backoff
+        log.error(
+            "worker-crashed",
+            "[red]Worker {worker} exited ({exitcode}), {lost} call(s) lost[/] [dim]– restarting in {backoff:.0f} s[/]",
+            worker=worker.index,
+            exitcode=exitcode,
+            lost=len(lost),
+            backoff=backoff,
+        )
+
+    def _read_events(self):
+        while not self._stopping or any(w.alive for w in self.workers):
+            conns = [w.conn for w in self.workers if w.conn is not None and not w.conn.closed]
+            for conn in wait(conns, timeout=WATCH_INTERVAL_S):
+                try:
+                    event = conn.recv()
+                except (EOFError, OSError):  # the worker exited; _watch deals with it
+                    conn.close()
+                    continue
+                try:
+                    self._loop.call_soon_threadsafe(self._on_event, event)
+                except RuntimeError:  # the event loop has closed
+                    return
+
+    def _on_event(self, event: tuple):
+        kind, index, pid = event[:3]
+        worker = self.workers[index]
+        if worker.process is None or worker.process.pid != pid:
+            return  # from a process that has since been replaced
+        if kind == "ready":
+            worker.ready = True
+            log.info("worker-ready", "[green]Worker {worker} ready[/] [dim](pid {pid})[/]", worker=index, pid=pid)
+        elif kind == "ended":
+            _, _, _, call_id, error, result = event
+            self.release(worker, call_id, error, result)
+
+
+def worker_main(index: int, target: str, conn: Connection, metrics_port: int):
+    """Entry point of a worker process."""
+    # Ctrl-C and a service manager's SIGTERM reach the whole process group. The
+    # supervisor drains the workers itself, so they don't act on either.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    os.environ["METRICS_PORT"] = str(metrics_port)  # the agent's serve_metrics() reads it
+    asyncio.run(_serve(index, target, conn))
+
+
+async def _serve(index: int, target: str, conn: Connection):
+    from pipecat.runner.types import DailyRunnerArguments
+
+    bot = _resolve(target)
+    warmup = getattr(sys.modules[bot.__module__], "warmup", None)
+    if warmup is not None:
+        await warmup()
+    pid = os.getpid()
+    conn.send(("ready", index, pid))
+
+    calls: set[asyncio.Task] = set()
+
+    async def run_call(call_id: str, args: dict):
+        error, result = None, None
+        try:
+            result = await bot(DailyRunnerArguments(room_url=args["room_url"], token=args["token"], body=args["body"]))
+        except Exception as e:  # one failed call must not take the worker's other calls down
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        conn.send(("ended", index, pid, call_id, error, result if isinstance(result, dict) else None))
+
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            message = await loop.run_in_executor(None, conn.recv)
+        except EOFError:  # the supervisor is gone
+            break
+        if message[0] == "stop":
+            break
+        _, call_id, args = message
+        task = asyncio.create_task(run_call(call_id, args))
+        calls.add(task)
+        task.add_done_callback(calls.discard)
+    await asyncio.gather(*calls)
+
+
+def _resolve(target: str) -> Callable:
+    """``module:function`` or ``path/to/file.py:function``."""
+    module_name, function = target.rsplit(":", 1)
+    if module_name.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(Path(module_name).stem.replace("-", "_"), module_name)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    else:
+        module = importlib.import_module(module_name)
+    return getattr(module, function)
+
+
+def create_app(supervisor: Supervisor):
+    import aiohttp
+    from fastapi import FastAPI, HTTPException, Request
+    from pipecat.runner.daily import configure
+    from pipecat.runner.types import DailyDialinRequest, DialinSettings
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Draining here rather than after uvicorn returns: uvicorn re-raises the
+        # SIGINT/SIGTERM it caught on the way out, which would skip the drain.
+        await supervisor.start()
+        yield
+        log.info("supervisor-stopping", "[dim]Draining calls …[/]")
+        await supervisor.stop()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/daily-dialin-webhook")
+    async def dialin_webhook(request: Request):
+        data = await request.json()
+        if data.get("test") or data.get("Test"):  # Daily's webhook verification
+            return {"status": "OK"}
+        if not all(key in data for key in ("From", "To", "callId", "callDomain")):
+            raise HTTPException(status_code=400, detail="Missing required fields: From, To, callId, callDomain")
+        daily_api_key = os.getenv("DAILY_API_KEY")
+        if not daily_api_key:  # checked before a slot is taken: the call could never connect
+            log.error("config", "[red]DAILY_API_KEY not set – rejecting call[/]", missing="DAILY_API_KEY")
+            raise HTTPException(status_code=500, detail="DAILY_API_KEY not configured on server")
+
+        slot = supervisor.reserve()
+        if slot is None:
+            log.warning("call-rejected", "[yellow]All workers at {max_calls} calls – rejecting[/]", max_calls=supervisor.max_calls)
+            raise HTTPException(status_code=503, detail="All workers are at capacity")
+        worker, call_id = slot
+        try:
+            async with aiohttp.ClientSession() as session:
+                room = await configure(session, sip_caller_phone=data["From"])
+        except Exception as e:
+            supervisor.release(worker, call_id, error=str(e))
+            raise HTTPException(status_code=500, detail=f"Failed to create Daily room: {e}")
+
+        body = DailyDialinRequest(
+            dialin_settings=DialinSettings(
+                call_id=data["callId"],
+                call_domain=data["callDomain"],
+                To=data["To"],
+                From=data["From"],
+                sip_headers=data.get("sipHeaders"),
+            ),
+            daily_api_key=daily_api_key,
+            daily_api_url=os.getenv("DAILY_API_URL", "https://api.daily.co/v1"),
+        ).model_dump()
+        supervisor.start_call(worker, call_id, room.room_url, room.token, body)
+        log.info(
+            "call-routed",
+            "Call from [cyan]{caller}[/] → worker {worker} [dim]({calls} active)[/]",
+            caller=data["From"],
+            worker=worker.index,
+            calls=len(worker.calls),
+        )
+        return {"dailyRoom": room.room_url, "dailyToken": room.token, "sessionId": call_id}
+
+    @app.get("/status")
+    async def status():
+        return {"maxCalls": supervisor.max_calls, "workers": supervisor.status()}
+
+    return app
+
+
+async def serve(args: argparse.Namespace):
+    import uvicorn
+
+    metrics_port = int(os.getenv("METRICS_PORT", DEFAULT_METRICS_PORT))
+    if metrics_port:
+        start_http_server(metrics_port)
+    supervisor = Supervisor(args.target, args.workers, args.max_calls, metrics_port)
+    log.info(
+        "supervisor-started",
+        "[bold green]📞 Dial-in webhook on http://{host}:{port}/daily-dialin-webhook[/] "
+        "[dim]({workers} workers × {max_calls} calls)[/]",
+        host=args.host,
+        port=args.port,
+        workers=len(supervisor.workers),
+        max_calls=args.max_calls,
+    )
+    server = uvicorn.Server(uvicorn.Config(create_app(supervisor), host=args.host, port=args.port, log_level="warning"))
+    await server.serve()
+
+
+def main():
+    from dotenv import load_dotenv
+
+    load_dotenv(override=True)
+    parser = argparse.ArgumentParser(description="Run the Pipecat phone agent on every CPU core")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU core)")
+    parser.add_argument("--max-calls", type=int, default=DEFAULT_MAX_CALLS, help=f"Calls per worker at most (default: {DEFAULT_MAX_CALLS})")
+    parser.add_argument("--target", default="agent:bot", help="Call handler, module:function or file.py:function (default: agent:bot)")
+    parser.add_argument("--host", default="localhost", help="Webhook host (default: localhost)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Webhook port (default: {PORT})")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,21 +5,25 @@ Requires RETELL_API_KEY in .env.
 """
 
 import os
+import sys
+from pathlib import Path
 
 from dotenv import load_dotenv
-from rich.console import Console
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.eventlog import get_logger
 
 load_dotenv()
-console = Console()
+log = get_logger("retell-setup")
 
 
 def main():
     api_key = os.getenv("RETELL_API_KEY")
     if not api_key:
-        console.print("[red]Set RETELL_API_KEY in .env[/]")
+        log.error("config", "[red]Set RETELL_API_KEY in .env[/]", missing="RETELL_API_KEY")
         return
 
-    console.print("[bold green]📞 Retell AI Quickstart[/]")
+    log.info("start", "[bold green]📞 Retell AI Quickstart[/]")
 
     # TODO: Create agent via Retell SDK
     # from retell import Retell
@@ -32,13 +36,13 @@ def main():
     #     voice_id="...",
     #     agent_name="Demo Agent",
     # )
-    # console.print(f"Agent created: {agent.agent_id}")
+    # log.info("agent-created", "Agent created: {agent_id}", agent_id=agent.agent_id)
     #
     # # Create a phone number
     # phone = client.phone_number.create(agent_id=agent.agent_id)
-    # console.print(f"Phone number: {phone.phone_number}")
+    # log.info("phone-number-created", "Phone number: {number}", number=phone.phone_number)
 
-    console.print("[yellow]Setup scaffold ready – uncomment and customize above.[/]")
+    log.info("scaffold-ready", "[yellow]Setup scaffold ready – uncomment and customize above.[/]")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+"""Assistant configs for ``assistant-request`` events, routed by caller number.
+
+A routes file maps caller number prefixes to assistant config files::
+
+    {
+      "default": "assistant.json",
+      "prefixes": {"+49": "assistant-de.json", "+1415": "assistant.json"}
+    }
+
+Every config is loaded once and pre-serialized into the complete response body
+(``{"assistant": {...}}``), so answering an ``assistant-request`` is a prefix
+lookup plus a write – no dict building or ``json.dumps`` per call.
+
+Prefixes are indexed by length: a lookup tries one dict probe per distinct
+prefix length, longest first, which gives longest-prefix-match semantics with
+the cost of a handful of hash lookups.
+
+The registry polls the mtimes of the routes file and every referenced config
+and swaps in a freshly built table when one changes – no restart needed. A
+broken file keeps the previous table in place.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from common.eventlog import get_logger
+
+log = get_logger("assistant-registry")
+
+
+@dataclass(frozen=True)
+class AssistantEntry:
+    name: str
+    response: bytes  # ready-to-send ``{"assistant": ...}`` body
+
+
+@dataclass(frozen=True)
+class _RoutingTable:
+    default: AssistantEntry
+    by_prefix: dict[str, AssistantEntry]
+    prefix_lengths: tuple[int, ...]  # distinct lengths, longest first
+    mtimes: dict[Path, int]
+
+
+def normalize_number(number: str) -> str:
+    """Reduce a phone number to ``+`` and digits, e.g. ``+1 (415) 555-0100`` → ``+14155550100``."""
+    return "".join(ch for ch in number if ch.isdigit() or ch == "+")
+
+
+class AssistantRegistry:
+    """Caller-prefix → pre-serialized assistant config, hot-reloaded from disk."""
+
+    def __init__(self, routes_file: str | Path, poll_interval: float = 1.0):
+        self.routes_file = Path(routes_file)
+        self.poll_interval = poll_interval
+        self._table = self._build()
+        self._watcher: threading.Thread | None = None
+
+    def lookup(self, caller: str) -> AssistantEntry:
+        table = self._table  # single read, so a concurrent reload can't mix tables
+        number = normalize_number(caller)
+        for length in table.prefix_lengths:
+            entry = table.by_prefix.get(number[:length])
+            if entry is not None:
+                return entry
+        return table.default
+
+    def start_watching(self):
+        """Start the background thread that reloads configs when files change."""
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="assistant-registry", daemon=True)
+            self._watcher.start()
+
+    def reload_if_changed(self) -> bool:
+        """Rebuild the table if any source file changed. Returns True on reload."""
+        try:
+            changed = any(os.stat(path).st_mtime_ns != mtime for path, mtime in self._table.mtimes.items())
+        except FileNotFoundError:
+            changed = True
+        if changed:
+            self._table = self._build()
+        return changed
+
+    def _watch(self):
+        last_error = None
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                if self.reload_if_changed():
+                    log.info("assistants-reloaded", "[dim]Assistant configs reloaded from {routes}[/]", routes=str(self.routes_file))
+                last_error = None
+            except (OSError, KeyError, ValueError) as e:
+                # Keep serving the previous table until the files are fixed.
+                if repr(e) != last_error:
+                    log.error("assistants-reload-failed", "[red]Assistant config reload failed, keeping previous configs:[/] {error}", error=repr(e))
+                    last_error = repr(e)
+
+    def _build(self) -> _RoutingTable:
+        base = self.routes_file.parent
+        mtimes = {self.routes_file: os.stat(self.routes_file).st_mtime_ns}
+        routes = json.loads(self.routes_file.read_bytes())
+
+        entries: dict[str, AssistantEntry] = {}
+
+        def load(filename: str) -> AssistantEntry:
+            if filename not in entries:
+                path = base / filename
+                mtimes[path] = os.stat(path).st_mtime_ns
+                config = json.loads(path.read_bytes())
+                body = json.dumps({"assistant": config}, separators=(",", ":")).encode()
+                entries[filename] = AssistantEntry(name=config.get("name", filename), response=body)
+            return entries[filename]
+
+        by_prefix = {normalize_number(prefix): load(filename) for prefix, filename in routes.get("prefixes", {}).items()}
+        return _RoutingTable(
+            default=load(routes["default"]),
+            by_prefix=by_prefix,
+            prefix_lengths=tuple(sorted({len(prefix) for prefix in by_prefix}, reverse=True)),
+            mtimes=mtimes,
+        )
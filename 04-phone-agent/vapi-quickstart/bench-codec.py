@@ -0,0 +1,113 @@
+"""Micro-benchmark for the webhook server's JSON handling.
+
+Compares every installed codec (orjson / msgspec / stdlib) on VAPI-shaped
+payloads: full decode, encode, and the ``peek_event_type`` shortcut used for
+events that are only acknowledged. Also times the old logging path
+(``json.dumps(message, indent=2)[:300]``) against the size-bounded ``preview``.
+
+By default payloads are synthetic ``conversation-update`` / ``end-of-call-report``
+bodies at sizes seen over a call's lifetime. Point ``--payloads`` at a directory
+of recorded request bodies (``*.json``) to benchmark real traffic instead.
+
+Usage::
+
+    uv run 04-phone-agent/vapi-quickstart/bench-codec.py
+    uv run 04-phone-agent/vapi-quickstart/bench-codec.py --payloads recorded/
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from json_codec import available_codecs, peek_event_type, preview
+
+console = Console()
+
+
+def synthetic_payload(event_type: str, turns: int) -> bytes:
+    """A VAPI event body carrying ``turns`` conversation turns."""
+    messages = []
+    for turn in range(turns):
+        messages.append({"role": "user", "message": f"Caller utterance {turn}: could you check my order status please?", "time": 1_700_000_000_000 + turn * 4000, "secondsFromStart": turn * 4.0})
+        messages.append({"role": "bot", "message": f"Assistant reply {turn}: sure, your order shipped yesterday and arrives in two days.", "time": 1_700_000_002_000 + turn * 4000, "secondsFromStart": turn * 4.0 + 2})
+    message = {
+        "type": event_type,
+        "call": {"id": "c0ffee00-0000-4000-8000-000000000000", "type": "inboundPhoneCall", "customer": {"number": "+14155550100"}},
+        "messages": messages,
+    }
+    if event_type == "end-of-call-report":
+        message["endedReason"] = "customer-ended-call"
+        message["artifact"] = {"transcript": "\n".join(f"{m['role']}: {m['message']}" for m in messages), "messages": messages}
+    return json.dumps({"message": message}).encode()
+
+
+def load_payloads(directory: Path | None) -> dict[str, bytes]:
+    if directory:
+        return {path.name: path.read_bytes() for path in sorted(directory.glob("*.json"))}
+    return {
+        f"{event_type} ({turns} turns)": synthetic_payload(event_type, turns)
+        for event_type, turns in [
+            ("conversation-update", 2),
+            ("conversation-update", 20),
+            ("conversation-update", 100),
+            ("end-of-call-report", 100),
+            ("end-of-call-report", 500),
+        ]
+    }
+
+
+def time_per_op(func, arg, min_seconds: float = 0.2) -> float:
+    """Mean seconds per call, repeating until at least ``min_seconds`` elapsed."""
+    runs = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(runs):
+            func(arg)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / runs
+        runs *= 2
+
+
+def fmt_us(seconds: float) -> str:
+    return f"{seconds * 1e6:,.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark webhook JSON handling")
+    parser.add_argument("--payloads", type=Path, help="Directory of recorded request bodies (*.json)")
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.payloads)
+    codecs = available_codecs()
+    console.print(f"[bold green]⏱  Codecs:[/] {', '.join(c.name for c in codecs)}")
+
+    table = Table(title="µs per operation")
+    table.add_column("Payload")
+    table.add_column("Size", justify="right")
+    table.add_column("peek type", justify="right")
+    for codec in codecs:
+        table.add_column(f"{codec.name} loads", justify="right")
+        table.add_column(f"{codec.name} dumps", justify="right")
+    table.add_column("indent=2 log", justify="right")
+    table.add_column("preview log", justify="right")
+
+    for name, body in payloads.items():
+        message = json.loads(body)["message"]
+        row = [name, f"{len(body) / 1024:,.1f} KB", fmt_us(time_per_op(peek_event_type, body))]
+        for codec in codecs:
+            row.append(fmt_us(time_per_op(codec.loads, body)))
+            row.append(fmt_us(time_per_op(codec.dumps, message)))
+        row.append(fmt_us(time_per_op(lambda m: json.dumps(m, indent=2)[:300], message)))
+        row.append(fmt_us(time_per_op(preview, message)))
+        table.add_row(*row)
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
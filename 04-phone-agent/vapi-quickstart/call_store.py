@@ -0,0 +1,162 @@
+"""In-memory per-call state for the webhook server, keyed by VAPI call ID.
+
+Every VAPI event carries ``message.call``; the store correlates them into one
+:class:`CallSession` per call – final transcript fragments, status history and
+tool results – so handlers can act on conversation context (e.g. picking a
+transfer destination).
+
+Memory stays bounded no matter how many calls come and go:
+    - sessions use ``__slots__`` and fixed-length deques,
+    - a session is dropped on ``end-of-call-report`` or after ``idle_ttl``
+      seconds without events,
+    - at most ``max_calls`` sessions are kept; the least recently active
+      one is evicted first.
+
+Events that arrive after ``end-of-call-report`` (VAPI retries, late
+transcripts) don't bring the call back: ended call IDs are remembered, under
+the same ``idle_ttl`` and ``max_calls`` bounds, and :meth:`CallStore.touch`
+returns ``None`` for them.
+
+Safe to use from many handler threads at once. Each session has its own lock:
+take it through the ``add_*`` methods, never by appending to the deques
+directly, so readers can copy them while other threads write.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class CallSession:
+    __slots__ = ("call_id", "caller", "started_at", "last_seen", "status_history", "transcript", "tool_results", "_lock")
+
+    def __init__(self, call_id: str, caller: str, max_fragments: int):
+        now = time.time()
+        self.call_id = call_id
+        self.caller = caller
+        self.started_at = now
+        self.last_seen = now
+        self.status_history: deque[tuple[float, str]] = deque(maxlen=32)
+        self.transcript: deque[tuple[str, str]] = deque(maxlen=max_fragments)  # (role, text), finals only
+        self.tool_results: deque[dict] = deque(maxlen=64)
+        self._lock = threading.Lock()
+
+    @property
+    def status(self) -> str:
+        with self._lock:
+            return self.status_history[-1][1] if self.status_history else "unknown"
+
+    def add_status(self, status: str):
+        with self._lock:
+            self.status_history.append((time.time(), status))
+
+    def add_fragment(self, role: str, text: str):
+        with self._lock:
+            self.transcript.append((role, text))
+
+    def add_tool_results(self, results: list[dict]):
+        with self._lock:
+            self.tool_results.extend(results)
+
+    def user_text(self) -> str:
+        """Everything the caller said so far, oldest first."""
+        with self._lock:
+            transcript = list(self.transcript)
+        return " ".join(text for role, text in transcript if role == "user")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            status_history = list(self.status_history)
+            transcript = list(self.transcript)
+            tool_results = list(self.tool_results)
+        return {
+            "callId": self.call_id,
+            "caller": self.caller,
+            "startedAt": self.started_at,
+            "lastSeen": self.last_seen,
+            "status": status_history[-1][1] if status_history else "unknown",
+            "statusHistory": [{"at": at, "status": status} for at, status in status_history],
+            "transcript": [{"role": role, "text": text} for role, text in transcript],
+            "toolResults": tool_results,
+        }
+
+
+class CallStore:
+    """Bounded LRU of live :class:`CallSession` objects with idle expiry."""
+
+    def __init__(self, max_calls: int = 10_000, idle_ttl: float = 900.0, max_fragments: int = 200):
+        self.max_calls = max_calls
+        self.idle_ttl = idle_ttl
+        self.max_fragments = max_fragments
+        self._sessions: OrderedDict[str, CallSession] = OrderedDict()  # least recently active first
+        self._ended: OrderedDict[str, float] = OrderedDict()  # call ID → when it ended, oldest first
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def touch(self, call: dict) -> CallSession | None:
+        """Return the session for ``message.call``, creating it on first sight.
+
+        Returns ``None`` for a call without an ID or one that has already ended.
+        """
+        call_id = call.get("id")
+        if not call_id or not isinstance(call_id, str):
+            return None
+        now = time.time()
+        with self._lock:
+            if call_id in self._ended:
+                return None
+            session = self._sessions.get(call_id)
+            if session is None:
+                customer = call.get("customer")
+                caller = customer.get("number", "unknown") if isinstance(customer, dict) else "unknown"
+                session = self._sessions[call_id] = CallSession(call_id, caller, self.max_fragments)
+            else:
+                self._sessions.move_to_end(call_id)
+            session.last_seen = now
+            self._evict(now)
+        return session
+
+    def get(self, call_id: str) -> CallSession | None:
+        with self._lock:
+            return self._sessions.get(call_id)
+
+    def end(self, call_id: str) -> CallSession | None:
+        """Forget a finished call and return its final state."""
+        now = time.time()
+        with self._lock:
+            self._ended[call_id] = now
+            self._ended.move_to_end(call_id)
+            self._evict(now)
+            return self._sessions.pop(call_id, None)
+
+    def snapshot(self) -> dict:
+        """Summary of every live call, for debugging."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "active": len(sessions),
+            "evicted": self.evicted,
+            "calls": [
+                {"callId": s.call_id, "caller": s.caller, "status": s.status, "lastSeen": s.last_seen, "fragments": len(s.transcript)}
+                for s in sessions
+            ],
+        }
+
+    def _evict(self, now: float):
+        # Sessions are ordered by activity, so expired ones sit at the front.
+        sessions = self._sessions
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if len(sessions) <= self.max_calls and now - oldest.last_seen < self.idle_ttl:
+                break
+            sessions.popitem(last=False)
+            self.evicted += 1
+        ended = self._ended
+        while ended:
+            ended_at = next(iter(ended.values()))
+            if len(ended) <= self.max_calls and now - ended_at < self.idle_ttl:
+                break
+            ended.popitem(last=False)
@@ -0,0 +1,93 @@
+"""Bounded in-process queue for fire-and-forget webhook events.
+
+Informational VAPI events (transcripts, speech/status updates, …) don't need a
+response body, so the server can acknowledge them immediately and hand them to
+a few background workers. When the queue is full new events are dropped rather
+than blocking the request path; ``stats()`` exposes depth and drop counters so
+the queue can be sized from real traffic.
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    depth: int
+    max_depth: int  # high-water mark since start
+    capacity: int
+    enqueued: int
+    processed: int
+    dropped: int
+    failed: int
+
+
+class EventQueue:
+    """Bounded queue drained by a fixed pool of daemon worker threads."""
+
+    def __init__(self, handler: Callable[[str, Any], object], maxsize: int = 10_000, workers: int = 4):
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._capacity = maxsize
+        self._lock = threading.Lock()
+        self._max_depth = 0
+        self._enqueued = 0
+        self._processed = 0
+        self._dropped = 0
+        self._failed = 0
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"vapi-bg-{i}", daemon=True) for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def offer(self, event_type: str, payload: Any) -> bool:
+        """Enqueue an event without blocking. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait((event_type, payload))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        depth = self._queue.qsize()
+        with self._lock:
+            self._enqueued += 1
+            if depth > self._max_depth:
+                self._max_depth = depth
+        return True
+
+    def stats(self) -> QueueStats:
+        with self._lock:
+            return QueueStats(
+                depth=self._queue.qsize(),
+                max_depth=self._max_depth,
+                capacity=self._capacity,
+                enqueued=self._enqueued,
+                processed=self._processed,
+                dropped=self._dropped,
+                failed=self._failed,
+            )
+
+    def stop(self, timeout: float = 5.0):
+        """Let workers drain what's already queued, then stop them."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _worker(self):
+        while (item := self._queue.get()) is not _STOP:
+            try:
+                self._handler(*item)
+            except Exception:
+                with self._lock:
+                    self._failed += 1
+            else:
+                with self._lock:
+                    self._processed += 1
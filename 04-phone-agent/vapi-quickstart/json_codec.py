@@ -0,0 +1,97 @@
+"""JSON codec layer for the webhook server.
+
+Picks the fastest available backend – orjson, then msgspec, then the stdlib –
+or the one named in ``VAPI_JSON_CODEC``. All backends decode from bytes-like
+objects, raise ValueError on invalid input and encode straight to bytes.
+
+``peek_event_type`` pulls ``message.type`` out of a raw body without decoding
+it. When ``type`` is the first key of ``message`` a single anchored regex
+match finds it; anything else returns None and the caller falls back to a
+full decode. This lets fire-and-forget events be acknowledged before their
+(sometimes very large) transcripts and message histories are parsed.
+"""
+
+import json
+import os
+import re
+import reprlib
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    loads: Callable[[bytes | bytearray], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_codec() -> Codec:
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    return Codec("stdlib", json.loads, lambda obj: encoder.encode(obj).encode())
+
+
+def _orjson_codec() -> Codec:
+    import orjson
+
+    return Codec("orjson", orjson.loads, orjson.dumps)
+
+
+def _msgspec_codec() -> Codec:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: bytes | bytearray) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return Codec("msgspec", loads, msgspec.json.Encoder().encode)
+
+
+_BACKENDS = {"orjson": _orjson_codec, "msgspec": _msgspec_codec, "stdlib": _stdlib_codec}
+
+
+def available_codecs() -> list[Codec]:
+    """Every backend importable in this environment, fastest first."""
+    codecs = []
+    for factory in _BACKENDS.values():
+        try:
+            codecs.append(factory())
+        except ImportError:
+            pass
+    return codecs
+
+
+def get_codec(name: str | None = None) -> Codec:
+    """Return the named backend, or the fastest one installed."""
+    name = name or os.getenv("VAPI_JSON_CODEC")
+    if name:
+        if name not in _BACKENDS:
+            raise ValueError(f"Unknown JSON codec {name!r} (choose from {', '.join(_BACKENDS)})")
+        return _BACKENDS[name]()
+    return available_codecs()[0]
+
+
+_EVENT_TYPE = re.compile(rb'\s*\{\s*"message"\s*:\s*\{\s*"type"\s*:\s*"([a-z-]+)"')
+
+
+def peek_event_type(body: bytes | bytearray) -> str | None:
+    """Return ``message.type`` if it leads the body, without decoding the rest."""
+    match = _EVENT_TYPE.match(body)
+    return match.group(1).decode() if match else None
+
+
+_preview = reprlib.Repr()
+_preview.maxlevel = 2
+_preview.maxdict = 8
+_preview.maxlist = 4
+_preview.maxstring = 80
+_preview.maxother = 80
+
+
+def preview(obj: Any) -> str:
+    """Short, size-bounded repr for logging – cost doesn't grow with the payload."""
+    return _preview.repr(obj)
@@ -0,0 +1,152 @@
+"""Load generator for the VAPI webhook server.
+
+Replays synthetic VAPI call event streams (assistant request, status/speech
+updates, partial + final transcripts, tool calls, end-of-call report) against a
+running webhook server and reports p50/p99 response latency per event type.
+
+Events within one call are sent in order, like VAPI does; calls run concurrently.
+
+Usage::
+
+    uv run 04-phone-agent/vapi-quickstart/webhook-server.py            # in one terminal
+    uv run 04-phone-agent/vapi-quickstart/load-test.py                 # in another
+    uv run 04-phone-agent/vapi-quickstart/load-test.py --calls 500 --concurrency 200 --turns 8
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.benchstats import percentile
+
+console = Console()
+
+DEFAULT_URL = "http://localhost:3000"
+
+
+def synthetic_call(turns: int) -> list[dict]:
+    """Build the event stream for one fake inbound call."""
+    call = {
+        "id": str(uuid.uuid4()),
+        "type": "inboundPhoneCall",
+        "customer": {"number": f"+1415555{uuid.uuid4().int % 10_000:04d}"},
+    }
+    events = [
+        {"type": "assistant-request"},
+        {"type": "status-update", "status": "in-progress"},
+    ]
+    messages = []
+    for turn in range(turns):
+        user_text = f"This is user utterance number {turn} asking about the order status"
+        events += [
+            {"type": "speech-update", "status": "started", "role": "user"},
+            {"type": "transcript", "role": "user", "transcriptType": "partial", "transcript": user_text[:20]},
+            {"type": "transcript", "role": "user", "transcriptType": "partial", "transcript": user_text[:40]},
+            {"type": "transcript", "role": "user", "transcriptType": "final", "transcript": user_text},
+            {"type": "speech-update", "status": "stopped", "role": "user"},
+        ]
+        messages.append({"role": "user", "message": user_text})
+        if turn % 3 == 2:
+            events.append({
+                "type": "tool-calls",
+                "toolCallList": [
+                    {"id": f"call_{turn}", "name": "lookup_order", "parameters": {"orderId": f"A{turn:04d}"}},
+                ],
+            })
+        bot_text = f"Sure, here is the answer to question {turn}."
+        messages.append({"role": "bot", "message": bot_text})
+        events += [
+            {"type": "conversation-update", "messages": list(messages)},
+            {"type": "speech-update", "status": "started", "role": "assistant"},
+            {"type": "transcript", "role": "assistant", "transcriptType": "final", "transcript": bot_text},
+            {"type": "speech-update", "status": "stopped", "role": "assistant"},
+        ]
+    events += [
+        {"type": "status-update", "status": "ended"},
+        {
+            "type": "end-of-call-report",
+            "endedReason": "customer-ended-call",
+            "artifact": {"transcript": "\n".join(f"{m['role']}: {m['message']}" for m in messages)},
+        },
+    ]
+    return [{"message": {**event, "call": call}} for event in events]
+
+
+async def run_call(
+    client: httpx.AsyncClient,
+    url: str,
+    events: list[dict],
+    interval: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+):
+    for payload in events:
+        event_type = payload["message"]["type"]
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            errors[event_type] += 1
+        else:
+            latencies[event_type].append(time.perf_counter() - start)
+        if interval:
+            await asyncio.sleep(interval)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the VAPI webhook server")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Webhook server URL (default: {DEFAULT_URL})")
+    parser.add_argument("--calls", type=int, default=200, help="Number of synthetic calls (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Calls in flight at once (default: 100)")
+    parser.add_argument("--turns", type=int, default=6, help="Conversation turns per call (default: 6)")
+    parser.add_argument("--interval", type=float, default=0.0, help="Pause between events of one call, in seconds")
+    args = parser.parse_args()
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async def bounded_call(client: httpx.AsyncClient):
+        async with semaphore:
+            await run_call(client, args.url, synthetic_call(args.turns), args.interval, latencies, errors)
+
+    console.print(f"[bold green]📈 {args.calls} calls × {args.turns} turns → {args.url}[/] [dim](concurrency {args.concurrency})[/]")
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(bounded_call(client) for _ in range(args.calls)))
+    elapsed = time.perf_counter() - start
+
+    table = Table(title="Webhook latency per event type")
+    table.add_column("Event")
+    table.add_column("Count", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("max ms", justify="right")
+    for event_type in sorted(latencies.keys() | errors.keys()):
+        values = sorted(latencies[event_type])
+        if values:
+            p50, p99, worst = (f"{v * 1000:.1f}" for v in (percentile(values, 50), percentile(values, 99), values[-1]))
+        else:
+            p50 = p99 = worst = "–"
+        table.add_row(event_type, str(len(values)), str(errors[event_type]), p50, p99, worst)
+    console.print(table)
+
+    total = sum(len(v) for v in latencies.values())
+    console.print(f"[bold]{total} events in {elapsed:.2f}s → {total / elapsed:.0f} events/s[/]")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,13 +13,16 @@ Usage:
 
 import os
 import sys
+from pathlib import Path
 
-from vapi import Vapi
 from dotenv import load_dotenv
-from rich.console import Console
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common import clients
+from common.eventlog import get_logger
 
 load_dotenv()
-console = Console()
+log = get_logger("vapi-quick-call")
 
 
 def make_call(destination: str):
@@ -27,13 +30,13 @@ def make_call(destination: str):
     phone_number_id = os.getenv("VAPI_PHONE_NUMBER_ID")
 
     if not api_key:
-        console.print("[red]Set VAPI_API_KEY in .env[/]")
+        log.error("config", "[red]Set VAPI_API_KEY in .env[/]", missing="VAPI_API_KEY")
         return
     if not phone_number_id:
-        console.print("[red]Set VAPI_PHONE_NUMBER_ID in .env (from VAPI dashboard → Phone Numbers)[/]")
+        log.error("config", "[red]Set VAPI_PHONE_NUMBER_ID in .env (from VAPI dashboard → Phone Numbers)[/]", missing="VAPI_PHONE_NUMBER_ID")
         return
 
-    client = Vapi(token=api_key)
+    client = clients.vapi()
 
     call = client.calls.create(
         phone_number_id=phone_number_id,
@@ -59,15 +62,18 @@ def make_call(destination: str):
         },
     )
 
-    console.print(f"[bold green]📞 Call created![/]")
-    console.print(f"  Call ID:  {call.id}")
-    console.print(f"  Status:   {call.status}")
-    console.print(f"  To:       {destination}")
+    log.info(
+        "call-created",
+        "[bold green]📞 Call created![/]\n  Call ID:  {call_id}\n  Status:   {status}\n  To:       {destination}",
+        call_id=call.id,
+        status=str(call.status),
+        destination=destination,
+    )
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        console.print("[yellow]Usage: uv run 04-phone-agent/vapi-quickstart/quick-call.py +11234567890[/]")
+        log.error("usage", "[yellow]Usage: uv run 04-phone-agent/vapi-quickstart/quick-call.py +11234567890[/]")
         sys.exit(1)
 
     make_call(sys.argv[1])
@@ -0,0 +1,153 @@
+"""Tool registry for VAPI ``tool-calls`` events.
+
+When the LLM calls several tools in one turn, the caller hears silence until
+the slowest one finishes – not the sum of all of them. Each tool call in an
+event is submitted to a shared, bounded thread pool and awaited against its
+own deadline; a tool that times out or raises answers with its fallback
+result instead. Results always carry the ``toolCallId`` of the call they
+answer.
+
+Idempotent lookups can opt into a TTL cache keyed on ``(name, parameters)``.
+
+Each call is counted in ``vapi_tool_calls_total{tool,outcome}`` (ok / cached /
+timeout / error / unknown) and the tool's own run time is recorded in
+``vapi_tool_call_duration_seconds{tool}`` – including runs that finish after
+their deadline, since those are the ones worth looking at.
+
+Usage::
+
+    tools = ToolRegistry()
+
+    @tools.register("lookup_order", timeout=1.5, cache_ttl=60)
+    def lookup_order(orderId: str) -> dict:
+        ...
+
+    results = tools.run(message["toolCallList"])
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable
+
+from common.metrics import REGISTRY
+
+DEFAULT_FALLBACK = '{"status": "unavailable", "message": "The tool is unavailable right now. Apologize and offer to try again."}'
+
+TOOL_CALLS = REGISTRY.counter("vapi_tool_calls_total", "Tool calls by outcome", ["tool", "outcome"])
+TOOL_DURATION = REGISTRY.histogram("vapi_tool_call_duration_seconds", "Tool run time", ["tool"])
+
+
+@dataclass(frozen=True)
+class Tool:
+    name: str
+    func: Callable[..., object]  # called with the tool call's parameters as keyword arguments
+    timeout: float = 2.0  # seconds
+    fallback: str = DEFAULT_FALLBACK
+    cache_ttl: float | None = None  # seconds; None disables caching
+
+
+class TTLCache:
+    """Small thread-safe TTL cache with a size bound (oldest entries evicted first)."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def put(self, key: tuple, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ToolRegistry:
+    """Named tools, executed concurrently per ``tool-calls`` event."""
+
+    def __init__(self, max_workers: int = 32, cache: TTLCache | None = None):
+        self._tools: dict[str, Tool] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vapi-tool")
+        self._cache = cache or TTLCache()
+
+    def register(self, name: str, *, timeout: float = 2.0, fallback: str = DEFAULT_FALLBACK, cache_ttl: float | None = None):
+        """Decorator registering ``func`` as the tool ``name``."""
+
+        def decorator(func: Callable[..., object]) -> Callable[..., object]:
+            self._tools[name] = Tool(name, func, timeout, fallback, cache_ttl)
+            return func
+
+        return decorator
+
+    def run(self, tool_call_list: list[dict]) -> list[dict]:
+        """Run every tool call concurrently; return VAPI ``results`` in the same order."""
+        started = time.monotonic()
+        pending: list[tuple[dict, Tool | None, Future | str | None]] = []
+
+        for tool_call in tool_call_list:
+            tool = self._tools.get(tool_call.get("name", ""))
+            if tool is None:
+                pending.append((tool_call, None, None))
+                continue
+            params = tool_call.get("parameters") or {}
+            cached = self._cache.get(_cache_key(tool, params)) if tool.cache_ttl else None
+            pending.append((tool_call, tool, cached if cached is not None else self._pool.submit(self._call, tool, params)))
+
+        results = []
+        for tool_call, tool, outcome in pending:
+            result = {"name": tool_call.get("name", ""), "toolCallId": tool_call.get("id", "")}
+            if tool is None:
+                result["error"] = f"Unknown tool: {result['name']}"
+                TOOL_CALLS.labels("unknown", "unknown").inc()  # never the caller's name: label values must stay bounded
+            elif isinstance(outcome, str):
+                result["result"] = outcome
+                TOOL_CALLS.labels(tool.name, "cached").inc()
+            else:
+                # Each tool's deadline counts from when the event arrived, so waiting
+                # on one tool doesn't extend the budget of the others.
+                remaining = tool.timeout - (time.monotonic() - started)
+                try:
+                    result["result"] = outcome.result(timeout=max(remaining, 0))
+                    TOOL_CALLS.labels(tool.name, "ok").inc()
+                except FutureTimeoutError:
+                    result["result"] = tool.fallback
+                    TOOL_CALLS.labels(tool.name, "timeout").inc()
+                except Exception:  # the tool raised
+                    result["result"] = tool.fallback
+                    TOOL_CALLS.labels(tool.name, "error").inc()
+            results.append(result)
+        return results
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, tool: Tool, params: dict) -> str:
+        started = time.perf_counter()
+        try:
+            value = tool.func(**params)
+        finally:
+            TOOL_DURATION.labels(tool.name).observe(time.perf_counter() - started)
+        result = value if isinstance(value, str) else json.dumps(value)
+        if tool.cache_ttl:
+            self._cache.put(_cache_key(tool, params), result, tool.cache_ttl)
+        return result
+
+
+def _cache_key(tool: Tool, params: dict) -> tuple:
+    return tool.name, json.dumps(params, sort_keys=True)
@@ -12,169 +12,655 @@ These event types require a meaningful response body:
     - "tool-calls"          → return tool results
     - "transfer-destination-request" → return transfer destination
 
+Server modes (``--mode``):
+    - "async"    (default) asyncio HTTP/1.1 server with keep-alive. Handlers run on a
+                 bounded thread pool per event type, so a slow "tool-calls" handler
+                 never holds up transcripts or status updates from other calls.
+    - "threaded" http.server with keep-alive and a bounded pool of connection workers;
+                 each open connection holds one, and connections past ``--workers``
+                 are answered 503.
+    - "single"   the plain single-threaded http.server – one event at a time.
+
+With ``--fast-ack`` informational events are acknowledged as soon as their
+type is known – usually read straight off the raw body, before any JSON
+decoding – and handled by background workers via a bounded queue; only the
+three response-bearing events above stay on the request path. Queue depth and
+drop counters are served at ``GET /stats``.
+
+Events are correlated per call ID in an in-memory, bounded ``CallStore``
+(transcript, status history, tool results); inspect it at ``GET /calls`` and
+``GET /calls/<call-id>``.
+
+Prometheus metrics are served at ``GET /metrics``: events and handler latency
+per event type, events in flight, active calls, fast-ack queue depth and drops,
+and tool-call outcomes and durations per tool (see ``common.metrics``).
+
+Logging goes through ``common.eventlog``: pretty ``rich`` output by default,
+batched JSON lines with ``VOICE_LOG_FORMAT=json``.
+
+JSON goes through ``json_codec`` (orjson / msgspec when installed, stdlib
+otherwise; override with ``VAPI_JSON_CODEC``). ``bench-codec.py`` compares them.
+
 Usage:
     1. Start this server:  uv run 04-phone-agent/vapi-quickstart/webhook-server.py
     2. Expose via tunnel:  ngrok http 3000
     3. Set the ngrok URL as your Server URL in the VAPI dashboard.
+
+Load-test it locally with ``load-test.py`` in this directory.
 """
 
-import json
+import argparse
+import asyncio
 import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
 from http.server import HTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
 
 from dotenv import load_dotenv
-from rich.console import Console
 
-load_dotenv()
-console = Console()
-
-PORT = 3000
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))  # repo root, for `common`
+from common.eventlog import get_logger
+from common.metrics import CONTENT_TYPE, REGISTRY
 
+from assistant_registry import AssistantRegistry
+from call_store import CallSession, CallStore
+from event_queue import EventQueue
+from json_codec import get_codec, peek_event_type, preview
+from tool_registry import ToolRegistry
 
-class VapiWebhookHandler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length)
-        payload = json.loads(body)
-
-        message = payload.get("message", {})
-        event_type = message.get("type", "unknown")
-
-        console.print(f"\n[bold cyan]━━ Event: {event_type} ━━[/]")
-
-        response = self._handle_event(event_type, message)
-
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
+load_dotenv()
+log = get_logger("vapi-webhook")
+codec = get_codec()
 
-    def _handle_event(self, event_type: str, message: dict) -> dict:
-        """Route event to the appropriate handler."""
+PORT = 3000
+ROUTES_FILE = Path(__file__).parent / "routes.json"
+KEEPALIVE_TIMEOUT = 15  # seconds an idle keep-alive connection stays open
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+# Handler threads per event type ("*" = everything else). Response-bearing events
+# get their own lanes so they can't starve – or be starved by – informational ones.
+EVENT_LANES = {
+    "assistant-request": 8,
+    "tool-calls": 16,
+    "transfer-destination-request": 4,
+    "*": 8,
+}
+
+# Events whose response body VAPI actually uses – never acknowledged early.
+RESPONSE_EVENTS = frozenset({"assistant-request", "tool-calls", "transfer-destination-request"})
+
+# Event types VAPI documents; anything else is counted as "other" so a stray
+# client can't grow the metric label space without bound.
+KNOWN_EVENTS = frozenset({
+    *RESPONSE_EVENTS,
+    "status-update", "transcript", "end-of-call-report", "hang", "speech-update",
+    "conversation-update", "model-output", "user-interrupted", "voice-input",
+    "phone-call-control", "tool-calls-result", "transfer-update",
+})
+
+EVENTS = REGISTRY.counter("vapi_events_total", "Webhook events handled", ["type"])
+EVENT_DURATION = REGISTRY.histogram("vapi_event_duration_seconds", "Event handler latency", ["type"])
+EVENTS_IN_FLIGHT = REGISTRY.gauge("vapi_events_in_flight", "Events currently being handled")
+CONNECTIONS_REJECTED = REGISTRY.counter("vapi_connections_rejected_total", "Threaded-mode connections refused with 503, every worker busy")
+
+# Pretty-mode banner opening each event's log line.
+HEADER = "\n[bold cyan]━━ Event: {0} ━━[/]\n"
+
+# Transfer targets by keyword, matched against what the caller said during the
+# call; the most recently mentioned keyword wins.
+DEFAULT_TRANSFER_NUMBER = os.getenv("VAPI_TRANSFER_NUMBER", "+11234567890")
+TRANSFER_ROUTES = {
+    "billing": "+11234567891",
+    "invoice": "+11234567891",
+    "refund": "+11234567891",
+    "support": "+11234567892",
+    "technical": "+11234567892",
+    "sales": "+11234567893",
+}
+
+tools = ToolRegistry()
+
+
+# Demo tools – replace with your own. Parameters arrive as keyword arguments.
+@tools.register("get_current_time", timeout=0.5)
+def get_current_time() -> dict:
+    return {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"), "timezone": "UTC"}
+
+
+@tools.register("lookup_order", timeout=1.5, cache_ttl=60)
+def lookup_order(orderId: str) -> dict:
+    time.sleep(0.2)  # stand-in for a database / API round trip
+    return {"orderId": orderId, "status": "shipped", "eta": "2 days"}
+
+
+class VapiEvents:
+    """VAPI event handlers, shared by every server mode.
+
+    Per-call state lives in the thread-safe ``calls`` store, so one instance can
+    serve many threads at once. Handlers return a dict, or ready-made JSON bytes
+    that are sent as-is.
+    """
+
+    def __init__(self, assistants: AssistantRegistry, tools: ToolRegistry, calls: CallStore):
+        self.assistants = assistants
+        self.tools = tools
+        self.calls = calls
+
+    def handle_event(self, event_type: str, message: dict) -> dict | bytes:
+        """Route event to the appropriate handler, recording count and latency."""
+        label = event_type if event_type in KNOWN_EVENTS else "other"
+        EVENTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            return self._dispatch(event_type, message)
+        finally:
+            EVENT_DURATION.labels(label).observe(time.perf_counter() - started)
+            EVENTS.labels(label).inc()
+            EVENTS_IN_FLIGHT.dec()
+
+    def _dispatch(self, event_type: str, message: dict) -> dict | bytes:
+        call = message.get("call")
+        session = self.calls.touch(call) if isinstance(call, dict) else None
+        call_id = session.call_id if session else None
 
         if event_type == "assistant-request":
-            return self._handle_assistant_request(message)
+            return self._handle_assistant_request(message, call_id)
 
         if event_type == "tool-calls":
-            return self._handle_tool_calls(message)
+            return self._handle_tool_calls(message, session)
 
         if event_type == "transfer-destination-request":
-            return self._handle_transfer_request(message)
+            return self._handle_transfer_request(message, session)
 
         if event_type == "status-update":
             status = message.get("status", "")
-            console.print(f"  Call status → [yellow]{status}[/]")
+            log.info(event_type, HEADER + "  Call status → [yellow]{status}[/]", call_id=call_id, status=status)
+            if session:
+                session.add_status(status)
 
         elif event_type == "transcript":
             role = message.get("role", "")
             transcript_type = message.get("transcriptType", "")
             text = message.get("transcript", "")
-            console.print(f"  [{transcript_type}] {role}: {text}")
+            log.info(event_type, HEADER + "  \\[{transcript_type}] {role}: {text}", call_id=call_id, transcript_type=transcript_type, role=role, text=text)
+            if session and transcript_type == "final":
+                session.add_fragment(role, text)
 
         elif event_type == "end-of-call-report":
             reason = message.get("endedReason", "unknown")
-            console.print(f"  Call ended: [red]{reason}[/]")
-            artifact = message.get("artifact", {})
-            if artifact.get("transcript"):
-                console.print(f"  [dim]Transcript: {artifact['transcript'][:200]}[/]")
+            transcript = message.get("artifact", {}).get("transcript", "")
+            template = HEADER + "  Call ended: [red]{reason}[/]" + ("\n  [dim]Transcript: {transcript}[/]" if transcript else "")
+            log.info(event_type, template, call_id=call_id, reason=reason, transcript=transcript[:200])
+            if session:
+                self.calls.end(session.call_id)
 
         elif event_type == "hang":
-            console.print("  [red]⚠ Assistant is hanging (no response)[/]")
+            log.warning(event_type, HEADER + "  [red]⚠ Assistant is hanging (no response)[/]", call_id=call_id)
 
         elif event_type == "speech-update":
             status = message.get("status", "")
             role = message.get("role", "")
-            console.print(f"  Speech {status} ({role})")
+            log.info(event_type, HEADER + "  Speech {status} ({role})", call_id=call_id, status=status, role=role)
 
         elif event_type == "conversation-update":
             msgs = message.get("messages", [])
-            console.print(f"  Conversation updated ({len(msgs)} messages)")
+            log.info(event_type, HEADER + "  Conversation updated ({count} messages)", call_id=call_id, count=len(msgs))
 
         else:
-            console.print(f"  [dim]{json.dumps(message, indent=2)[:300]}[/]")
+            log.info(event_type, HEADER + "  [dim]{preview}[/]", call_id=call_id, preview=preview(message))
 
         return {}
 
-    def _handle_assistant_request(self, message: dict) -> dict:
+    def handle_queued_event(self, event_type: str, item: dict | bytes | bytearray):
+        """Handle an event acknowledged early – ``item`` is the message or the raw, undecoded body."""
+        message = item if isinstance(item, dict) else _parse_message(item)
+        self.handle_event(event_type, message)
+
+    def _handle_assistant_request(self, message: dict, call_id: str | None) -> bytes:
         """Return assistant configuration dynamically.
 
         VAPI sends this when a call starts and no assistant is pre-configured,
-        allowing you to return different assistants per caller.
+        allowing you to return different assistants per caller. Configs come
+        pre-serialized from the registry, picked by caller number prefix
+        (see ``routes.json``).
         """
-        call = message.get("call", {})
-        caller = call.get("customer", {}).get("number", "unknown")
-        console.print(f"  Assistant requested for caller: [green]{caller}[/]")
-
-        return {
-            "assistant": {
-                "model": {
-                    "provider": "openai",
-                    "model": "gpt-4o-mini",
-                    "systemPrompt": "You are a helpful phone assistant. Be concise.",
-                },
-                "voice": {
-                    "provider": "cartesia",
-                    "voiceId": "a0e99841-438c-4a64-b679-ae501e7d6091",
-                },
-                "firstMessage": "Hello! How can I help you today?",
-                "transcriber": {"provider": "deepgram", "model": "nova-2"},
-            }
-        }
-
-    def _handle_tool_calls(self, message: dict) -> dict:
+        caller = _caller_number(message.get("call"))
+        assistant = self.assistants.lookup(caller)
+        log.info(
+            "assistant-request",
+            HEADER + "  Assistant requested for caller: [green]{caller}[/] → {assistant}",
+            call_id=call_id,
+            caller=caller,
+            assistant=assistant.name,
+        )
+
+        return assistant.response
+
+    def _handle_tool_calls(self, message: dict, session: CallSession | None) -> dict:
         """Execute tool calls and return results.
 
         VAPI sends this when the LLM invokes a tool defined in the assistant config.
-        Each tool call must be answered with a matching toolCallId.
+        Each tool call must be answered with a matching toolCallId. All calls in
+        one event run concurrently, each against its own timeout.
         """
         tool_call_list = message.get("toolCallList", [])
-        results = []
+        call_id = session.call_id if session else None
 
+        log.info("tool-calls", HEADER + "  {count} tool call(s)", call_id=call_id, count=len(tool_call_list))
         for tool_call in tool_call_list:
-            name = tool_call.get("name", "")
-            call_id = tool_call.get("id", "")
-            params = tool_call.get("parameters", {})
-            console.print(f"  Tool: [yellow]{name}[/] (id={call_id})")
-            console.print(f"    Params: {json.dumps(params)}")
-
-            # TODO: implement your tool logic here
-            result = f'{{"status": "ok", "message": "{name} executed successfully"}}'
-
-            results.append({
-                "name": name,
-                "toolCallId": call_id,
-                "result": result,
-            })
-
+            log.info(
+                "tool-call",
+                "  Tool: [yellow]{name}[/] (id={tool_call_id})\n    Params: {params}",
+                call_id=call_id,
+                name=tool_call.get("name", ""),
+                tool_call_id=tool_call.get("id", ""),
+                params=tool_call.get("parameters", {}),
+            )
+
+        results = self.tools.run(tool_call_list)
+        if session:
+            session.add_tool_results(results)
         return {"results": results}
 
-    def _handle_transfer_request(self, message: dict) -> dict:
-        """Return a transfer destination when the assistant requests a call transfer."""
-        console.print("  [yellow]Transfer requested[/]")
+    def _handle_transfer_request(self, message: dict, session: CallSession | None) -> dict:
+        """Return a transfer destination when the assistant requests a call transfer.
+
+        Picks the number for the department the caller mentioned last, falling
+        back to ``VAPI_TRANSFER_NUMBER``.
+        """
+        number = DEFAULT_TRANSFER_NUMBER
+        if session:
+            said = session.user_text().lower()
+            mentions = {keyword: said.rfind(keyword) for keyword in TRANSFER_ROUTES}
+            keyword = max(mentions, key=mentions.get)
+            if mentions[keyword] >= 0:
+                number = TRANSFER_ROUTES[keyword]
+        log.info(
+            "transfer-destination-request",
+            HEADER + "  [yellow]Transfer requested[/] → {number}",
+            call_id=session.call_id if session else None,
+            number=number,
+        )
 
-        # TODO: look up the right number based on conversation context
         return {
-            "destination": {"type": "number", "number": "+11234567890"},
+            "destination": {"type": "number", "number": number},
             "message": {"type": "request-start", "message": "Transferring you now."},
         }
 
+
+class VapiWebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self._read_body()
+        if body is None:
+            return
+        background = self.server.background
+
+        event_type = peek_event_type(body) if background is not None else None
+        if event_type is not None and event_type not in RESPONSE_EVENTS:
+            background.offer(event_type, body)
+            self._send(200, {})
+            return
+
+        try:
+            message = _parse_message(body)
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        event_type = message.get("type", "unknown")
+
+        if background is not None and event_type not in RESPONSE_EVENTS:
+            background.offer(event_type, message)
+            response = {}
+        else:
+            try:
+                response = self.server.events.handle_event(event_type, message)
+            except Exception as e:
+                log.error("handler-error", "  [red]Handler error ({type}):[/] {error}", type=event_type, error=repr(e))
+                self._send(500, {"error": "handler failed"})
+                return
+
+        self._send(200, response)
+
+    def do_GET(self):
+        status, response = _get_response(self.path, self.server.events, self.server.background)
+        self._send(status, response)
+
+    def _read_body(self) -> bytearray | None:
+        """Read the request body into one preallocated buffer (no chunk joins).
+
+        Answers 400/413 and returns None when ``Content-Length`` is invalid or
+        over ``MAX_BODY_BYTES``; the unread body means the connection closes.
+        """
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_length = -1
+        if not 0 <= content_length <= MAX_BODY_BYTES:
+            self.close_connection = True
+            too_large = content_length > MAX_BODY_BYTES
+            self._send(413 if too_large else 400, {"error": "request body too large" if too_large else "invalid Content-Length"})
+            return None
+        body = bytearray(content_length)
+        view = memoryview(body)
+        while view and (n := self.rfile.readinto(view)):
+            view = view[n:]
+        return body
+
+    def _send(self, status: int, response: dict | bytes | str):
+        data, content_type = _encode(response)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
     def log_message(self, format, *args):
         pass  # suppress default HTTP logging
 
 
+class KeepAliveWebhookHandler(VapiWebhookHandler):
+    """HTTP/1.1 variant for the pooled server – connections stay open between events."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+
+
+class WebhookHTTPServer(HTTPServer):
+    """HTTPServer carrying the event handlers and optional fast-ack queue for its request handlers."""
+
+    def __init__(self, address, handler_class, events: VapiEvents, background: EventQueue | None = None):
+        super().__init__(address, handler_class)
+        self.events = events
+        self.background = background
+
+
+class PooledHTTPServer(WebhookHTTPServer):
+    """WebhookHTTPServer that hands each connection to a bounded thread pool.
+
+    A keep-alive connection holds its worker until it closes or idles out
+    (``KEEPALIVE_TIMEOUT``), so the pool is also the connection limit: one
+    more is answered 503 straight away rather than queued behind idle sockets.
+    """
+
+    def __init__(self, address, handler_class, events: VapiEvents, background: EventQueue | None = None, max_workers: int = 64):
+        super().__init__(address, handler_class, events, background)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vapi-conn")
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            CONNECTIONS_REJECTED.inc()
+            try:
+                request.sendall(_http_response(503, {"error": "server busy"}, keep_alive=False))
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        self._pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class EventRouter:
+    """Runs event handlers on a bounded thread pool per event type."""
+
+    def __init__(self, events: VapiEvents, lanes: dict[str, int] = EVENT_LANES):
+        self.events = events
+        self._pools = {
+            name: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"vapi-{name}")
+            for name, size in lanes.items()
+        }
+
+    def submit(self, event_type: str, message: dict) -> Future:
+        pool = self._pools.get(event_type) or self._pools["*"]
+        return pool.submit(self.events.handle_event, event_type, message)
+
+    def shutdown(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncWebhookServer:
+    """Minimal asyncio HTTP/1.1 server for VAPI webhooks.
+
+    Keeps connections alive between events and never runs handler code on the
+    event loop – every event is dispatched through an :class:`EventRouter`, or
+    straight onto the ``background`` queue for informational events.
+    """
+
+    def __init__(self, router: EventRouter, port: int = PORT, background: EventQueue | None = None):
+        self.router = router
+        self.port = port
+        self.background = background
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle_connection, port=self.port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await asyncio.wait_for(_read_request(reader), KEEPALIVE_TIMEOUT)
+                if request is None:
+                    break
+                method, path, version, headers, body = request
+                status, response = await self._respond(method, path, body)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                writer.write(_http_response(status, response, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # idle timeout, client hung up, or a malformed request – drop the connection
+        finally:
+            writer.close()
+
+    async def _respond(self, method: str, path: str, body: bytes) -> tuple[int, dict | bytes | str]:
+        if method == "GET":
+            return _get_response(path, self.router.events, self.background)
+        if method != "POST":
+            return 405, {"error": "method not allowed"}
+
+        if self.background is not None:
+            event_type = peek_event_type(body)
+            if event_type is not None and event_type not in RESPONSE_EVENTS:
+                self.background.offer(event_type, body)
+                return 200, {}
+
+        try:
+            message = _parse_message(body)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        event_type = message.get("type", "unknown")
+        if self.background is not None and event_type not in RESPONSE_EVENTS:
+            self.background.offer(event_type, message)
+            return 200, {}
+        try:
+            return 200, await asyncio.wrap_future(self.router.submit(event_type, message))
+        except Exception as e:
+            log.error("handler-error", "  [red]Handler error ({type}):[/] {error}", type=event_type, error=repr(e))
+            return 500, {"error": "handler failed"}
+
+
+def _caller_number(call) -> str:
+    """``call.customer.number``, or "unknown" when the payload doesn't have one."""
+    customer = call.get("customer") if isinstance(call, dict) else None
+    number = customer.get("number") if isinstance(customer, dict) else None
+    return number if isinstance(number, str) else "unknown"
+
+
+def _parse_message(body: bytes | bytearray) -> dict:
+    """Decode a webhook body to its ``message`` object; ValueError if it isn't one."""
+    try:
+        payload = codec.loads(body)
+    except ValueError:
+        raise ValueError("invalid JSON") from None
+    message = payload.get("message", {}) if isinstance(payload, dict) else None
+    if not isinstance(message, dict):
+        raise ValueError("expected a JSON object with a 'message' object")
+    return message
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, str, dict, bytes] | None:
+    """Read one HTTP request. Returns None when the client closed the connection."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    method, path, version = request_line.decode("latin-1").split()
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    content_length = int(headers.get("content-length", 0))
+    if content_length > MAX_BODY_BYTES:
+        raise ValueError(f"request body too large ({content_length} bytes)")
+    body = await reader.readexactly(content_length) if content_length else b""
+    return method, path, version, headers, body
+
+
+def _get_response(path: str, events: VapiEvents, background: EventQueue | None) -> tuple[int, dict | str]:
+    """Debug endpoints: ``/metrics``, ``/stats``, ``/calls`` and ``/calls/<call-id>``."""
+    if path == "/metrics":
+        return 200, REGISTRY.render()
+    if path == "/stats":
+        return 200, {"queue": asdict(background.stats()) if background else None, "activeCalls": len(events.calls)}
+    if path == "/calls":
+        return 200, events.calls.snapshot()
+    if path.startswith("/calls/"):
+        session = events.calls.get(path.removeprefix("/calls/"))
+        return (200, session.snapshot()) if session else (404, {"error": "unknown call"})
+    return 404, {"error": "not found"}
+
+
+def _report_queue_stats(background: EventQueue, interval: float):
+    """Print queue depth and drop counters whenever they change."""
+    last = None
+    while True:
+        time.sleep(interval)
+        stats = background.stats()
+        current = (stats.depth, stats.dropped, stats.failed)
+        if current != last:
+            log.info(
+                "queue-stats",
+                "[dim]Queue depth {depth}/{capacity} (max {max_depth}), processed {processed}, dropped {dropped}, failed {failed}[/]",
+                **asdict(stats),
+            )
+            last = current
+
+
+def _register_gauges(events: VapiEvents, background: EventQueue | None):
+    """Expose state owned by the call store and queue; read only when scraped."""
+    REGISTRY.callback("vapi_active_calls", "Calls with live session state", lambda: len(events.calls))
+    REGISTRY.callback("vapi_calls_evicted_total", "Sessions evicted by capacity or idle TTL", lambda: events.calls.evicted, kind="counter")
+    if background is not None:
+        REGISTRY.callback("vapi_queue_depth", "Fast-ack events waiting for a worker", lambda: background.stats().depth)
+        REGISTRY.callback("vapi_queue_dropped_total", "Fast-ack events dropped on a full queue", lambda: background.stats().dropped, kind="counter")
+
+
+def _encode(response: dict | bytes | str) -> tuple[bytes, str]:
+    """Body and content type: ready-made JSON bytes, metrics text, or a dict to serialize."""
+    if isinstance(response, bytes):
+        return response, "application/json"
+    if isinstance(response, str):
+        return response.encode(), CONTENT_TYPE
+    return codec.dumps(response), "application/json"
+
+
+def _http_response(status: int, response: dict | bytes | str, keep_alive: bool) -> bytes:
+    body, content_type = _encode(response)
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
 def main():
-    if not os.getenv("VAPI_API_KEY"):
-        console.print("[yellow]Warning: VAPI_API_KEY not set in .env[/]")
+    parser = argparse.ArgumentParser(description="VAPI Server URL (webhook) handler")
+    parser.add_argument("--mode", default="async", choices=["async", "threaded", "single"], help="Server mode (default: async)")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument("--routes", type=Path, default=ROUTES_FILE, help="Caller-prefix → assistant config routes (default: routes.json)")
+    parser.add_argument("--max-calls", type=int, default=10_000, help="Max call sessions kept in memory (default: 10000)")
+    parser.add_argument("--call-idle-ttl", type=float, default=900, help="Forget calls idle for this many seconds (default: 900)")
+    parser.add_argument("--workers", type=int, default=64, help="Connection workers, and so open connections, in threaded mode (default: 64)")
+    parser.add_argument("--fast-ack", action="store_true", help="Acknowledge informational events immediately, handle them in the background")
+    parser.add_argument("--queue-size", type=int, default=10_000, help="Background queue capacity with --fast-ack (default: 10000)")
+    parser.add_argument("--queue-workers", type=int, default=4, help="Background workers with --fast-ack (default: 4)")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="Seconds between queue stats lines with --fast-ack (default: 10)")
+    args = parser.parse_args()
 
-    console.print(f"[bold green]🌐 VAPI webhook server on http://localhost:{PORT}[/]")
-    console.print("[dim]Expose with: ngrok http 3000[/]")
-    console.print("[dim]Then set the ngrok URL as your Server URL in the VAPI dashboard.[/]\n")
+    if not os.getenv("VAPI_API_KEY"):
+        log.warning("config", "[yellow]Warning: VAPI_API_KEY not set in .env[/]", missing="VAPI_API_KEY")
+
+    log.info(
+        "server-started",
+        "[bold green]🌐 VAPI webhook server on http://localhost:{port}[/] [dim]({mode}, {codec} JSON)[/]\n"
+        "[dim]Expose with: ngrok http {port}[/]\n"
+        "[dim]Then set the ngrok URL as your Server URL in the VAPI dashboard.[/]\n",
+        port=args.port,
+        mode=args.mode,
+        codec=codec.name,
+        fast_ack=args.fast_ack,
+    )
+
+    assistants = AssistantRegistry(args.routes)
+    assistants.start_watching()
+    events = VapiEvents(assistants, tools, CallStore(max_calls=args.max_calls, idle_ttl=args.call_idle_ttl))
+    background = None
+    if args.fast_ack:
+        background = EventQueue(events.handle_queued_event, maxsize=args.queue_size, workers=args.queue_workers)
+        background.start()
+        threading.Thread(target=_report_queue_stats, args=(background, args.stats_interval), daemon=True).start()
+    _register_gauges(events, background)
 
-    server = HTTPServer(("", PORT), VapiWebhookHandler)
     try:
-        server.serve_forever()
+        if args.mode == "async":
+            router = EventRouter(events)
+            try:
+                asyncio.run(AsyncWebhookServer(router, args.port, background).serve_forever())
+            finally:
+                router.shutdown()
+        else:
+            if args.mode == "threaded":
+                server = PooledHTTPServer(("", args.port), KeepAliveWebhookHandler, events, background, args.workers)
+            else:
+                server = WebhookHTTPServer(("", args.port), VapiWebhookHandler, events, background)
+            try:
+                server.serve_forever()
+            finally:
+                server.server_close()
     except KeyboardInterrupt:
-        console.print("\n[bold green]Server stopped.[/]")
+        log.info("server-stopped", "\n[bold green]Server stopped.[/]")
+    finally:
+        tools.shutdown()
+        if background is not None:
+            background.stop()
+            log.info("queue-stats", "[dim]Queue: {stats}[/]", stats=asdict(background.stats()))
 
 
 if __name__ == "__main__":
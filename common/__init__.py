@@ -0,0 +1,5 @@
+"""Helpers shared by the demos.
+
+The demo directories aren't installable packages, so scripts put the repo root
+on ``sys.path`` before importing from here.
+"""
@@ -0,0 +1,184 @@
+"""Shared, pre-warmed provider connections for long-running services.
+
+Building a new SDK client for every request also means a new TCP + TLS
+handshake. That costs two or three round trips, 50–150 ms to a provider's
+edge, and it lands on the latency-critical path. This module keeps one pooled,
+keep-alive client per provider for the life of the process:
+
+    - HTTP: one ``httpx.AsyncClient`` per provider, plus one ``httpx.Client``
+      for the sync SDKs. They speak HTTP/2 when ``h2`` is installed, so
+      concurrent requests share one warm connection. :func:`cartesia`,
+      :func:`elevenlabs` and :func:`vapi` hand these clients to the SDKs via
+      ``httpx_client`` and return the same SDK instance every time.
+    - :func:`prewarm` runs at startup. It opens every configured provider's
+      connection by running that provider's health check, concurrently.
+      :func:`health` runs the same checks at any time and reports status,
+      latency and HTTP version per provider.
+
+Base URLs follow the ``*_BASE_URL`` variables the demos already use, so the
+mock servers work here too. Async clients belong to the event loop that first
+used them. Call :func:`aclose` before that loop ends.
+
+SDKs that own their transport, such as the Deepgram SDK or Pipecat's
+websocket TTS/STT services, keep managing their own connections.
+
+Usage::
+
+    await clients.prewarm()                  # at startup
+    tts = clients.cartesia()                 # shared AsyncCartesia on the pooled client
+    rooms = await clients.http("daily").get("/v1/rooms", headers=clients.auth_headers("daily"))
+    await clients.aclose()                   # at shutdown
+"""
+
+import asyncio
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
+
+import httpx
+
+HTTP2 = importlib.util.find_spec("h2") is not None  # httpx[http2]
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300)
+TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+@dataclass(frozen=True)
+class Provider:
+    name: str
+    default_base_url: str
+    api_key_env: str
+    auth_header: str
+    auth_prefix: str = ""
+    base_url_env: str = ""
+    health_path: str = "/"  # cheap authenticated GET
+
+    @property
+    def base_url(self) -> str:
+        return (os.getenv(self.base_url_env) if self.base_url_env else None) or self.default_base_url
+
+    @property
+    def configured(self) -> bool:
+        return bool(os.getenv(self.api_key_env) or (self.base_url_env and os.getenv(self.base_url_env)))
+
+
+PROVIDERS = {
+    p.name: p
+    for p in (
+        Provider("cartesia", "https://api.cartesia.ai", "CARTESIA_API_KEY", "X-API-Key", base_url_env="CARTESIA_BASE_URL"),
+        Provider("elevenlabs", "https://api.elevenlabs.io", "ELEVENLABS_API_KEY", "xi-api-key", base_url_env="ELEVENLABS_BASE_URL", health_path="/v1/models"),
+        Provider("deepgram", "https://api.deepgram.com", "DEEPGRAM_API_KEY", "Authorization", "Token ", base_url_env="DEEPGRAM_HOST", health_path="/v1/projects"),
+        Provider("vapi", "https://api.vapi.ai", "VAPI_API_KEY", "Authorization", "Bearer ", health_path="/assistant?limit=1"),
+        Provider("daily", "https://api.daily.co", "DAILY_API_KEY", "Authorization", "Bearer ", health_path="/v1/rooms?limit=1"),
+    )
+}
+
+_async: dict[str, httpx.AsyncClient] = {}
+_sync: dict[str, httpx.Client] = {}
+_sdk: dict[str, object] = {}
+
+
+def auth_headers(provider: str) -> dict[str, str]:
+    p = PROVIDERS[provider]
+    key = os.getenv(p.api_key_env, "")
+    return {p.auth_header: p.auth_prefix + key} if key else {}
+
+
+def http(provider: str) -> httpx.AsyncClient:
+    """The process-wide async client for ``provider``, with its base URL set."""
+    client = _async.get(provider)
+    if client is None or client.is_closed:
+        client = _async[provider] = httpx.AsyncClient(
+            base_url=PROVIDERS[provider].base_url, http2=HTTP2, limits=LIMITS, timeout=TIMEOUT
+        )
+    return client
+
+
+def sync_http(provider: str) -> httpx.Client:
+    """The process-wide sync client for ``provider``."""
+    client = _sync.get(provider)
+    if client is None or client.is_closed:
+        client = _sync[provider] = httpx.Client(
+            base_url=PROVIDERS[provider].base_url, http2=HTTP2, limits=LIMITS, timeout=TIMEOUT
+        )
+    return client
+
+
+def cartesia():
+    """Shared ``AsyncCartesia`` on the pooled client."""
+    if "cartesia" not in _sdk:
+        from cartesia import AsyncCartesia
+
+        _sdk["cartesia"] = AsyncCartesia(
+            api_key=os.getenv("CARTESIA_API_KEY"), base_url=os.getenv("CARTESIA_BASE_URL"), httpx_client=http("cartesia")
+        )
+    return _sdk["cartesia"]
+
+
+def elevenlabs(sync: bool = False):
+    """Shared ``AsyncElevenLabs`` (or ``ElevenLabs`` with ``sync=True``) on the pooled client."""
+    name = "elevenlabs-sync" if sync else "elevenlabs"
+    if name not in _sdk:
+        from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+
+        options = {"api_key": os.getenv("ELEVENLABS_API_KEY"), "base_url": os.getenv("ELEVENLABS_BASE_URL")}
+        _sdk[name] = (
+            ElevenLabs(**options, httpx_client=sync_http("elevenlabs"))
+            if sync
+            else AsyncElevenLabs(**options, httpx_client=http("elevenlabs"))
+        )
+    return _sdk[name]
+
+
+def vapi():
+    """Shared ``Vapi`` server SDK client on the pooled (sync) client."""
+    if "vapi" not in _sdk:
+        from vapi import Vapi
+
+        _sdk["vapi"] = Vapi(token=os.getenv("VAPI_API_KEY"), httpx_client=sync_http("vapi"))
+    return _sdk["vapi"]
+
+
+@dataclass
+class HealthResult:
+    provider: str
+    ok: bool
+    status: int | None = None
+    latency_ms: float | None = None
+    http_version: str = ""
+    error: str = ""
+
+
+async def check(provider: str) -> HealthResult:
+    """One authenticated GET over the pooled connection (opening it if needed)."""
+    started = time.perf_counter()
+    try:
+        response = await http(provider).get(PROVIDERS[provider].health_path, headers=auth_headers(provider))
+    except httpx.HTTPError as e:
+        return HealthResult(provider, False, error=str(e) or type(e).__name__)
+    latency = (time.perf_counter() - started) * 1000
+    # Any answer below 500 means the connection is up; 401/403 still deserves a look.
+    return HealthResult(provider, response.status_code < 500, response.status_code, latency, response.http_version)
+
+
+async def health(providers: list[str] | None = None) -> list[HealthResult]:
+    """Check ``providers`` (default: every one with a key or base URL set) concurrently."""
+    names = providers if providers is not None else [name for name, p in PROVIDERS.items() if p.configured]
+    return list(await asyncio.gather(*(check(name) for name in names)))
+
+
+async def prewarm(providers: list[str] | None = None) -> list[HealthResult]:
+    """Open the HTTP connections, via :func:`health`."""
+    return await health(providers)
+
+
+async def aclose():
+    """Close every shared client and forget the SDK instances built on them."""
+    _sdk.clear()
+    for client in _async.values():
+        await client.aclose()
+    for client in _sync.values():
+        client.close()
+    _async.clear()
+    _sync.clear()
+
@@ -0,0 +1,149 @@
+"""Event logging for the demos: pretty ``rich`` output or batched JSON lines.
+
+Selected by the ``VOICE_LOG_FORMAT`` env var:
+    - ``pretty`` (default) renders each event's rich-markup template, for
+      interactive demo use.
+    - ``json`` emits one JSON object per event. Callers only enqueue a dict;
+      a background writer thread serializes and writes events in batches, so
+      neither terminal rendering nor I/O sits on the hot path.
+
+Other env vars: ``VOICE_LOG_LEVEL`` (debug / info / warning / error, default
+info) and ``VOICE_LOG_FILE`` (append JSON lines there instead of stdout).
+
+Usage::
+
+    log = get_logger("vapi-webhook")
+    log.info("status-update", "Call status → [yellow]{status}[/]", status=status)
+
+The template is only formatted in pretty mode, with the fields by name and
+the event name as ``{0}`` (positional, so it never collides with a field).
+Every field but numbers is rendered with ``str()`` and markup-escaped, so
+caller-supplied text such as ``[bold]`` prints literally. In JSON mode the
+event name and fields are written as-is. A template ending in ``\r`` overwrites its line, for
+interim output such as partial transcripts.
+"""
+
+import atexit
+import json
+import numbers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, TextIO
+
+from rich.console import Console
+from rich.markup import escape
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 0.2  # seconds the writer waits before writing a partial batch
+QUEUE_SIZE = 65_536
+
+
+class JsonLineWriter:
+    """Background thread that writes queued events as JSON lines in batches.
+
+    ``submit`` never blocks: when the queue is full the event is dropped and
+    counted in ``dropped``.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="eventlog-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record: dict):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """Flush everything queued so far and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            batch = [record]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while record is not None and len(batch) < BATCH_SIZE:
+                try:
+                    record = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                batch.append(record)
+            self._write([r for r in batch if r is not None])
+            if batch[-1] is None:
+                return
+
+    def _write(self, batch: list[dict]):
+        if not batch:
+            return
+        self._stream.write("".join(self._encoder.encode(record) + "\n" for record in batch))
+        self._stream.flush()
+
+
+class EventLogger:
+    """Named logger; see the module docstring for the call convention."""
+
+    def __init__(self, name: str, console: Console | None, writer: JsonLineWriter | None, level: int):
+        self.name = name
+        self.console = console
+        self._writer = writer
+        self._level = level
+
+    def debug(self, event: str, template: str = "", **fields: Any):
+        self._log(10, "debug", event, template, fields)
+
+    def info(self, event: str, template: str = "", **fields: Any):
+        self._log(20, "info", event, template, fields)
+
+    def warning(self, event: str, template: str = "", **fields: Any):
+        self._log(30, "warning", event, template, fields)
+
+    def error(self, event: str, template: str = "", **fields: Any):
+        self._log(40, "error", event, template, fields)
+
+    def _log(self, level: int, level_name: str, event: str, template: str, fields: dict):
+        if level < self._level:
+            return
+        if self._writer is not None:
+            self._writer.submit({"ts": time.time(), "level": level_name, "logger": self.name, "event": event, **fields})
+        elif template:
+            # Numbers keep their type for format specs like {latency_ms:,.0f}; everything else is text.
+            safe = {k: v if isinstance(v, numbers.Number) else escape(str(v)) for k, v in fields.items()}
+            text = template.format(event, **safe)
+            if text.endswith("\r"):
+                self.console.print(text[:-1], end="\r")
+            else:
+                self.console.print(text)
+
+
+_console: Console | None = None
+_writer: JsonLineWriter | None = None
+_lock = threading.Lock()
+
+
+def get_logger(name: str) -> EventLogger:
+    """Return a logger configured from the ``VOICE_LOG_*`` env vars."""
+    global _console, _writer
+    level = LEVELS.get(os.getenv("VOICE_LOG_LEVEL", "info").lower(), 20)
+    if os.getenv("VOICE_LOG_FORMAT", "pretty").lower() != "json":
+        _console = _console or Console()
+        return EventLogger(name, _console, None, level)
+
+    with _lock:
+        if _writer is None:
+            path = os.getenv("VOICE_LOG_FILE")
+            _writer = JsonLineWriter(open(path, "a", encoding="utf-8", buffering=1 << 16) if path else sys.stdout)
+    return EventLogger(name, None, _writer, level)
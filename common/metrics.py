@@ -0,0 +1,242 @@
+"""Minimal Prometheus-style metrics: counters, gauges and fixed-bucket histograms.
+
+Instrumentation must not add latency of its own, so writes are lock-free:
+every metric keeps one list of cells per writing thread and a thread only ever
+touches its own list. The lock is taken once per thread (to register its
+cells) and when rendering, which sums the per-thread cells.
+
+Usage::
+
+    EVENTS = REGISTRY.counter("vapi_events_total", "Webhook events received", ["type"])
+    LATENCY = REGISTRY.histogram("vapi_event_duration_seconds", "Handler latency", ["type"])
+
+    EVENTS.labels("transcript").inc()
+    LATENCY.labels("transcript").observe(0.004)
+
+    REGISTRY.render()          # text exposition format, for a /metrics endpoint
+    start_http_server(9464)    # or serve it from a background thread
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+# Seconds; spans sub-millisecond webhook handlers up to multi-second TTFBs.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Cells:
+    """Per-thread value cells, summed on read."""
+
+    __slots__ = ("_size", "_local", "_shards", "_lock")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> list[float]:
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells = self._local.cells = [0.0] * self._size
+            with self._lock:
+                self._shards.append(cells)
+            return cells
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            shards = list(self._shards)
+        return [sum(column) for column in zip(*shards)] if shards else [0.0] * self._size
+
+
+class Counter:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0):
+        self._cells.mine()[0] += amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Gauge:
+    """Up/down value. ``inc``/``dec`` are per-thread deltas, so they stay lock-free."""
+
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount: float = 1.0):
+        self._cells.mine()[0] += amount
+
+    def dec(self, amount: float = 1.0):
+        self._cells.mine()[0] -= amount
+
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Histogram:
+    """Fixed buckets; cells hold one count per bucket, then +Inf, then the sum."""
+
+    __slots__ = ("buckets", "_cells")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self._cells = _Cells(len(buckets) + 2)
+
+    def observe(self, value: float):
+        cells = self._cells.mine()
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def snapshot(self) -> tuple[list[float], float, float]:
+        """Cumulative bucket counts, total count, sum."""
+        totals = self._cells.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class _Family:
+    """A named metric with optional labels; one child per label-value combination."""
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: list[str], factory: Callable[[], object]):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    # Unlabelled families act as their single child.
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            label_pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+            if isinstance(child, Histogram):
+                cumulative, count, total = child.snapshot()
+                bounds = [_fmt(b) for b in child.buckets] + ["+Inf"]
+                for bound, value in zip(bounds, cumulative):
+                    bucket_labels = _labels([*label_pairs, f'le="{bound}"'])
+                    lines.append(f"{self.name}_bucket{bucket_labels} {_fmt(value)}")
+                lines.append(f"{self.name}_sum{_labels(label_pairs)} {_fmt(total)}")
+                lines.append(f"{self.name}_count{_labels(label_pairs)} {_fmt(count)}")
+            else:
+                lines.append(f"{self.name}{_labels(label_pairs)} {_fmt(child.value())}")
+        return lines
+
+
+class _Callback:
+    """A metric whose value is read from a function at render time."""
+
+    def __init__(self, name: str, help_text: str, kind: str, func: Callable[[], float]):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.func = func
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {_fmt(self.func())}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Family | _Callback] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: list[str] = ()) -> _Family:
+        return self._register(_Family(name, help_text, "counter", labelnames, Counter))
+
+    def gauge(self, name: str, help_text: str, labelnames: list[str] = ()) -> _Family:
+        return self._register(_Family(name, help_text, "gauge", labelnames, Gauge))
+
+    def histogram(self, name: str, help_text: str, labelnames: list[str] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> _Family:
+        return self._register(_Family(name, help_text, "histogram", labelnames, lambda: Histogram(buckets)))
+
+    def callback(self, name: str, help_text: str, func: Callable[[], float], kind: str = "gauge") -> _Callback:
+        """Expose a value owned elsewhere (queue depth, active calls, …), read on render."""
+        return self._register(_Callback(name, help_text, kind, func))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            # Re-registering returns the existing metric, so module reloads and
+            # repeated setup calls don't raise.
+            return self._metrics.setdefault(metric.name, metric)
+
+
+REGISTRY = Registry()
+
+
+def start_http_server(port: int, registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` from a daemon thread."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # suppress request logs
+
+    server = ThreadingHTTPServer(("", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _labels(pairs: list[str]) -> str:
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(value: float) -> str:
+    if not math.isfinite(value):
+        return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -0,0 +1,136 @@
+"""Send the first clause of each LLM response to the TTS early, then whole sentences.
+
+Pipecat's default aggregation holds LLM tokens until a full sentence is
+complete. For an opening like "Sure, I can move your appointment to Tuesday
+at ten." the caller hears nothing until the LLM has streamed the last word.
+:class:`FirstClauseAggregator` cuts the first chunk of every response at the
+first clause boundary instead. The TTS starts on "Sure, I can move your
+appointment to Tuesday at ten," while the LLM is still writing the rest. A
+boundary is one of ``clause_punctuation`` followed by whitespace. The comma in
+"1,000" is not a boundary. The cut only happens once ``min_first_chars`` have accumulated;
+shorter fragments ("Well,") make choppy audio and hardly help latency.
+``max_first_chars`` is an optional backstop for an opening with no
+punctuation at all: past that length, the text up to the last space is sent.
+
+After the first chunk the aggregator goes back to full sentences, which keeps
+the prosody of the rest of the answer. With ``min_sentence_chars``, short
+sentences are held and sent together with the next one. Each response starts
+over with the first-clause rule. Pipecat flushes the aggregator at
+``LLMFullResponseEndFrame`` and on an interruption.
+
+:class:`FirstClauseProcessor` runs the aggregator between the LLM and the TTS
+service. It is Pipecat's ``LLMTextProcessor``, which turns ``LLMTextFrame``
+tokens into ``AggregatedTextFrame`` chunks. The TTS synthesizes those chunks
+as they are, without re-aggregating.
+
+Usage::
+
+    pipeline = Pipeline([transport.input(), stt, user_aggregator, llm,
+                         FirstClauseProcessor(min_first_chars=20), tts,
+                         transport.output(), assistant_aggregator])
+
+``03-hello-voice-agent/bench-aggregator.py`` compares first-audio latency
+across thresholds with a fake LLM and a fake TTS.
+"""
+
+from typing import AsyncIterator, Optional
+
+from pipecat.processors.aggregators.llm_text_processor import LLMTextProcessor
+from pipecat.utils.text.base_text_aggregator import Aggregation, AggregationType
+from pipecat.utils.text.simple_text_aggregator import SimpleTextAggregator
+
+CLAUSE_PUNCTUATION = ",;:—–"
+DEFAULT_MIN_FIRST_CHARS = 20
+
+
+class FirstClauseAggregator(SimpleTextAggregator):
+    """The first clause of a response as soon as it is long enough, then full sentences."""
+
+    def __init__(
+        self,
+        min_first_chars: int = DEFAULT_MIN_FIRST_CHARS,
+        max_first_chars: int | None = None,
+        min_sentence_chars: int = 0,
+        clause_punctuation: str = CLAUSE_PUNCTUATION,
+    ):
+        super().__init__()
+        self.min_first_chars = min_first_chars
+        self.max_first_chars = max_first_chars
+        self.min_sentence_chars = min_sentence_chars
+        self.clause_punctuation = clause_punctuation
+        self._first = True  # nothing of this response sent yet
+        self._held = ""  # complete sentences waiting for min_sentence_chars
+
+    @property
+    def text(self) -> Aggregation:
+        return Aggregation(text=self._pending(), type=AggregationType.SENTENCE)
+
+    async def aggregate(self, text: str) -> AsyncIterator[Aggregation]:
+        for char in text:
+            self._text += char
+            sentence = await self._check_sentence_with_lookahead(char)
+            if sentence:
+                chunk = self._batch(sentence.text)
+            elif self._first:
+                chunk = self._first_clause(char)
+            else:
+                chunk = None
+            if chunk:
+                self._first = False
+                yield Aggregation(text=chunk, type=AggregationType.SENTENCE)
+
+    def _first_clause(self, char: str) -> str | None:
+        if self._needs_lookahead:  # a sentence end is waiting to be confirmed
+            return None
+        if char.isspace() and len(self._text) > 1 and self._text[-2] in self.clause_punctuation:
+            cut = len(self._text) - 1
+            if len(self._text[:cut].strip()) < self.min_first_chars:
+                return None
+        elif self.max_first_chars and len(self._text.strip()) > self.max_first_chars and char.isspace():
+            cut = len(self._text) - 1
+        else:
+            return None
+        clause, self._text = self._text[:cut].strip(), self._text[cut:]
+        return clause or None
+
+    def _batch(self, sentence: str) -> str | None:
+        """Full sentences, held back until ``min_sentence_chars`` have gathered (never the first one)."""
+        text = f"{self._held} {sentence}".strip() if self._held else sentence
+        if not self._first and len(text) < self.min_sentence_chars:
+            self._held = text
+            return None
+        self._held = ""
+        return text
+
+    def _pending(self) -> str:
+        return f"{self._held} {self._text.strip(' ')}".strip() if self._held else self._text.strip(" ")
+
+    async def flush(self) -> Optional[Aggregation]:
+        text = self._pending()
+        await self.reset()
+        return Aggregation(text=text, type=AggregationType.SENTENCE) if text else None
+
+    async def handle_interruption(self):
+        await self.reset()
+
+    async def reset(self):
+        await super().reset()
+        self._first = True
+        self._held = ""
+
+
+class FirstClauseProcessor(LLMTextProcessor):
+    """Place between the LLM and the TTS service; takes :class:`FirstClauseAggregator`'s thresholds."""
+
+    def __init__(
+        self,
+        min_first_chars: int = DEFAULT_MIN_FIRST_CHARS,
+        max_first_chars: int | None = None,
+        min_sentence_chars: int = 0,
+        clause_punctuation: str = CLAUSE_PUNCTUATION,
+        **kwargs,
+    ):
+        super().__init__(
+            text_aggregator=FirstClauseAggregator(min_first_chars, max_first_chars, min_sentence_chars, clause_punctuation),
+            **kwargs,
+        )
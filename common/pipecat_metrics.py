@@ -0,0 +1,122 @@
+"""Forward Pipecat pipeline metrics into ``common.metrics``.
+
+With ``enable_metrics`` / ``enable_usage_metrics`` on, Pipecat services emit a
+``MetricsFrame`` carrying TTFB, processing time and usage. By default those
+only reach the debug log; :class:`MetricsObserver` records them in the shared
+registry instead, so a scrape of ``/metrics`` shows STT/LLM/TTS latency
+across every call the process has handled:
+
+    pipecat_ttfb_seconds{processor,model}             histogram
+    pipecat_processing_seconds{processor,model}       histogram
+    pipecat_llm_tokens_total{processor,model,kind}    counter (prompt / completion)
+    pipecat_tts_characters_total{processor,model}     counter
+    pipecat_active_sessions                           gauge
+    pipecat_ring_to_first_audio_seconds{start}        histogram (warm / cold, from FirstAudioObserver)
+
+Usage::
+
+    serve_metrics()   # once per process; port from METRICS_PORT (default 9464, 0 disables)
+    task = PipelineTask(pipeline, params=..., observers=[MetricsObserver()])
+    async with track_session():
+        await runner.run(task)
+"""
+
+import os
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from pipecat.frames.frames import BotStartedSpeakingFrame, MetricsFrame
+from pipecat.metrics.metrics import (
+    LLMUsageMetricsData,
+    ProcessingMetricsData,
+    TTFBMetricsData,
+    TTSUsageMetricsData,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+
+from common.metrics import REGISTRY, start_http_server
+
+DEFAULT_PORT = 9464
+
+TTFB = REGISTRY.histogram("pipecat_ttfb_seconds", "Time to first byte per service", ["processor", "model"])
+PROCESSING = REGISTRY.histogram("pipecat_processing_seconds", "Processing time per service", ["processor", "model"])
+LLM_TOKENS = REGISTRY.counter("pipecat_llm_tokens_total", "LLM tokens used", ["processor", "model", "kind"])
+TTS_CHARACTERS = REGISTRY.counter("pipecat_tts_characters_total", "Characters sent to TTS", ["processor", "model"])
+ACTIVE_SESSIONS = REGISTRY.gauge("pipecat_active_sessions", "Pipelines currently running")
+RING_TO_FIRST_AUDIO = REGISTRY.histogram(
+    "pipecat_ring_to_first_audio_seconds", "Incoming call to the bot's first audio", ["start"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0),
+)
+
+# Processor names carry a per-instance suffix ("CartesiaTTSService#12"); drop it
+# so the label space stays one entry per service type, however many calls ran.
+_INSTANCE_SUFFIX = re.compile(r"#\d+$")
+
+_server_lock = threading.Lock()
+_server_started = False
+
+
+class MetricsObserver(BaseObserver):
+    """Records every ``MetricsFrame`` once, at the processor that produced it."""
+
+    async def on_push_frame(self, data: FramePushed):
+        if not isinstance(data.frame, MetricsFrame):
+            return
+        source = data.source.name
+        for item in data.frame.data:
+            # A MetricsFrame is pushed again by every processor it passes through;
+            # only the push by the processor that measured it counts.
+            if item.processor != source:
+                continue
+            processor = _INSTANCE_SUFFIX.sub("", item.processor)
+            model = item.model or ""
+            if isinstance(item, TTFBMetricsData):
+                TTFB.labels(processor, model).observe(item.value)
+            elif isinstance(item, ProcessingMetricsData):
+                PROCESSING.labels(processor, model).observe(item.value)
+            elif isinstance(item, LLMUsageMetricsData):
+                LLM_TOKENS.labels(processor, model, "prompt").inc(item.value.prompt_tokens)
+                LLM_TOKENS.labels(processor, model, "completion").inc(item.value.completion_tokens)
+            elif isinstance(item, TTSUsageMetricsData):
+                TTS_CHARACTERS.labels(processor, model).inc(item.value)
+
+
+class FirstAudioObserver(BaseObserver):
+    """Records the time from ``started`` (a ``time.perf_counter()`` taken when the call came in) to the first bot audio.
+
+    ``start`` says whether the agent was pre-built ("warm") or built for this call ("cold").
+    """
+
+    def __init__(self, started: float, start: str = "cold", **kwargs):
+        super().__init__(**kwargs)
+        self._started = started
+        self._start = start
+        self.seconds: float | None = None
+
+    async def on_push_frame(self, data: FramePushed):
+        if self.seconds is None and isinstance(data.frame, BotStartedSpeakingFrame):
+            self.seconds = time.perf_counter() - self._started
+            RING_TO_FIRST_AUDIO.labels(self._start).observe(self.seconds)
+
+
+def serve_metrics(port: int | None = None):
+    """Start the ``/metrics`` endpoint unless it is already running or disabled."""
+    global _server_started
+    port = int(os.getenv("METRICS_PORT", DEFAULT_PORT)) if port is None else port
+    with _server_lock:
+        if _server_started or not port:
+            return
+        start_http_server(port)
+        _server_started = True
+
+
+@asynccontextmanager
+async def track_session():
+    """Count the enclosed pipeline run in ``pipecat_active_sessions``."""
+    ACTIVE_SESSIONS.inc()
+    try:
+        yield
+    finally:
+        ACTIVE_SESSIONS.dec()
@@ -0,0 +1,150 @@
+"""Agents built ahead of the calls that will use them.
+
+Building a Pipecat agent is slow compared to a phone ringing: it loads the
+VAD model, creates the STT/LLM/TTS services and opens the LLM's first
+HTTPS connection. Done per call, all of that sits between the ring and the
+greeting. :class:`AgentPool` builds ``size`` agents ahead of time and hands
+one out per call. A replacement starts building in the background each time.
+
+Agents are single use: the processors of a pipeline that has ended can't run
+again. So the pool only hands agents out and never takes them back. While an
+agent waits, ``warm(agent)`` runs every ``warm_every_s`` so its connections
+don't go stale. ``acquire()`` on an empty pool builds an agent on the spot
+(a miss), so a burst of calls is slower but never refused. Builds on the
+spot count toward ``size`` while they run, so a miss doesn't add a full
+refill on top of its own build; the pool tops up once it finishes.
+
+The pool lives as long as the process. It pays off when one process answers
+many calls, such as the runner's ``--dialin`` webhook server. It fills on the
+first call, or earlier with :meth:`AgentPool.start`.
+
+Metrics::
+
+    pipecat_pool_ready{pool}                  gauge    agents built and waiting
+    pipecat_pool_size{pool}                   gauge    target size
+    pipecat_pool_acquired_total{pool,result}  counter  hit / miss
+
+Usage::
+
+    agents = AgentPool(build_agent, size=2, warm=warm_agent)
+    agent = await agents.acquire()
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from loguru import logger
+
+from common.metrics import REGISTRY
+
+POOL_READY = REGISTRY.gauge("pipecat_pool_ready", "Pre-built agents waiting for a call", ["pool"])
+POOL_SIZE = REGISTRY.gauge("pipecat_pool_size", "Target number of pre-built agents", ["pool"])
+POOL_ACQUIRED = REGISTRY.counter("pipecat_pool_acquired_total", "Agents handed out, by whether one was ready", ["pool", "result"])
+
+T = TypeVar("T")
+
+
+class AgentPool(Generic[T]):
+    """Keeps ``size`` agents from ``build()`` ready; see the module docstring."""
+
+    def __init__(
+        self,
+        build: Callable[[], Awaitable[T]],
+        size: int = 2,
+        warm: Callable[[T], Awaitable[None]] | None = None,
+        warm_every_s: float = 60.0,
+        name: str = "agent",
+    ):
+        self.build = build
+        self.size = size
+        self.warm = warm
+        self.warm_every_s = warm_every_s
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._ready: list[T] = []
+        self._building: set[asyncio.Task] = set()
+        self._spot = 0  # agents being built on the spot for a miss; they count toward the target too
+        self._warm_task: asyncio.Task | None = None
+        self._closed = False
+        POOL_SIZE.labels(name).inc(size)
+
+    @property
+    def ready(self) -> int:
+        return len(self._ready)
+
+    async def start(self):
+        """Fill the pool; returns once every agent is built."""
+        self._refill()
+        await asyncio.gather(*self._building)
+        self._start_warming()
+
+    async def acquire(self) -> T:
+        """A ready agent, or a freshly built one when the pool is empty."""
+        self._start_warming()
+        if self._ready:
+            agent = self._ready.pop(0)
+            POOL_READY.labels(self.name).dec()
+            self.hits += 1
+            POOL_ACQUIRED.labels(self.name, "hit").inc()
+            self._refill()
+            return agent
+        self.misses += 1
+        POOL_ACQUIRED.labels(self.name, "miss").inc()
+        self._spot += 1
+        self._refill()
+        try:
+            return await self.build()
+        finally:
+            self._spot -= 1
+            self._refill()
+
+    async def close(self):
+        self._closed = True
+        if self._warm_task:
+            self._warm_task.cancel()
+        for task in list(self._building):
+            task.cancel()
+        await asyncio.gather(*self._building, return_exceptions=True)
+        POOL_READY.labels(self.name).dec(len(self._ready))
+        POOL_SIZE.labels(self.name).dec(self.size)
+        self._ready.clear()
+
+    async def _build_one(self):
+        agent = await self.build()
+        await self._warm(agent)
+        if not self._closed:
+            self._ready.append(agent)
+            POOL_READY.labels(self.name).inc()
+
+    def _refill(self):
+        for _ in range(self.size - len(self._ready) - len(self._building) - self._spot):
+            if self._closed:
+                return
+            task = asyncio.create_task(self._build_one())
+            self._building.add(task)
+            task.add_done_callback(self._built)
+
+    def _built(self, task: asyncio.Task):
+        self._building.discard(task)
+        if not task.cancelled() and task.exception():
+            # The next acquire() retries; until then calls build on the spot.
+            logger.warning(f"{self.name} pool: building an agent failed: {task.exception()}")
+
+    def _start_warming(self):
+        if self.warm and self._warm_task is None and not self._closed:
+            self._warm_task = asyncio.create_task(self._keep_warm())
+
+    async def _keep_warm(self):
+        while True:
+            await asyncio.sleep(self.warm_every_s)
+            for agent in list(self._ready):
+                await self._warm(agent)
+
+    async def _warm(self, agent: T):
+        if self.warm is None:
+            return
+        try:
+            await self.warm(agent)
+        except Exception as e:  # a failed ping leaves the agent usable; it connects on first use
+            logger.debug(f"{self.name} pool: warming failed: {e}")
@@ -0,0 +1,107 @@
+"""Keep a Pipecat phone call at the line's 8 kHz from end to end.
+
+Pipecat resamples wherever two neighbouring stages disagree on the sample
+rate. That happens inside the output transport, inside a TTS service whose
+provider answered at another rate, and in a serializer. On a phone call every
+rate other than 8 kHz is wasted work: the line carries 8 kHz, so the audio is
+converted up for a provider and back down for the caller.
+
+:func:`provider_rate` picks the rate to ask a provider for. It is the line
+rate when the provider supports it. Otherwise it is the lowest supported
+multiple of the line rate, which keeps the conversion an integer ratio. Pass
+the result as the service's ``sample_rate`` and the line rate as the
+pipeline's ``audio_in_sample_rate`` / ``audio_out_sample_rate``. With
+Deepgram and Cartesia, nothing is converted in Python at all.
+
+:class:`LineRateGuard` sits in front of ``transport.output()`` and enforces
+that. Audio at the line rate passes through untouched. Audio at any other
+rate is converted by a ``common.telephony_audio.PolyphaseResampler``, one per
+source rate, reset on interruptions. That covers a provider that ignores the
+requested format, or a swapped-in TTS without 8 kHz output. Each converted
+frame is counted, and the first one of each rate is logged, so a regression
+shows up on the dashboard instead of in the CPU bill::
+
+    pipecat_audio_resampled_frames_total{from_rate,to_rate}  counter
+
+Usage::
+
+    stt = DeepgramSTTService(api_key=..., sample_rate=provider_rate("deepgram"))
+    tts = CartesiaTTSService(api_key=..., voice_id=..., sample_rate=provider_rate("cartesia"))
+    pipeline = Pipeline([transport.input(), stt, ..., tts, LineRateGuard(), transport.output(), ...])
+    task = PipelineTask(pipeline, params=PipelineParams(audio_in_sample_rate=LINE_RATE, audio_out_sample_rate=LINE_RATE))
+"""
+
+from loguru import logger
+from pipecat.frames.frames import Frame, InterruptionFrame, OutputAudioRawFrame, StartFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from common.metrics import REGISTRY
+from common.telephony_audio import LINE_RATE, PolyphaseResampler
+
+# Raw 16-bit PCM rates each provider can stream; None means any rate.
+PROVIDER_RATES: dict[str, tuple[int, ...] | None] = {
+    "deepgram": None,
+    "cartesia": (8000, 16000, 22050, 24000, 44100, 48000),
+    "elevenlabs": (8000, 16000, 22050, 24000, 44100),
+    "openai": (24000,),
+}
+
+RESAMPLED = REGISTRY.counter(
+    "pipecat_audio_resampled_frames_total", "Output audio frames converted to the line rate", ["from_rate", "to_rate"]
+)
+
+
+def provider_rate(provider: str, line_rate: int = LINE_RATE) -> int:
+    """The sample rate to request from ``provider`` for a line at ``line_rate``."""
+    if provider not in PROVIDER_RATES:
+        raise ValueError(f"Unknown provider {provider!r}; known: {', '.join(PROVIDER_RATES)}")
+    rates = PROVIDER_RATES[provider]
+    if rates is None or line_rate in rates:
+        return line_rate
+    multiples = [rate for rate in rates if rate % line_rate == 0]
+    above = [rate for rate in rates if rate > line_rate]
+    return min(multiples or above or [max(rates)])
+
+
+class LineRateGuard(FrameProcessor):
+    """Converts output audio not at the line rate; see the module docstring.
+
+    ``sample_rate`` defaults to the pipeline's ``audio_out_sample_rate``.
+    """
+
+    def __init__(self, sample_rate: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._init_sample_rate = sample_rate
+        self._sample_rate = sample_rate or LINE_RATE
+        self._resamplers: dict[int, PolyphaseResampler] = {}
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, StartFrame):
+            self._sample_rate = self._init_sample_rate or frame.audio_out_sample_rate
+        elif isinstance(frame, InterruptionFrame):
+            for resampler in self._resamplers.values():
+                resampler.reset()
+        elif (
+            isinstance(frame, OutputAudioRawFrame)
+            and frame.sample_rate != self._sample_rate
+            and frame.num_channels == 1  # the transport handles anything else
+        ):
+            if not self._convert(frame):
+                return  # less than one output sample; it goes out with the next frame
+        await self.push_frame(frame, direction)
+
+    def _convert(self, frame: OutputAudioRawFrame) -> bool:
+        resampler = self._resamplers.get(frame.sample_rate)
+        if resampler is None:
+            logger.warning(
+                f"{self}: audio at {frame.sample_rate} Hz on a {self._sample_rate} Hz line, converting; "
+                f"request {self._sample_rate} Hz from the provider to skip this"
+            )
+            resampler = self._resamplers[frame.sample_rate] = PolyphaseResampler(frame.sample_rate, self._sample_rate)
+        RESAMPLED.labels(frame.sample_rate, self._sample_rate).inc()
+        # In place, so the frame keeps its id, timestamps and TTS context.
+        frame.audio = resampler.process(frame.audio)
+        frame.sample_rate = self._sample_rate
+        frame.num_frames = len(frame.audio) // 2
+        return bool(frame.audio)
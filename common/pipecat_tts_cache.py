@@ -0,0 +1,122 @@
+"""Serve repeated ``TTSSpeakFrame`` phrases from ``common.tts_cache``.
+
+Fixed phrases such as a greeting or a goodbye are pushed as ``TTSSpeakFrame``.
+:class:`CachedSpeech` sits in front of the TTS service. When the phrase is
+cached, it drops the frame and pushes the audio itself: ``TTSStartedFrame``,
+``TTSTextFrame``, ``TTSAudioRawFrame`` chunks, then ``TTSStoppedFrame``. The
+TTS service never sees the request, so there is no network round trip. On a
+miss the frame passes through as usual. ``speech.recorder``, placed after the
+TTS service, collects that utterance's audio by its context id and stores it
+once the TTS reports it stopped. An interrupted utterance is discarded, so
+the cache never holds partial audio.
+
+Only ``TTSSpeakFrame`` is cached. LLM output is different every turn and
+flows through untouched.
+
+Usage::
+
+    speech = CachedSpeech(tts, TTSCache(), provider="cartesia")
+    pipeline = Pipeline([transport.input(), stt, user_aggregator, llm,
+                         speech, tts, speech.recorder,
+                         transport.output(), assistant_aggregator])
+    await task.queue_frames([TTSSpeakFrame("Thanks for calling!")])
+"""
+
+import uuid
+
+from pipecat.frames.frames import (
+    AggregatedTextFrame,
+    AggregationType,
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InterruptionFrame,
+    TTSAudioRawFrame,
+    TTSSpeakFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TTSTextFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.tts_service import TTSService
+
+from common.tts_cache import CacheKey, TTSCache
+
+AUDIO_FORMAT = "pcm_s16le"  # what Pipecat TTS services push
+
+
+class CachedSpeech(FrameProcessor):
+    """Answers cached ``TTSSpeakFrame`` phrases in front of ``tts``; see the module docstring."""
+
+    def __init__(self, tts: TTSService, cache: TTSCache, provider: str, **kwargs):
+        super().__init__(**kwargs)
+        self._tts = tts
+        self._cache = cache
+        self._provider = provider
+        self._pending: dict[str, CacheKey] = {}  # text of misses on their way through the TTS
+        self.recorder = _SpeechRecorder(self)
+
+    def key(self, text: str) -> CacheKey:
+        # TTSService has no public voice getter; _voice_id follows set_voice().
+        return CacheKey(self._provider, self._tts.model_name, self._tts._voice_id, text, AUDIO_FORMAT, self._tts.sample_rate)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, TTSSpeakFrame) and direction == FrameDirection.DOWNSTREAM:
+            key = self.key(frame.text)
+            audio = self._cache.get(key)
+            if audio is not None:
+                await self._replay(frame, audio)
+                return
+            self._pending[frame.text] = key
+
+        await self.push_frame(frame, direction)
+
+    async def _replay(self, frame: TTSSpeakFrame, audio: memoryview):
+        context_id = str(uuid.uuid4())
+        await self.push_frame(TTSStartedFrame(context_id=context_id))
+        text = TTSTextFrame(frame.text, aggregated_by=AggregationType.SENTENCE, context_id=context_id)
+        text.skip_tts = True  # passes the TTS service untouched, still reaches the context aggregator
+        if frame.append_to_context is not None:
+            text.append_to_context = frame.append_to_context
+        await self.push_frame(text)
+        chunk = self._tts.chunk_size
+        for start in range(0, len(audio), chunk):
+            await self.push_frame(
+                TTSAudioRawFrame(
+                    audio=bytes(audio[start:start + chunk]),
+                    sample_rate=self._tts.sample_rate,
+                    num_channels=1,
+                    context_id=context_id,
+                )
+            )
+        await self.push_frame(TTSStoppedFrame(context_id=context_id))
+
+
+class _SpeechRecorder(FrameProcessor):
+    """Placed after the TTS service: stores the audio of phrases :class:`CachedSpeech` let through."""
+
+    def __init__(self, speech: CachedSpeech, **kwargs):
+        super().__init__(**kwargs)
+        self._speech = speech
+        self._recording: dict[str, tuple[CacheKey, bytearray]] = {}  # context id → key, audio so far
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        # The TTS service pushes the whole phrase as an AggregatedTextFrame, tagged with
+        # the context id its audio will carry, before synthesizing it.
+        if type(frame) is AggregatedTextFrame and frame.context_id:
+            key = self._speech._pending.pop(frame.text, None)
+            if key is not None:
+                self._recording[frame.context_id] = (key, bytearray())
+        elif isinstance(frame, TTSAudioRawFrame) and frame.context_id in self._recording:
+            self._recording[frame.context_id][1].extend(frame.audio)
+        elif isinstance(frame, TTSStoppedFrame) and frame.context_id in self._recording:
+            key, audio = self._recording.pop(frame.context_id)
+            self._speech._cache.put(key, audio)
+        elif isinstance(frame, (InterruptionFrame, EndFrame, CancelFrame)):
+            self._recording.clear()
+
+        await self.push_frame(frame, direction)
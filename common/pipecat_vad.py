@@ -0,0 +1,227 @@
+"""One Silero VAD model per process, shared by every call's pipeline.
+
+``SileroVADAnalyzer()`` loads its own copy of the Silero ONNX model and its
+own ONNX Runtime session, which costs memory and load time for every
+concurrent call. :class:`SharedSileroVAD` loads the model once. It runs each
+inference as a batch: windows from all streams that are waiting go through a
+single forward pass. The batches are self-clocking. With one call, a window
+runs as soon as it arrives. While a pass is running, new windows queue up and
+all of them go into the next pass. Under load, batches grow without adding a
+fixed wait.
+
+Silero is recurrent. Each stream keeps its own hidden state and audio
+context. The batch stacks them on the way in and splits them apart on the way
+out. A stream has at most one window in any batch, so its windows still run
+in order. Like Pipecat's analyzer, a stream's state is reset every 5 seconds.
+
+:class:`SharedSileroVADAnalyzer` is the per-call ``VADAnalyzer`` and is a
+drop-in replacement for ``SileroVADAnalyzer``. It holds only the stream's
+state and Pipecat's speech start/stop state machine. Its confidences come from
+the shared model. Inference runs on one background thread, off the event
+loop. The shared instance belongs to the event loop that first used it, which
+is the runner's loop in the agents.
+
+Usage::
+
+    user_params=LLMUserAggregatorParams(vad_analyzer=SharedSileroVADAnalyzer())
+
+``04-phone-agent/pipecat-phone/bench-vad.py`` compares memory per call and
+VAD latency with per-call analyzers at 1, 10 and 100 concurrent streams.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib import resources
+
+import numpy as np
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+SAMPLE_RATES = (8000, 16000)
+RESET_STATE_S = 5.0  # as pipecat.audio.vad.silero
+
+
+def window_samples(sample_rate: int) -> int:
+    return 512 if sample_rate == 16000 else 256
+
+
+def context_samples(sample_rate: int) -> int:
+    return 64 if sample_rate == 16000 else 32
+
+
+@dataclass
+class VADStream:
+    """One call's recurrent model state."""
+
+    state: np.ndarray = field(default_factory=lambda: np.zeros((2, 1, 128), dtype=np.float32))
+    context: np.ndarray | None = None  # the previous window's last samples
+    reset_at: float = 0.0
+
+    def reset(self):
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.context = None
+
+
+@dataclass
+class _Request:
+    stream: VADStream
+    windows: list[np.ndarray]  # float32, window_samples(sample_rate) each
+    sample_rate: int
+    future: asyncio.Future
+    confidences: list[float] = field(default_factory=list)
+
+
+class SharedSileroVAD:
+    """The Silero model and the batching loop; see the module docstring."""
+
+    def __init__(self, threads: int = 1, max_batch: int = 256):
+        self.threads = threads
+        self.max_batch = max_batch
+        self.batches = 0
+        self.windows = 0
+        self.load_seconds = 0.0
+        self._session = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="silero")
+        self._pending: deque[_Request] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def load(self):
+        """Load the model now rather than on the first window."""
+        with self._load_lock:
+            if self._session is not None:
+                return
+            import onnxruntime
+
+            started = time.perf_counter()
+            options = onnxruntime.SessionOptions()
+            options.inter_op_num_threads = 1
+            options.intra_op_num_threads = self.threads
+            model = resources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx")
+            self._session = onnxruntime.InferenceSession(
+                model.read_bytes(), providers=["CPUExecutionProvider"], sess_options=options
+            )
+            self.load_seconds = time.perf_counter() - started
+
+    async def infer(self, stream: VADStream, audio: bytes, sample_rate: int) -> list[float]:
+        """Voice confidence for each whole window of 16-bit ``audio``, in order."""
+        samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+        size = window_samples(sample_rate)
+        windows = [samples[i:i + size] for i in range(0, len(samples) - size + 1, size)]
+        if not windows:
+            return []
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_Request(stream, windows, sample_rate, future))
+        self._wakeup.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                batch = self._take_batch()
+                try:
+                    await loop.run_in_executor(self._executor, self._forward, batch)
+                except Exception as e:  # fail these calls' windows, keep serving the rest
+                    for request, _ in batch:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+                    self._pending = deque(r for r in self._pending if not r.future.done())
+                    continue
+                for request, _ in batch:
+                    if len(request.confidences) == len(request.windows) and not request.future.done():
+                        request.future.set_result(request.confidences)
+                self._pending = deque(r for r in self._pending if not r.future.done())
+
+    def _take_batch(self) -> list[tuple[_Request, np.ndarray]]:
+        """The next unprocessed window of up to ``max_batch`` streams – one per stream, so state stays ordered."""
+        batch, seen = [], set()
+        for request in self._pending:
+            if len(batch) == self.max_batch:
+                break
+            if id(request.stream) in seen or request.future.done():
+                continue
+            seen.add(id(request.stream))
+            batch.append((request, request.windows[len(request.confidences)]))
+        return batch
+
+    def _forward(self, batch: list[tuple[_Request, np.ndarray]]):
+        """Runs on the inference thread: one forward pass per sample rate in ``batch``."""
+        self.load()
+        for sample_rate in {request.sample_rate for request, _ in batch}:
+            group = [(request, window) for request, window in batch if request.sample_rate == sample_rate]
+            context = context_samples(sample_rate)
+            zeros = np.zeros(context, dtype=np.float32)
+            x = np.stack(
+                [
+                    np.concatenate((zeros if r.stream.context is None else r.stream.context, window))
+                    for r, window in group
+                ]
+            )
+            state = np.concatenate([r.stream.state for r, _ in group], axis=1)
+            out, state = self._session.run(None, {"input": x, "state": state, "sr": np.array(sample_rate, dtype=np.int64)})
+            now = time.time()
+            for i, (request, _) in enumerate(group):
+                stream = request.stream
+                stream.state = state[:, i:i + 1].copy()
+                stream.context = x[i, -context:].copy()
+                if now - stream.reset_at >= RESET_STATE_S:
+                    stream.reset()
+                    stream.reset_at = now
+                request.confidences.append(float(out[i][0]))
+            self.batches += 1
+            self.windows += len(group)
+
+
+_shared: SharedSileroVAD | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_vad() -> SharedSileroVAD:
+    """The process-wide :class:`SharedSileroVAD`."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedSileroVAD()
+        return _shared
+
+
+class SharedSileroVADAnalyzer(VADAnalyzer):
+    """Per-call Silero VAD backed by :func:`shared_vad`; a drop-in for ``SileroVADAnalyzer``."""
+
+    def __init__(self, *, sample_rate: int | None = None, params: VADParams | None = None, vad: SharedSileroVAD | None = None):
+        super().__init__(sample_rate=sample_rate, params=params)
+        self._vad = vad or shared_vad()
+        self._stream = VADStream()
+        self._confidences: deque[float] = deque()
+
+    def set_sample_rate(self, sample_rate: int):
+        if sample_rate not in SAMPLE_RATES:
+            raise ValueError(f"Silero VAD sample rate needs to be 16000 or 8000 (sample rate: {sample_rate})")
+        super().set_sample_rate(sample_rate)
+
+    def num_frames_required(self) -> int:
+        return window_samples(self.sample_rate)
+
+    def voice_confidence(self, buffer: bytes) -> float:
+        # Called by VADAnalyzer._run_analyzer once per window, after analyze_audio
+        # has fetched that window's confidence from the shared model.
+        return self._confidences.popleft() if self._confidences else 0.0
+
+    async def analyze_audio(self, buffer: bytes) -> VADState:
+        size = self._vad_frames_num_bytes
+        whole = (len(self._vad_buffer) + len(buffer)) // size * size
+        if whole:
+            audio = (self._vad_buffer + buffer)[:whole]
+            self._confidences.extend(await self._vad.infer(self._stream, audio, self.sample_rate))
+        # The speech start/stop state machine is Pipecat's own; it's cheap enough to run inline.
+        return self._run_analyzer(buffer)
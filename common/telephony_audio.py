@@ -0,0 +1,202 @@
+"""G.711 codecs and a streaming resampler for 8 kHz phone audio, in NumPy.
+
+The phone network carries 8 kHz audio, μ-law (North America, Japan) or
+A-law (everywhere else). Converting it means two steps per 20 ms frame: the
+codec and, when a provider works at another rate, a resample. Pipecat uses
+``audioop`` for the codec, and ``audioop`` is gone from the standard
+library as of Python 3.13. It uses a ``soxr`` stream for the resample.
+
+Codecs: every 8-bit code maps to one 16-bit sample, and every 16-bit sample
+maps to one code. Decoding takes from a 256-entry table and encoding from a
+65,536-entry table. The tables are built once from the G.711 segment rules
+and match ``audioop`` bit for bit.
+
+:class:`PolyphaseResampler` converts between two fixed rates in a running
+stream. The ratio is reduced to ``up / down`` (8 → 16 kHz is 2/1, 24 → 8 kHz
+is 1/3). A windowed-sinc low-pass is split into ``up`` phases, and each output
+sample is one phase's dot product with the input just before it. Per phase
+that is one matrix-vector product over a strided view of the input buffer,
+so the input is never copied into windows. The last
+input samples carry over to the next call, so frame boundaries are seamless.
+Buffers are allocated once and grow to the largest frame seen. Each call
+copies the frame in, computes, and returns new ``bytes``. Input that doesn't
+fill a whole block of ``down`` samples waits for the next call. That wait is
+under one sample at the output rate.
+
+Usage::
+
+    pcm = ulaw_decode(payload)                       # μ-law bytes → 16-bit PCM
+    to_stt = PolyphaseResampler(8000, 16000)
+    stt_audio = to_stt.process(pcm)
+
+``04-phone-agent/pipecat-phone/bench-audio.py`` measures CPU per call-minute
+against Pipecat's ``audioop`` + ``soxr`` path. On 20 ms frames NumPy's
+per-call overhead makes these 1.3–1.5× slower than those C libraries. The
+large saving is converting nothing: see ``common.pipecat_telephony``.
+"""
+
+import math
+
+import numpy as np
+
+LINE_RATE = 8000  # G.711
+
+
+def _ulaw_encode_table() -> np.ndarray:
+    pcm = np.arange(-32768, 32768, dtype=np.int32) >> 2  # 14-bit
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(pcm), 8159) + (0x84 >> 2)
+    segment = np.searchsorted(np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF]), magnitude)
+    code = (np.minimum(segment, 7) << 4) | ((magnitude >> (np.minimum(segment, 7) + 1)) & 0xF)
+    code = np.where(segment >= 8, 0x7F, code) ^ mask
+    return _by_unsigned(code.astype(np.uint8))
+
+
+def _ulaw_decode_table() -> np.ndarray:
+    code = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = (((code & 0xF) << 3) + 0x84) << ((code & 0x70) >> 4)
+    return np.where(code & 0x80, 0x84 - magnitude, magnitude - 0x84).astype(np.int16)
+
+
+def _alaw_encode_table() -> np.ndarray:
+    pcm = np.arange(-32768, 32768, dtype=np.int32) >> 3  # 13-bit
+    mask = np.where(pcm >= 0, 0xD5, 0x55)
+    magnitude = np.where(pcm >= 0, pcm, -pcm - 1)
+    segment = np.searchsorted(np.array([0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF]), magnitude)
+    shift = np.where(segment < 2, 1, np.minimum(segment, 7))
+    code = (np.minimum(segment, 7) << 4) | ((magnitude >> shift) & 0xF)
+    code = np.where(segment >= 8, 0x7F, code) ^ mask
+    return _by_unsigned(code.astype(np.uint8))
+
+
+def _alaw_decode_table() -> np.ndarray:
+    code = np.arange(256, dtype=np.int32) ^ 0x55
+    segment = (code & 0x70) >> 4
+    magnitude = (code & 0xF) << 4
+    magnitude = np.where(segment == 0, magnitude + 8, (magnitude + 0x108) << np.maximum(segment - 1, 0))
+    return np.where(code & 0x80, magnitude, -magnitude).astype(np.int16)
+
+
+def _by_unsigned(table: np.ndarray) -> np.ndarray:
+    """Reorder a table built for samples -32768…32767 so a sample's uint16 view indexes it."""
+    return np.roll(table, -32768)
+
+
+_ULAW_ENCODE = _ulaw_encode_table()
+_ULAW_DECODE = _ulaw_decode_table()
+_ALAW_ENCODE = _alaw_encode_table()
+_ALAW_DECODE = _alaw_decode_table()
+
+
+def ulaw_decode(data: bytes) -> bytes:
+    """μ-law → 16-bit PCM, the same as ``audioop.ulaw2lin(data, 2)``."""
+    return _ULAW_DECODE.take(np.frombuffer(data, dtype=np.uint8)).tobytes()
+
+
+def ulaw_encode(pcm: bytes) -> bytes:
+    """16-bit PCM → μ-law, the same as ``audioop.lin2ulaw(pcm, 2)``."""
+    return _ULAW_ENCODE.take(np.frombuffer(pcm, dtype=np.uint16)).tobytes()
+
+
+def alaw_decode(data: bytes) -> bytes:
+    """A-law → 16-bit PCM, the same as ``audioop.alaw2lin(data, 2)``."""
+    return _ALAW_DECODE.take(np.frombuffer(data, dtype=np.uint8)).tobytes()
+
+
+def alaw_encode(pcm: bytes) -> bytes:
+    """16-bit PCM → A-law, the same as ``audioop.lin2alaw(pcm, 2)``."""
+    return _ALAW_ENCODE.take(np.frombuffer(pcm, dtype=np.uint16)).tobytes()
+
+
+class PolyphaseResampler:
+    """Streaming 16-bit mono resampler for one fixed ``in_rate`` → ``out_rate``; see the module docstring."""
+
+    def __init__(self, in_rate: int, out_rate: int, zero_crossings: int = 8, rolloff: float = 0.9, beta: float = 8.0):
+        g = math.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        # Taps per phase: enough for ``zero_crossings`` lobes of the sinc on each side at the lower rate.
+        self.taps = math.ceil(2 * zero_crossings * max(self.up, self.down) / self.up)
+        length = self.taps * self.up
+        cutoff = rolloff / (2 * max(self.up, self.down))  # of the upsampled rate
+        n = np.arange(length) - (length - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta) * self.up
+        # Output j = b * up + r of block b uses filter phase (r * down) % up, on the
+        # ``taps`` inputs ending at b * down + offset[r]. Each phase's taps are reversed
+        # so they line up with a window of ascending input samples.
+        phases = h.reshape(self.taps, self.up).T[:, ::-1]
+        r = np.arange(self.up)
+        self._coefs = np.ascontiguousarray(phases[(r * self.down) % self.up], dtype=np.float32)
+        self._offsets = (r * self.down) // self.up
+        self._blocks = 0  # capacity of the buffers below, in blocks of ``down`` inputs
+        self._buffers: list[np.ndarray] = []
+        self._current = 0
+        self._pending = 0  # input samples after the history in the current buffer
+        self._grow(1)
+
+    def process(self, pcm: bytes) -> bytes:
+        """Resample the next chunk of the stream."""
+        if self.up == self.down:
+            return pcm
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        history = self.taps - 1
+        if (self._pending + len(samples)) // self.down > self._blocks:
+            self._grow((self._pending + len(samples)) // self.down)
+        buf = self._buffers[self._current]
+        start = history + self._pending
+        np.copyto(buf[start:start + len(samples)], samples, casting="unsafe")
+        self._pending += len(samples)
+
+        blocks = self._pending // self.down
+        if blocks:
+            # One matrix-vector product per phase, on a strided view of the buffer: no copies.
+            windows = self._windows[self._current]
+            for r in range(self.up):
+                np.dot(windows[r][:blocks], self._coefs[r], out=self._y[r, :blocks])
+            y = self._y[:, :blocks]
+            np.rint(y, out=y)
+            np.minimum(y, 32767, out=y)
+            np.maximum(y, -32768, out=y)
+            out = self._out[:blocks]
+            np.copyto(out, y.T, casting="unsafe")  # interleaves the phases back into time order
+            result = out.tobytes()
+        else:
+            result = b""
+
+        # Carry the history and any partial block over, into the other buffer so the copy never overlaps.
+        consumed = blocks * self.down
+        keep = history + self._pending - consumed
+        np.copyto(self._buffers[1 - self._current][:keep], buf[consumed:consumed + keep])
+        self._current = 1 - self._current
+        self._pending -= consumed
+        return result
+
+    def reset(self):
+        """Forget the stream, e.g. between utterances."""
+        for buf in self._buffers:
+            buf.fill(0)
+        self._pending = 0
+
+    def _grow(self, blocks: int):
+        """Size the buffers for ``blocks`` blocks per call; done rarely."""
+        blocks = max(blocks, 2 * self._blocks)
+        history = self.taps - 1
+        size = history + (blocks + 1) * self.down
+        old = self._buffers[self._current][:history + self._pending] if self._buffers else None
+        self._buffers = [np.zeros(size, dtype=np.float32), np.zeros(size, dtype=np.float32)]
+        if old is not None:
+            self._buffers[0][:len(old)] = old
+        self._current = 0
+        step = self._buffers[0].strides[0]
+        self._windows = [
+            [
+                np.lib.stride_tricks.as_strided(buf[offset:], shape=(blocks, self.taps), strides=(self.down * step, step), writeable=False)
+                for offset in self._offsets
+            ]
+            for buf in self._buffers
+        ]
+        self._y = np.empty((self.up, blocks), dtype=np.float32)
+        self._out = np.empty((blocks, self.up), dtype=np.int16)
+        self._blocks = blocks
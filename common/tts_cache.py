@@ -0,0 +1,170 @@
+"""Content-addressed cache of synthesized speech for phrases an agent repeats.
+
+Greetings, ``firstMessage`` and ``endCallMessage`` strings are spoken thousands
+of times a day, and the audio is identical every time. :class:`TTSCache` stores
+the PCM once. Later requests are served without calling the provider.
+
+An entry's name is the SHA-256 of its :class:`CacheKey`. The key holds
+everything that changes the audio: provider, model, voice, text, format and
+sample rate. There are two tiers:
+
+    - memory: an LRU bounded by ``memory_bytes``, checked first.
+    - disk: one raw PCM file per entry under ``directory``. It defaults to
+      ``TTS_CACHE_DIR`` or ``~/.cache/voice-agents/tts``. Hits are
+      memory-mapped rather than read, so their pages come from the OS page
+      cache and are shared by every process using the directory. The mapping
+      itself is promoted into the memory tier.
+
+Files are written under a temporary name and then renamed, so a concurrent
+reader never sees a partial entry. A synthesis that fails or is abandoned
+part-way is never stored.
+
+Usage::
+
+    cache = TTSCache()
+    key = CacheKey("cartesia", "sonic-3", voice_id, text, "pcm_s16le", 44100)
+    async for chunk in cache.astream(key, lambda: client.tts.bytes(...)):  # the provider is only called on a miss
+        player.write(chunk)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, NamedTuple
+
+DEFAULT_DIR = Path.home() / ".cache" / "voice-agents" / "tts"
+DEFAULT_MEMORY_BYTES = 64 * 2**20
+
+
+class CacheKey(NamedTuple):
+    provider: str
+    model: str
+    voice_id: str
+    text: str
+    format: str  # e.g. "pcm_s16le"
+    sample_rate: int
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self, ensure_ascii=False).encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    disk_errors: int = 0
+
+
+class TTSCache:
+    """Thread-safe two-tier (memory LRU + memory-mapped files) cache of synthesized audio."""
+
+    def __init__(self, directory: str | Path | None = None, memory_bytes: int = DEFAULT_MEMORY_BYTES, disk: bool = True):
+        self.directory = Path(directory or os.getenv("TTS_CACHE_DIR") or DEFAULT_DIR).expanduser() if disk else None
+        self.memory_bytes = memory_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, bytes | mmap.mmap] = OrderedDict()  # least recently used first
+        self._memory_used = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> memoryview | None:
+        """The cached audio for ``key``, or ``None``. Never touches the network."""
+        digest = key.digest()
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                self.stats.memory_hits += 1
+                return memoryview(entry)
+
+        mapped = self._map(digest)
+        with self._lock:
+            if mapped is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._remember(digest, mapped)
+        return memoryview(mapped)
+
+    def put(self, key: CacheKey, pcm: bytes | bytearray | memoryview):
+        if not pcm:
+            return
+        digest = key.digest()
+        audio = bytes(pcm)
+        with self._lock:
+            self._remember(digest, audio)
+            self.stats.stores += 1
+        if self.directory is None:
+            return
+        path = self._path(digest)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(audio)
+            os.replace(tmp, path)
+        except OSError:  # a full or read-only disk costs the disk tier, not the call
+            tmp.unlink(missing_ok=True)
+            with self._lock:
+                self.stats.disk_errors += 1
+
+    def stream(self, key: CacheKey, synthesize: Callable[[], Iterable[bytes]]) -> Iterator[bytes]:
+        """Yield the cached audio, or ``synthesize()``'s chunks as they arrive – stored once complete."""
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+        audio = bytearray()
+        for chunk in synthesize():
+            audio += chunk
+            yield chunk
+        self.put(key, audio)
+
+    async def astream(self, key: CacheKey, synthesize: Callable[[], AsyncIterable[bytes]]) -> AsyncIterator[bytes]:
+        """:meth:`stream` for an async provider."""
+        cached = self.get(key)
+        if cached is not None:
+            yield cached
+            return
+        audio = bytearray()
+        async for chunk in synthesize():
+            audio += chunk
+            yield chunk
+        self.put(key, audio)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}.pcm"
+
+    def _map(self, digest: str) -> mmap.mmap | None:
+        if self.directory is None:
+            return None
+        try:
+            with self._path(digest).open("rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # ValueError: an empty file can't be mapped
+            return None
+        except OSError:  # unreadable file or disk: costs the disk tier, not the call
+            with self._lock:
+                self.stats.disk_errors += 1
+            return None
+
+    def _remember(self, digest: str, audio: bytes | mmap.mmap):
+        """Add to the memory tier, evicting least recently used entries over budget. Caller holds the lock."""
+        size = len(audio)
+        if size > self.memory_bytes:
+            return
+        previous = self._memory.pop(digest, None)
+        if previous is not None:
+            self._memory_used -= len(previous)
+        self._memory[digest] = audio
+        self._memory_used += size
+        while self._memory_used > self.memory_bytes:
+            # Evicted mappings aren't closed here: a caller may still hold a view.
+            # They are unmapped once the last reference goes.
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
@@ -0,0 +1,241 @@
+"""Local stand-in for Deepgram's live transcription websocket.
+
+Speaks enough of ``wss://api.deepgram.com/v1/listen`` for the streaming demo
+to run without a network or an API key: it accepts binary audio frames and
+the ``KeepAlive`` / ``Finalize`` / ``CloseStream`` control messages, and
+answers with ``Results`` messages in Deepgram's format. There's no
+recognizer – the "transcript" describes what arrived (audio seconds,
+message count), which is what you want to see when tuning the sender:
+
+    - interim results every ``interim_s`` seconds of audio, finals every
+      ``final_s`` and on ``Finalize``; each result is delivered after the
+      shaping's latency and jitter, without holding up the audio being read,
+    - like Deepgram, the connection is closed if nothing (audio or
+      KeepAlive) arrives for ``idle_timeout_s`` seconds,
+    - when a stream ends, a summary of its send pattern is logged: messages,
+      mean chunk size, keepalives and the longest gap between messages.
+
+The SDK reaches it through ``DEEPGRAM_HOST=http://127.0.0.1:8081``; started
+by ``serve.py``.
+"""
+
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+from common.eventlog import get_logger
+
+from shaping import Shaping
+
+log = get_logger("mock-deepgram")
+
+PORT = 8081
+MODEL_INFO = {"name": "stand-in", "version": "0", "arch": "stand-in"}
+
+
+class ListenSession:
+    """One ``/v1/listen`` stream: counts what arrives and produces Results messages."""
+
+    def __init__(self, params: dict[str, str], interim_s: float, final_s: float):
+        self.request_id = str(uuid.uuid4())
+        self.sample_rate = int(params.get("sample_rate", 16000))
+        self.channels = int(params.get("channels", 1))
+        self.interim = params.get("interim_results", "false").lower() == "true"
+        self.interim_s = interim_s
+        self.final_s = final_s
+        self.opened_at = time.perf_counter()
+        self.last_message_at = self.opened_at
+        self.max_gap = 0.0
+        self.messages = 0
+        self.audio_bytes = 0
+        self.keepalives = 0
+        self.finals = 0
+        self._segment_start = 0.0  # audio seconds
+        self._segment_messages = 0
+        self._next_interim = interim_s
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.audio_bytes / (self.sample_rate * 2 * self.channels)  # linear16
+
+    def touch(self):
+        now = time.perf_counter()
+        self.max_gap = max(self.max_gap, now - self.last_message_at)
+        self.last_message_at = now
+
+    def audio(self, size: int) -> dict | None:
+        self.messages += 1
+        self.audio_bytes += size
+        self._segment_messages += 1
+        position = self.audio_seconds
+        if position - self._segment_start >= self.final_s:
+            return self.final(from_finalize=False)
+        if self.interim and position - self._segment_start >= self._next_interim:
+            self._next_interim += self.interim_s
+            return self._result(is_final=False)
+        return None
+
+    def final(self, from_finalize: bool) -> dict:
+        message = self._result(is_final=True, from_finalize=from_finalize)
+        self.finals += 1
+        self._segment_start = self.audio_seconds
+        self._segment_messages = 0
+        self._next_interim = self.interim_s
+        return message
+
+    def has_pending_audio(self) -> bool:
+        return self.audio_seconds > self._segment_start
+
+    def metadata(self) -> dict:
+        return {
+            "type": "Metadata",
+            "transaction_key": "deprecated",
+            "request_id": self.request_id,
+            "sha256": "",
+            "created": datetime.now(timezone.utc).isoformat(),
+            "duration": self.audio_seconds,
+            "channels": self.channels,
+            "models": [],
+            "model_info": {},
+        }
+
+    def _result(self, is_final: bool, from_finalize: bool = False) -> dict:
+        start, end = self._segment_start, self.audio_seconds
+        transcript = f"{end - start:.2f} seconds of audio in {self._segment_messages} messages"
+        return {
+            "type": "Results",
+            "channel_index": [0, self.channels],
+            "duration": end - start,
+            "start": start,
+            "is_final": is_final,
+            "speech_final": is_final,
+            "from_finalize": from_finalize,
+            "channel": {"alternatives": [{"transcript": transcript, "confidence": 1.0, "words": []}]},
+            "metadata": {"request_id": self.request_id, "model_info": MODEL_INFO, "model_uuid": self.request_id},
+        }
+
+
+class ResultSender:
+    """Delivers messages in order, each no earlier than its shaped due time."""
+
+    def __init__(self, websocket: ServerConnection, shaping: Shaping, request: int):
+        self._websocket = websocket
+        self._shaping = shaping
+        self._rng = shaping.rng(request)
+        self._queue: asyncio.Queue[tuple[float, dict] | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def put(self, message: dict):
+        self._queue.put_nowait((time.perf_counter() + self._shaping.first_delay(self._rng), message))
+
+    async def drain(self):
+        """Deliver everything queued so far, then stop."""
+        self._queue.put_nowait(None)
+        await self._task
+
+    async def _run(self):
+        try:
+            while (item := await self._queue.get()) is not None:
+                due, message = item
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await self._websocket.send(json.dumps(message))
+        except ConnectionClosed:
+            pass
+
+
+async def handle(websocket: ServerConnection, shaping: Shaping, request: int, interim_s: float, final_s: float, idle_timeout_s: float):
+    url = urlsplit(websocket.request.path)
+    if url.path.rstrip("/") != "/v1/listen":
+        await websocket.close(1008, f"unknown endpoint {url.path}")
+        return
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    session = ListenSession(params, interim_s, final_s)
+    results = ResultSender(websocket, shaping, request)
+    log.info("opened", "[green]▶ stream[/] [dim]{request_id}[/] {sample_rate} Hz", request_id=session.request_id, sample_rate=session.sample_rate)
+
+    reason = "closed by client"
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.recv(), timeout=idle_timeout_s)
+            except TimeoutError:
+                reason = f"no audio or KeepAlive for {idle_timeout_s:.0f} s"
+                await results.drain()
+                await websocket.close(1011, "NET-0001: did not receive audio data or a text message within the timeout window")
+                break
+            session.touch()
+
+            if isinstance(message, bytes):
+                if (result := session.audio(len(message))) is not None:
+                    results.put(result)
+                continue
+
+            try:
+                control = json.loads(message)
+            except json.JSONDecodeError:
+                control = None
+            if not isinstance(control, dict):
+                # Deepgram closes the stream on a text frame it can't parse.
+                reason = "invalid text message"
+                await results.drain()
+                await websocket.close(1008, "DATA-0000: text messages must be JSON objects")
+                break
+            control = control.get("type")
+            if control == "KeepAlive":
+                session.keepalives += 1
+            elif control == "Finalize":
+                if session.has_pending_audio():
+                    results.put(session.final(from_finalize=True))
+            elif control == "CloseStream":
+                if session.has_pending_audio():
+                    results.put(session.final(from_finalize=False))
+                results.put(session.metadata())
+                await results.drain()
+                await websocket.close()
+                break
+    except ConnectionClosed:
+        pass
+    finally:
+        await results.drain()
+
+    elapsed = time.perf_counter() - session.opened_at
+    log.info(
+        "stream-summary",
+        "[bold]■ stream[/] [dim]{request_id}[/] {reason}: {audio_s:.1f} s audio in {messages} messages "
+        "(mean {mean_chunk_ms:.0f} ms, {rate:.1f}/s), {keepalives} keepalives, longest gap {max_gap_ms:,.0f} ms",
+        request_id=session.request_id,
+        reason=reason,
+        audio_s=session.audio_seconds,
+        messages=session.messages,
+        mean_chunk_ms=session.audio_seconds / max(session.messages, 1) * 1000,
+        rate=session.messages / max(elapsed, 1e-9),
+        keepalives=session.keepalives,
+        max_gap_ms=session.max_gap * 1000,
+        finals=session.finals,
+    )
+
+
+async def serve_deepgram(
+    host: str,
+    port: int,
+    shaping: Shaping,
+    interim_s: float = 0.5,
+    final_s: float = 3.0,
+    idle_timeout_s: float = 10.0,
+):
+    """Serve ``/v1/listen`` until cancelled."""
+    requests = itertools.count()
+
+    async def handler(websocket: ServerConnection):
+        await handle(websocket, shaping, next(requests), interim_s, final_s, idle_timeout_s)
+
+    async with serve(handler, host, port) as server:
+        log.info("listening", "[bold green]Mock Deepgram on ws://{host}:{port}/v1/listen[/]", host=host, port=port)
+        await server.serve_forever()
@@ -0,0 +1,291 @@
+"""Local stand-in for the Cartesia and ElevenLabs HTTP TTS endpoints.
+
+One HTTP server answers both providers' streaming synthesis requests:
+
+    POST /tts/bytes                              Cartesia (``client.tts.bytes``)
+    POST /v1/text-to-speech/<voice_id>[/stream]  ElevenLabs (``text_to_speech.convert`` / ``stream``)
+    GET  /, /v1/models                           health checks (``common/clients.py``)
+
+Requests are checked the way the SDKs send them (API key header, transcript,
+output format) and answered with a chunked audio stream shaped by
+:class:`shaping.Shaping`: the first chunk after the latency, the rest at
+``speed`` times real time, ``chunk_ms`` of audio each.
+
+The audio is a short tone per word, ``1 / chars_per_second`` seconds per
+character – about the length real speech would have, so duration and
+real-time factor come out realistic. Containers and encodings:
+
+    - raw / WAV: ``pcm_s16le``, ``pcm_f32le``, ``pcm_mulaw``; any sample rate,
+    - MP3 (MPEG-1 Layer III, 32/44.1/48 kHz): valid, silent frames – enough for
+      players and decoders, without an encoder dependency.
+
+Anything else (A-law, Opus, …) is rejected with a 400, as an unknown format
+would be by the real API.
+
+The SDKs reach it through ``CARTESIA_BASE_URL`` / ``ELEVENLABS_BASE_URL``
+set to ``http://127.0.0.1:8082``; started by ``serve.py``.
+"""
+
+import itertools
+import json
+import math
+import re
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from common.eventlog import get_logger
+
+from shaping import Shaping
+
+log = get_logger("mock-tts")
+
+PORT = 8082
+CHARS_PER_SECOND = 15.0  # roughly conversational speech
+WORD_GAP_S = 0.06
+
+MP3_BITRATES = (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)  # MPEG-1 Layer III, kbit/s
+MP3_SAMPLE_RATES = {44100: 0, 48000: 1, 32000: 2}
+MP3_FRAME_SAMPLES = 1152
+
+ELEVENLABS_PATH = re.compile(r"/v1/text-to-speech/([^/]+)(/stream)?")
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    container: str  # raw | wav | mp3
+    encoding: str  # pcm_s16le | pcm_f32le | pcm_mulaw; unused for mp3
+    sample_rate: int
+    bit_rate: int = 128_000  # mp3 only
+
+    @property
+    def content_type(self) -> str:
+        return {"wav": "audio/wav", "mp3": "audio/mpeg"}.get(self.container, "application/octet-stream")
+
+    def validate(self):
+        if self.container == "mp3":
+            if self.sample_rate not in MP3_SAMPLE_RATES or self.bit_rate // 1000 not in MP3_BITRATES:
+                raise ValueError(f"mock supports MP3 at {sorted(MP3_SAMPLE_RATES)} Hz and {MP3_BITRATES} kbps")
+        elif self.container not in ("raw", "wav"):
+            raise ValueError(f"unsupported container {self.container!r}")
+        elif self.encoding not in SAMPLE_ENCODERS:
+            raise ValueError(f"unsupported encoding {self.encoding!r}; mock supports {', '.join(SAMPLE_ENCODERS)}")
+        if not 4000 <= self.sample_rate <= 48000:
+            raise ValueError(f"unsupported sample rate {self.sample_rate}")
+
+
+def cartesia_format(output_format: dict) -> AudioFormat:
+    return AudioFormat(
+        container=output_format.get("container", "raw"),
+        encoding=output_format.get("encoding", "pcm_f32le"),
+        sample_rate=int(output_format["sample_rate"]),
+        bit_rate=int(output_format.get("bit_rate", 128_000)),
+    )
+
+
+def elevenlabs_format(name: str) -> AudioFormat:
+    """``mp3_44100_128``, ``pcm_24000``, ``ulaw_8000``, … as an :class:`AudioFormat`."""
+    codec, _, rest = name.partition("_")
+    parts = rest.split("_")
+    if codec == "mp3" and len(parts) == 2:
+        return AudioFormat("mp3", "", int(parts[0]), int(parts[1]) * 1000)
+    if codec in ("pcm", "ulaw") and len(parts) == 1:
+        return AudioFormat("raw", "pcm_s16le" if codec == "pcm" else "pcm_mulaw", int(parts[0]))
+    raise ValueError(f"unsupported output_format {name!r}")
+
+
+def synthesize(text: str, sample_rate: int, chars_per_second: float = CHARS_PER_SECOND) -> np.ndarray:
+    """A tone per word, sized like speech of ``text`` would be; float32 in [-1, 1]."""
+    pieces = []
+    fade = int(0.005 * sample_rate)
+    for index, word in enumerate(text.split()):
+        t = np.arange(int(len(word) / chars_per_second * sample_rate)) / sample_rate
+        tone = 0.2 * np.sin(2 * np.pi * (180 + 40 * (index % 4)) * t)
+        if len(tone) > 2 * fade:
+            ramp = np.linspace(0.0, 1.0, fade)
+            tone[:fade] *= ramp
+            tone[-fade:] *= ramp[::-1]
+        pieces += [tone, np.zeros(int(WORD_GAP_S * sample_rate))]
+    return np.concatenate(pieces).astype(np.float32) if pieces else np.zeros(0, np.float32)
+
+
+def _mulaw(audio: np.ndarray) -> bytes:
+    """G.711 μ-law, sign/exponent/mantissa from 16-bit samples."""
+    samples = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int32)
+    sign = np.where(samples < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(samples), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+
+SAMPLE_ENCODERS = {
+    "pcm_s16le": (2, 1, lambda audio: (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()),
+    "pcm_f32le": (4, 3, lambda audio: audio.astype("<f4").tobytes()),
+    "pcm_mulaw": (1, 7, _mulaw),
+}  # encoding → (bytes per sample, WAV format tag, encoder)
+
+
+def wav_header(fmt: AudioFormat, data_bytes: int) -> bytes:
+    width, tag, _ = SAMPLE_ENCODERS[fmt.encoding]
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, tag, 1, fmt.sample_rate, fmt.sample_rate * width, width, width * 8)
+        + b"data" + struct.pack("<I", data_bytes)
+    )
+
+
+def silent_mp3_frames(seconds: float, sample_rate: int, bit_rate: int) -> Iterator[bytes]:
+    """Mono MPEG-1 Layer III frames with empty side info – each decodes to 1152 samples of silence."""
+    kbps = bit_rate // 1000
+    frame_bytes, remainder = divmod(144 * bit_rate, sample_rate)
+    header = bytes((0xFF, 0xFB, (MP3_BITRATES.index(kbps) + 1) << 4 | MP3_SAMPLE_RATES[sample_rate] << 2, 0xC0))
+    owed = 0
+    for _ in range(math.ceil(seconds * sample_rate / MP3_FRAME_SAMPLES)):
+        owed += remainder
+        padding = owed >= sample_rate  # a padding byte now and then keeps the average bitrate exact
+        if padding:
+            owed -= sample_rate
+        yield bytes((*header[:2], header[2] | padding << 1, header[3])) + bytes(frame_bytes + padding - 4)
+
+
+def encode_chunks(text: str, fmt: AudioFormat, chunk_ms: float) -> tuple[list[bytes], float]:
+    """The response body split into ``chunk_ms`` pieces of audio, and its duration."""
+    if fmt.container == "mp3":
+        seconds = len(synthesize(text, fmt.sample_rate)) / fmt.sample_rate
+        frames = list(silent_mp3_frames(seconds, fmt.sample_rate, fmt.bit_rate))
+        per_chunk = max(1, round(chunk_ms / 1000 * fmt.sample_rate / MP3_FRAME_SAMPLES))
+        chunks = [b"".join(frames[i:i + per_chunk]) for i in range(0, len(frames), per_chunk)]
+        return chunks, len(frames) * MP3_FRAME_SAMPLES / fmt.sample_rate
+
+    audio = synthesize(text, fmt.sample_rate)
+    width, _, encode = SAMPLE_ENCODERS[fmt.encoding]
+    data = encode(audio)
+    step = max(1, int(chunk_ms / 1000 * fmt.sample_rate)) * width
+    chunks = [data[i:i + step] for i in range(0, len(data), step)]
+    if fmt.container == "wav":
+        # The header travels with the first audio, so it doesn't count as the first byte on its own.
+        chunks[:1] = [wav_header(fmt, len(data)) + b"".join(chunks[:1])]
+    return chunks, len(audio) / fmt.sample_rate
+
+
+class MockTTSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # SDK clients keep connections open between requests
+
+    def do_GET(self):
+        # Health checks (common/clients.py); any other GET is unknown.
+        if urlsplit(self.path).path in ("/", "/v1/models"):
+            self._send_json(200, {"ok": True, "mock": True})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "body is not JSON"})
+            return
+        if not isinstance(body, dict):
+            self._send_json(400, {"error": "body is not a JSON object"})
+            return
+
+        if url.path == "/tts/bytes":
+            provider, key, text = "cartesia", self.headers.get("X-API-Key") or self.headers.get("Authorization"), body.get("transcript")
+            parse_format, spec = cartesia_format, body.get("output_format") or {}
+        elif ELEVENLABS_PATH.fullmatch(url.path):
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            provider, key, text = "elevenlabs", self.headers.get("xi-api-key"), body.get("text")
+            parse_format, spec = elevenlabs_format, query.get("output_format", "mp3_44100_128")
+        else:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        if not key:
+            self._send_json(401, {"error": "missing API key"})
+            return
+        if not text:
+            self._send_json(400, {"error": "no text to synthesize"})
+            return
+        try:
+            fmt = parse_format(spec)
+            fmt.validate()
+        except (KeyError, ValueError) as e:
+            self._send_json(400, {"error": f"invalid output format: {e}"})
+            return
+
+        self._stream(provider, text, fmt)
+
+    def _stream(self, provider: str, text: str, fmt: AudioFormat):
+        shaping: Shaping = self.server.shaping
+        rng = shaping.rng(self.server.next_request())
+        started = time.perf_counter()
+        chunks, audio_seconds = encode_chunks(text, fmt, shaping.chunk_ms)
+        chunk_seconds = audio_seconds / max(len(chunks), 1)
+
+        self.send_response(200)
+        self.send_header("Content-Type", fmt.content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        first_byte = 0.0
+        try:
+            for chunk, offset in zip(chunks, shaping.chunk_offsets(len(chunks), chunk_seconds, rng)):
+                time.sleep(max(0.0, started + offset - time.perf_counter()))
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                first_byte = first_byte or time.perf_counter() - started
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            log.warning("client-gone", "[yellow]{provider}: client disconnected mid-stream[/]", provider=provider)
+            self.close_connection = True
+            return
+
+        if self.server.quiet:
+            return
+        log.info(
+            "synthesized",
+            "[cyan]{provider}[/] {chars} chars → {audio_s:.2f} s {container}/{encoding} @ {sample_rate} Hz "
+            "[dim](first byte {ttfb_ms:.0f} ms, done {total_ms:.0f} ms, {chunks} chunks)[/]",
+            provider=provider,
+            chars=len(text),
+            audio_s=audio_seconds,
+            container=fmt.container,
+            encoding=fmt.encoding or "-",
+            sample_rate=fmt.sample_rate,
+            ttfb_ms=first_byte * 1000,
+            total_ms=(time.perf_counter() - started) * 1000,
+            chunks=len(chunks),
+        )
+
+    def _send_json(self, status: int, response: dict):
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # suppress default HTTP logging
+
+
+class MockTTSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, shaping: Shaping, quiet: bool = False):
+        super().__init__(address, MockTTSHandler)
+        self.shaping = shaping
+        self.quiet = quiet  # no per-request log lines, e.g. when embedded in a benchmark
+        self._requests = itertools.count()
+        self._lock = threading.Lock()
+
+    def next_request(self) -> int:
+        with self._lock:
+            return next(self._requests)
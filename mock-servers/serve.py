@@ -0,0 +1,83 @@
+"""Run the mock provider servers.
+
+Starts local stand-ins for Deepgram (live STT websocket) and Cartesia /
+ElevenLabs (HTTP TTS) so the playground scripts run without a network or API
+keys – the keys only have to be non-empty. Point each SDK at its mock:
+
+    DEEPGRAM_HOST=http://127.0.0.1:8081
+    CARTESIA_BASE_URL=http://127.0.0.1:8082
+    ELEVENLABS_BASE_URL=http://127.0.0.1:8082
+
+Every response is shaped by the same knobs (see ``shaping.py``): latency
+before the first byte or result, ± jitter, audio per chunk and generation
+speed. Jitter is seeded, so a run is repeatable – a deterministic harness for
+measuring the clients' own time-to-first-byte and throughput.
+
+Usage::
+
+    uv run mock-servers/serve.py
+    uv run mock-servers/serve.py --latency-ms 250 --jitter-ms 50 --chunk-ms 20 --speed 4
+    uv run mock-servers/serve.py --only tts
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for `common`
+from common.eventlog import get_logger
+
+import shaping
+from mock_deepgram import PORT as DEEPGRAM_PORT, serve_deepgram
+from mock_tts import PORT as TTS_PORT, MockTTSServer
+
+log = get_logger("mock-servers")
+
+SERVERS = ("deepgram", "tts")
+
+
+async def main(args: argparse.Namespace):
+    shape = shaping.from_args(args)
+    log.info(
+        "shaping",
+        "[dim]Latency {latency_ms:g} ms ± {jitter_ms:g} ms, {chunk_ms:g} ms chunks at {speed:g}× real time, seed {seed}[/]",
+        latency_ms=shape.latency_ms,
+        jitter_ms=shape.jitter_ms,
+        chunk_ms=shape.chunk_ms,
+        speed=shape.speed,
+        seed=shape.seed,
+    )
+
+    tts = None
+    if "tts" in args.only:
+        tts = MockTTSServer((args.host, args.tts_port), shape)
+        threading.Thread(target=tts.serve_forever, name="mock-tts", daemon=True).start()
+        log.info("listening", "[bold green]Mock Cartesia + ElevenLabs on http://{host}:{port}[/]", host=args.host, port=args.tts_port)
+
+    try:
+        if "deepgram" in args.only:
+            await serve_deepgram(args.host, args.deepgram_port, shape, args.interim_s, args.final_s, args.idle_timeout_s)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        if tts is not None:
+            tts.shutdown()
+            tts.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock Deepgram / Cartesia / ElevenLabs servers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--deepgram-port", type=int, default=DEEPGRAM_PORT, help=f"Deepgram websocket port (default: {DEEPGRAM_PORT})")
+    parser.add_argument("--tts-port", type=int, default=TTS_PORT, help=f"Cartesia + ElevenLabs HTTP port (default: {TTS_PORT})")
+    parser.add_argument("--only", nargs="+", choices=SERVERS, default=list(SERVERS), help="Servers to start (default: all)")
+    shaping.add_arguments(parser)
+    parser.add_argument("--interim-s", type=float, default=0.5, help="Deepgram: audio seconds between interim results (default: 0.5)")
+    parser.add_argument("--final-s", type=float, default=3.0, help="Deepgram: audio seconds per final result (default: 3)")
+    parser.add_argument("--idle-timeout-s", type=float, default=10.0, help="Deepgram: close streams idle this long (default: 10)")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,61 @@
+"""Injected latency, jitter and chunking for the mock servers.
+
+Every mock response is shaped the same way, so a client measured against the
+mocks sees a known, repeatable server:
+
+    - ``latency_ms`` before the first byte (TTS) or before each result (STT),
+    - ``jitter_ms`` – each send time is shifted by a uniform random amount in
+      ±jitter around its nominal schedule (so jitter doesn't accumulate into
+      drift), drawn from a generator seeded per request: two runs with the
+      same ``seed`` see the same delays,
+    - ``chunk_ms`` of audio per streamed chunk,
+    - ``speed`` – how many times faster than real time audio is produced
+      after the first chunk (10 = a second of audio every 100 ms).
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Shaping:
+    latency_ms: float = 150.0
+    jitter_ms: float = 0.0
+    chunk_ms: float = 40.0
+    speed: float = 10.0
+    seed: int = 0
+
+    def rng(self, request: int) -> random.Random:
+        return random.Random(f"{self.seed}:{request}")
+
+    def first_delay(self, rng: random.Random) -> float:
+        """Seconds before the first chunk or result."""
+        return self._jittered(self.latency_ms, rng)
+
+    def chunk_offsets(self, count: int, chunk_seconds: float, rng: random.Random) -> list[float]:
+        """Send time of each of ``count`` chunks, in seconds after the request, never out of order."""
+        offsets, previous = [], 0.0
+        for index in range(count):
+            previous = max(previous, self._jittered(self.latency_ms + index * chunk_seconds * 1000 / self.speed, rng))
+            offsets.append(previous)
+        return offsets
+
+    def _jittered(self, ms: float, rng: random.Random) -> float:
+        if self.jitter_ms:
+            ms += rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, ms) / 1000
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = Shaping()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help=f"Delay before the first byte / each result (default: {defaults.latency_ms:g})")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms, help=f"Uniform ± jitter on every delay (default: {defaults.jitter_ms:g})")
+    parser.add_argument("--chunk-ms", type=float, default=defaults.chunk_ms, help=f"Audio per streamed chunk (default: {defaults.chunk_ms:g})")
+    parser.add_argument("--speed", type=float, default=defaults.speed, help=f"Audio produced this many times faster than real time (default: {defaults.speed:g})")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Jitter seed; the same seed replays the same delays")
+
+
+def from_args(args: argparse.Namespace) -> Shaping:
+    return Shaping(args.latency_ms, args.jitter_ms, args.chunk_ms, args.speed, args.seed)
+